@@ -1,9 +1,76 @@
 # -*- coding: utf-8 -*-
 """mytext modules."""
+import importlib
+from typing import List, Any
 from mytext.params import MY_TEXT_VERSION
-from mytext.params import Provider, Mode, Tone
-from mytext.errors import MyTextError, MyTextProviderError, MyTextValidationError
-from mytext.functions import run_mytext
+from mytext.params import Provider, Mode, Tone, Strategy, CircuitState, KeyRotation, Priority
+from mytext.errors import MyTextError, MyTextProviderError, MyTextValidationError, MyTextQueueFullError
 __version__ = MY_TEXT_VERSION
 
-__all__ = ["Provider", "Mode", "Tone", "run_mytext", "MyTextError", "MyTextProviderError", "MyTextValidationError"]
+_LAZY_ATTRIBUTES = {
+    "run_mytext": "mytext.functions",
+    "run_mytext_batch": "mytext.functions",
+    "arun_mytext": "mytext.functions",
+    "run_mytext_auto": "mytext.functions",
+    "run_mytext_stream": "mytext.functions",
+    "run_mytext_long": "mytext.functions",
+    "run_mytext_offline_batch": "mytext.functions",
+    "RetryPolicy": "mytext.retry",
+    "BaseCache": "mytext.cache",
+    "MemoryCache": "mytext.cache",
+    "SQLiteCache": "mytext.cache",
+    "ProviderRouter": "mytext.routing",
+    "CircuitBreaker": "mytext.breaker",
+    "configure_circuit_breaker": "mytext.breaker",
+    "reset_circuit_breakers": "mytext.breaker",
+    "RateLimiter": "mytext.ratelimit",
+    "configure_rate_limiter": "mytext.ratelimit",
+    "enable_free_tier_rate_limits": "mytext.ratelimit",
+    "reset_rate_limiters": "mytext.ratelimit",
+    "KeyPool": "mytext.keys",
+    "configure_key_rotation": "mytext.keys",
+    "reset_key_pools": "mytext.keys",
+    "SingleFlight": "mytext.flight",
+    "MetricsRegistry": "mytext.metrics",
+    "enable_metrics": "mytext.metrics",
+    "disable_metrics": "mytext.metrics",
+    "get_metrics": "mytext.metrics",
+    "start_metrics_server": "mytext.metrics",
+    "configure_tracing": "mytext.tracing",
+    "reset_tracing": "mytext.tracing",
+    "Scheduler": "mytext.scheduler",
+    "SessionPool": "mytext.sessions",
+    "configure_sessions": "mytext.sessions",
+    "close_sessions": "mytext.sessions",
+}
+
+__all__ = ["Provider", "Mode", "Tone", "Strategy", "CircuitState", "KeyRotation", "Priority",
+           "run_mytext", "run_mytext_batch", "arun_mytext", "run_mytext_auto", "run_mytext_stream", "run_mytext_long",
+           "run_mytext_offline_batch",
+           "MyTextError", "MyTextProviderError", "MyTextValidationError", "MyTextQueueFullError",
+           "RetryPolicy", "BaseCache", "MemoryCache", "SQLiteCache", "ProviderRouter",
+           "CircuitBreaker", "configure_circuit_breaker", "reset_circuit_breakers",
+           "RateLimiter", "configure_rate_limiter", "enable_free_tier_rate_limits", "reset_rate_limiters",
+           "KeyPool", "configure_key_rotation", "reset_key_pools", "SingleFlight",
+           "MetricsRegistry", "enable_metrics", "disable_metrics", "get_metrics", "start_metrics_server",
+           "configure_tracing", "reset_tracing", "Scheduler",
+           "SessionPool", "configure_sessions", "close_sessions"]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import heavy public attributes on first access.
+
+    :param name: attribute name
+    """
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module {module!r} has no attribute {name!r}".format(module=__name__, name=name))
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Return the module attributes, including the lazy ones."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""mytext bench."""
+
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import contextlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple, Union, Callable, Iterator, Optional, Any
+from urllib.parse import urlsplit
+from . import providers, ratelimit, sessions
+from .functions import run_mytext, arun_mytext, run_mytext_batch
+from .retry import RetryPolicy
+from .sessions import SessionPool
+from .breaker import reset_circuit_breakers
+from .params import Provider
+from .params import BENCH_PATHS, BENCH_TEXT_TEMPLATE, BENCH_RESULT_HEADER, BENCH_RESULT_TEMPLATE
+from .params import DEFAULT_BENCH_REQUESTS, DEFAULT_BENCH_CONCURRENCY, DEFAULT_BENCH_LATENCY
+from .params import DEFAULT_BENCH_ERROR_RATE, DEFAULT_BENCH_MAX_RETRIES
+from .params import INVALID_BENCH_REQUESTS_ERROR, INVALID_BENCH_CONCURRENCY_ERROR, INVALID_BENCH_LATENCY_ERROR
+from .params import INVALID_BENCH_ERROR_RATE_ERROR, INVALID_BENCH_MAX_RETRIES_ERROR
+
+PROVIDER_URL_NAMES = {
+    Provider.AI_STUDIO: "AI_STUDIO_API_URL",
+    Provider.CLOUDFLARE: "CLOUDFLARE_API_URL",
+    Provider.OPENROUTER: "OPENROUTER_API_URL",
+    Provider.CEREBRAS: "CEREBRAS_API_URL",
+    Provider.GROQ: "GROQ_API_URL",
+    Provider.NVIDIA: "NVIDIA_API_URL",
+    Provider.GITHUB: "GITHUB_API_URL",
+}
+
+
+class _MockProviderHandler(BaseHTTPRequestHandler):
+    """Request handler emulating the response format of each provider."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args: Any) -> None:
+        """
+        Disable request logging.
+
+        :param args: log arguments
+        """
+
+    def do_POST(self) -> None:
+        """Answer a provider request after the configured latency, failing at the configured error rate."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        if random.random() < self.server.error_rate:
+            status_code, data = 503, {"error": {"message": "Service Unavailable"}}
+        elif ":generateContent" in self.path:
+            status_code, data = 200, {"candidates": [{"content": {"parts": [{"text": "Benchmark output."}]}}]}
+        elif "/ai/run/" in self.path:
+            status_code, data = 200, {"result": {"response": "Benchmark output."}}
+        else:
+            status_code, data = 200, {"choices": [{"message": {"content": "Benchmark output."}}]}
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _serve_mock_provider(latency: float, error_rate: float, port_queue: Any) -> None:
+    """
+    Run the mock provider server and report its port.
+
+    :param latency: response latency in seconds
+    :param error_rate: probability of a 503 response
+    :param port_queue: queue receiving the server port
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockProviderHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.error_rate = error_rate
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class MockProviderServer:
+    """Local HTTP server emulating the providers, run in a separate process so it does not skew CPU measurements."""
+
+    def __init__(self, latency: float = DEFAULT_BENCH_LATENCY, error_rate: float = DEFAULT_BENCH_ERROR_RATE) -> None:
+        """
+        Initialize the mock provider server.
+
+        :param latency: response latency in seconds
+        :param error_rate: probability of a 503 response
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.url = None
+        self._process = None
+
+    def start(self) -> None:
+        """Start the server process."""
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve_mock_provider,
+            args=(self.latency, self.error_rate, port_queue),
+            daemon=True)
+        self._process.start()
+        self.url = "http://127.0.0.1:{port}".format(port=port_queue.get(timeout=10))
+
+    def stop(self) -> None:
+        """Stop the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> "MockProviderServer":
+        """Start the server and enter the context manager."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """
+        Stop the server and exit the context manager.
+
+        :param args: exception information
+        """
+        self.stop()
+
+
+@contextlib.contextmanager
+def _redirect_providers(base_url: str) -> Iterator[None]:
+    """
+    Redirect all provider API URLs to the given base URL.
+
+    :param base_url: base URL of the mock provider server
+    """
+    original_urls = {name: getattr(providers, name) for name in PROVIDER_URL_NAMES.values()}
+    try:
+        for name, url in original_urls.items():
+            parts = urlsplit(url)
+            prefix = "{scheme}://{netloc}".format(scheme=parts.scheme, netloc=parts.netloc)
+            setattr(providers, name, base_url + url[len(prefix):])
+        yield
+    finally:
+        for name, url in original_urls.items():
+            setattr(providers, name, url)
+
+
+@contextlib.contextmanager
+def _disable_rate_limits() -> Iterator[None]:
+    """Disable rate limiting, restoring the caller's rate limits and limiter state afterwards."""
+    with ratelimit._RATE_LIMITERS_LOCK:
+        original_limits = dict(ratelimit._RATE_LIMITS)
+        original_limiters = dict(ratelimit._RATE_LIMITERS)
+        ratelimit._RATE_LIMITS.update({provider: (None, None) for provider in Provider})
+        ratelimit._RATE_LIMITERS.clear()
+    try:
+        yield
+    finally:
+        with ratelimit._RATE_LIMITERS_LOCK:
+            ratelimit._RATE_LIMITS.clear()
+            ratelimit._RATE_LIMITS.update(original_limits)
+            ratelimit._RATE_LIMITERS.clear()
+            ratelimit._RATE_LIMITERS.update(original_limiters)
+
+
+@contextlib.contextmanager
+def _bench_sessions(pool_maxsize: int) -> Iterator[None]:
+    """
+    Use a dedicated session pool, restoring the caller's session pool afterwards.
+
+    :param pool_maxsize: maximum number of connections to keep per host
+    """
+    with sessions._SESSION_POOL_LOCK:
+        original_pool = sessions._SESSION_POOL
+        sessions._SESSION_POOL = SessionPool(pool_maxsize=pool_maxsize)
+    try:
+        yield
+    finally:
+        with sessions._SESSION_POOL_LOCK:
+            bench_pool = sessions._SESSION_POOL
+            sessions._SESSION_POOL = original_pool
+        bench_pool.close()
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    """
+    Return the nearest-rank percentile of the values.
+
+    :param values: values
+    :param percentile: percentile in [0, 100]
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, math.ceil(percentile / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _timed_call(function: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> Tuple[float, bool]:
+    """
+    Call a function and return its latency and status.
+
+    :param function: function
+    :param kwargs: function keyword arguments
+    """
+    start_time = time.perf_counter()
+    result = function(**kwargs)
+    return time.perf_counter() - start_time, result["status"]
+
+
+def _run_sequential(calls: List[Dict[str, Any]], *args: Any) -> List[tuple]:
+    """
+    Run the calls one after another.
+
+    :param calls: keyword arguments of each call
+    :param args: other runner arguments (the concurrency is unused)
+    """
+    return [_timed_call(run_mytext, kwargs) for kwargs in calls]
+
+
+def _run_threaded(calls: List[Dict[str, Any]], concurrency: int) -> List[tuple]:
+    """
+    Run the calls on a thread pool.
+
+    :param calls: keyword arguments of each call
+    :param concurrency: number of concurrent calls
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda kwargs: _timed_call(run_mytext, kwargs), calls))
+
+
+def _run_async(calls: List[Dict[str, Any]], concurrency: int) -> List[tuple]:
+    """
+    Run the calls as asyncio tasks.
+
+    :param calls: keyword arguments of each call
+    :param concurrency: number of concurrent calls
+    """
+    async def run_all() -> List[tuple]:
+        """Run all calls with bounded concurrency."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(kwargs: Dict[str, Any]) -> tuple:
+            """
+            Run a single call.
+
+            :param kwargs: call keyword arguments
+            """
+            async with semaphore:
+                start_time = time.perf_counter()
+                result = await arun_mytext(**kwargs)
+                return time.perf_counter() - start_time, result["status"]
+
+        return await asyncio.gather(*[run_one(kwargs) for kwargs in calls])
+
+    return asyncio.run(run_all())
+
+
+def _run_batch(calls: List[Dict[str, Any]], concurrency: int) -> List[tuple]:
+    """
+    Run the calls through run_mytext_batch (per-call latencies are not observable).
+
+    :param calls: keyword arguments of each call
+    :param concurrency: number of concurrent calls
+    """
+    kwargs = dict(calls[0])
+    kwargs["texts"] = [call["text"] for call in calls]
+    del kwargs["text"]
+    results = run_mytext_batch(max_workers=concurrency, **kwargs)
+    return [(None, result["status"]) for result in results]
+
+
+BENCH_PATH_MAP = {
+    "sequential": _run_sequential,
+    "threaded": _run_threaded,
+    "async": _run_async,
+    "batch": _run_batch,
+}
+
+
+def run_benchmark(
+        requests: int = DEFAULT_BENCH_REQUESTS,
+        concurrency: int = DEFAULT_BENCH_CONCURRENCY,
+        latency: float = DEFAULT_BENCH_LATENCY,
+        error_rate: float = DEFAULT_BENCH_ERROR_RATE,
+        provider: Provider = Provider.GROQ,
+        paths: Optional[List[str]] = None,
+        max_retries: int = DEFAULT_BENCH_MAX_RETRIES) -> Dict[str, Dict[str, Union[int, float, None]]]:
+    """
+    Benchmark the mytext call paths against a local mock provider server.
+
+    Rate limiting is disabled and a dedicated session pool is used during the benchmark; the caller's rate limits and
+    session pool are restored afterwards.
+
+    :param requests: number of requests per path
+    :param concurrency: number of concurrent calls (threaded, async and batch paths)
+    :param latency: mock provider response latency in seconds
+    :param error_rate: probability of a mock provider 503 response
+    :param provider: emulated provider
+    :param paths: call paths to benchmark (default: all)
+    :param max_retries: maximum number of attempts per call (retries are not delayed)
+    """
+    paths = paths or list(BENCH_PATHS)
+    retry_policy = RetryPolicy(max_retries=max_retries, retry_delay=0, jitter=False)
+    calls = [
+        {
+            "text": BENCH_TEXT_TEMPLATE.format(index=index),
+            "auth": {"api_key": "BENCH_KEY", "account_id": "BENCH_ACCOUNT"},
+            "provider": provider,
+            "retry_policy": retry_policy}
+        for index in range(requests)]
+    report = dict()
+    with _disable_rate_limits(), _bench_sessions(max(concurrency, 1)):
+        try:
+            with MockProviderServer(latency=latency, error_rate=error_rate) as server, _redirect_providers(server.url):
+                for path in paths:
+                    reset_circuit_breakers()
+                    wall_start = time.perf_counter()
+                    cpu_start = time.process_time()
+                    outcomes = BENCH_PATH_MAP[path](calls, concurrency)
+                    cpu_time = time.process_time() - cpu_start
+                    wall_time = time.perf_counter() - wall_start
+                    latencies = [outcome[0] for outcome in outcomes if outcome[0] is not None]
+                    report[path] = {
+                        "requests": len(outcomes),
+                        "errors": sum(1 for outcome in outcomes if not outcome[1]),
+                        "wall_time": wall_time,
+                        "throughput": len(outcomes) / wall_time if wall_time > 0 else None,
+                        "p50": _percentile(latencies, 50),
+                        "p95": _percentile(latencies, 95),
+                        "p99": _percentile(latencies, 99),
+                        "cpu_time": cpu_time,
+                        "cpu_per_request": cpu_time / len(outcomes) if outcomes else None}
+        finally:
+            reset_circuit_breakers()
+    return report
+
+
+def _format_value(value: Optional[float], scale: float = 1) -> str:
+    """
+    Format a measured value for the report table.
+
+    :param value: value
+    :param scale: scale factor
+    """
+    if value is None:
+        return "-"
+    return "{value:.2f}".format(value=value * scale)
+
+
+def _print_report(report: Dict[str, Dict[str, Union[int, float, None]]]) -> None:
+    """
+    Print the benchmark report as a table.
+
+    :param report: benchmark report
+    """
+    print(BENCH_RESULT_HEADER)
+    for path, stats in report.items():
+        print(BENCH_RESULT_TEMPLATE.format(
+            path=path,
+            requests=stats["requests"],
+            errors=stats["errors"],
+            throughput=_format_value(stats["throughput"]),
+            p50=_format_value(stats["p50"], 1000),
+            p95=_format_value(stats["p95"], 1000),
+            p99=_format_value(stats["p99"], 1000),
+            cpu=_format_value(stats["cpu_per_request"], 1000)))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build argument parser."""
+    parser = argparse.ArgumentParser(description="mytext benchmark against a local mock provider server.")
+    parser.add_argument("--requests", type=int, default=DEFAULT_BENCH_REQUESTS, help="Number of requests per path")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_BENCH_CONCURRENCY, help="Number of concurrent calls")
+    parser.add_argument("--latency", type=float, default=DEFAULT_BENCH_LATENCY, help="Mock response latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_BENCH_ERROR_RATE, help="Mock 503 response rate")
+    parser.add_argument(
+        "--provider",
+        type=str.lower,
+        choices=[x.value for x in Provider],
+        default=Provider.GROQ.value,
+        help="Emulated provider")
+    parser.add_argument(
+        "--paths",
+        type=str.lower,
+        nargs="+",
+        choices=list(BENCH_PATHS),
+        default=list(BENCH_PATHS),
+        help="Call paths to benchmark")
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_BENCH_MAX_RETRIES,
+        help="Maximum number of attempts per call")
+    parser.add_argument("--json", help="Print the report as JSON", action='store_true', default=False)
+    return parser
+
+
+def main() -> None:
+    """Benchmark main function."""
+    parser = _build_parser()
+    args = parser.parse_args()
+    if args.requests < 1:
+        parser.error(INVALID_BENCH_REQUESTS_ERROR)
+    if args.concurrency < 1:
+        parser.error(INVALID_BENCH_CONCURRENCY_ERROR)
+    if args.latency < 0:
+        parser.error(INVALID_BENCH_LATENCY_ERROR)
+    if not 0 <= args.error_rate <= 1:
+        parser.error(INVALID_BENCH_ERROR_RATE_ERROR)
+    if args.max_retries < 1:
+        parser.error(INVALID_BENCH_MAX_RETRIES_ERROR)
+    report = run_benchmark(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        provider=Provider(args.provider),
+        paths=args.paths,
+        max_retries=args.max_retries)
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
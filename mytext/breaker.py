@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""mytext breaker."""
+
+import time
+import threading
+from typing import Dict, Optional
+from .errors import MyTextValidationError
+from .params import Provider, CircuitState
+from .params import DEFAULT_FAILURE_THRESHOLD, DEFAULT_COOL_DOWN
+from .params import INVALID_FAILURE_THRESHOLD_ERROR, INVALID_COOL_DOWN_ERROR
+
+
+class CircuitBreaker:
+    """Circuit breaker with closed, open and half-open states."""
+
+    def __init__(
+            self,
+            failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+            cool_down: float = DEFAULT_COOL_DOWN) -> None:
+        """
+        Initialize the circuit breaker.
+
+        :param failure_threshold: number of consecutive failures that opens the circuit
+        :param cool_down: seconds to wait in the open state before allowing a trial request
+        """
+        if not isinstance(failure_threshold, int) or isinstance(failure_threshold, bool) or failure_threshold < 1:
+            raise MyTextValidationError(INVALID_FAILURE_THRESHOLD_ERROR)
+        if not isinstance(cool_down, (int, float)) or isinstance(cool_down, bool) or cool_down < 0:
+            raise MyTextValidationError(INVALID_COOL_DOWN_ERROR)
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def _update_state(self) -> None:
+        """
+        Move an open circuit to half-open once the cool-down has elapsed.
+
+        A trial request that has not reported its outcome within the cool-down (e.g. an abandoned stream) counts as
+        failed and reopens the circuit, so the circuit never stays half-open with its trial slot taken.
+        """
+        now = time.monotonic()
+        trial_expired = self._trial_in_flight and now - self._trial_started_at >= self.cool_down
+        if self._state == CircuitState.HALF_OPEN and trial_expired:
+            self._state = CircuitState.OPEN
+            self._opened_at = now
+            self._trial_in_flight = False
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.cool_down:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state."""
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def is_available(self) -> bool:
+        """Check whether a request could currently pass, without reserving a trial request."""
+        with self._lock:
+            self._update_state()
+            if self._state == CircuitState.HALF_OPEN:
+                return not self._trial_in_flight
+            return self._state == CircuitState.CLOSED
+
+    def allow_request(self) -> bool:
+        """Check whether a request may pass; in the half-open state only a single trial request passes."""
+        with self._lock:
+            self._update_state()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trial_started_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Reset the circuit to the closed state."""
+        self.record_success()
+
+
+_CIRCUIT_BREAKERS: Dict[Provider, CircuitBreaker] = dict()
+_CIRCUIT_BREAKERS_LOCK = threading.Lock()
+
+
+def _get_circuit_breaker(provider: Provider) -> CircuitBreaker:
+    """
+    Return the circuit breaker of the given provider.
+
+    :param provider: LLM provider
+    """
+    with _CIRCUIT_BREAKERS_LOCK:
+        breaker = _CIRCUIT_BREAKERS.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            _CIRCUIT_BREAKERS[provider] = breaker
+        return breaker
+
+
+def configure_circuit_breaker(
+        provider: Optional[Provider] = None,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cool_down: float = DEFAULT_COOL_DOWN) -> None:
+    """
+    Configure the circuit breaker of a provider (or of all providers).
+
+    :param provider: LLM provider (None for all providers)
+    :param failure_threshold: number of consecutive failures that opens the circuit
+    :param cool_down: seconds to wait in the open state before allowing a trial request
+    """
+    providers = list(Provider) if provider is None else [provider]
+    with _CIRCUIT_BREAKERS_LOCK:
+        for item in providers:
+            _CIRCUIT_BREAKERS[item] = CircuitBreaker(failure_threshold=failure_threshold, cool_down=cool_down)
+
+
+def reset_circuit_breakers() -> None:
+    """Reset the circuit breakers of all providers to the closed state."""
+    with _CIRCUIT_BREAKERS_LOCK:
+        breakers = list(_CIRCUIT_BREAKERS.values())
+    for breaker in breakers:
+        breaker.reset()
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""mytext cache."""
+
+import os
+import abc
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import contextlib
+from collections import OrderedDict
+from typing import Dict, Union, Optional, Iterator, Any
+from .errors import MyTextValidationError
+from .params import Provider
+from .params import DEFAULT_CACHE_MAX_SIZE, DEFAULT_DISK_CACHE_MAX_SIZE, CACHE_SWEEP_INTERVAL
+from .params import INVALID_CACHE_MAX_SIZE_ERROR, INVALID_CACHE_TTL_ERROR
+
+
+def _build_cache_key(provider: Provider, model: str, instruction: str, text: str) -> str:
+    """
+    Build the cache key for a request.
+
+    :param provider: LLM provider
+    :param model: LLM model
+    :param instruction: rendered instruction
+    :param text: user text
+    """
+    payload = json.dumps([provider.value, model, instruction, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BaseCache(abc.ABC):
+    """Base class for response cache backends."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE, ttl: Optional[float] = None) -> None:
+        """
+        Initialize the cache.
+
+        :param max_size: maximum number of entries
+        :param ttl: time to live of each entry in seconds (None for no expiry)
+        """
+        if not isinstance(max_size, int) or isinstance(max_size, bool) or max_size < 1:
+            raise MyTextValidationError(INVALID_CACHE_MAX_SIZE_ERROR)
+        if ttl is not None and (not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl <= 0):
+            raise MyTextValidationError(INVALID_CACHE_TTL_ERROR)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[Dict[str, Union[bool, str]]]:
+        """
+        Return the stored result for the key, or None.
+
+        :param key: cache key
+        """
+
+    @abc.abstractmethod
+    def _set(self, key: str, value: Dict[str, Union[bool, str]]) -> None:
+        """
+        Store the result for the key.
+
+        :param key: cache key
+        :param value: result
+        """
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+
+    def get(self, key: str) -> Optional[Dict[str, Union[bool, str]]]:
+        """
+        Return the cached result for the key and update hit/miss counters.
+
+        :param key: cache key
+        """
+        value = self._get(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Union[bool, str]]) -> None:
+        """
+        Store the result for the key.
+
+        :param key: cache key
+        :param value: result
+        """
+        self._set(key, value)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of hits to total lookups."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+class MemoryCache(BaseCache):
+    """In-memory LRU response cache."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE, ttl: Optional[float] = None) -> None:
+        """
+        Initialize the cache.
+
+        :param max_size: maximum number of entries
+        :param ttl: time to live of each entry in seconds (None for no expiry)
+        """
+        super().__init__(max_size=max_size, ttl=ttl)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Dict[str, Union[bool, str]]]:
+        """
+        Return the stored result for the key, or None.
+
+        :param key: cache key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(value)
+
+    def _set(self, key: str, value: Dict[str, Union[bool, str]]) -> None:
+        """
+        Store the result for the key.
+
+        :param key: cache key
+        :param value: result
+        """
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """
+    Persistent SQLite response cache, safe for concurrent use across threads and processes.
+
+    Threads share one connection, serialized by a lock, so short-lived threads do not leave connections behind.
+    The entry count is tracked per instance, so a write only evicts when this instance grew the cache beyond max_size;
+    expired entries and entries written by other processes are swept every CACHE_SWEEP_INTERVAL writes.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            max_size: int = DEFAULT_DISK_CACHE_MAX_SIZE,
+            ttl: Optional[float] = None) -> None:
+        """
+        Initialize the cache.
+
+        :param path: database file path
+        :param max_size: maximum number of entries
+        :param ttl: time to live of each entry in seconds (None for no expiry)
+        """
+        super().__init__(max_size=max_size, ttl=ttl)
+        self.path = os.path.expanduser(path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+                connection.execute("CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at)")
+            (self._size,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Hold the lock and return the shared connection, opening it on first use."""
+        with self._lock:
+            if self._connection is None:
+                connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                self._connection = connection
+            yield self._connection
+
+    def _get(self, key: str) -> Optional[Dict[str, Union[bool, str]]]:
+        """
+        Return the stored result for the key, or None.
+
+        :param key: cache key
+        """
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            with connection:
+                if self.ttl is not None and created_at + self.ttl <= now:
+                    if connection.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount:
+                        self._size -= 1
+                    return None
+                connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def _set(self, key: str, value: Dict[str, Union[bool, str]]) -> None:
+        """
+        Store the result for the key.
+
+        :param key: cache key
+        :param value: result
+        """
+        now = time.time()
+        value = json.dumps(value)
+        with self._connect() as connection:
+            with connection:
+                inserted = connection.execute(
+                    "UPDATE entries SET value = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                    (value, now, now, key)).rowcount == 0
+                if inserted:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, value, now, now))
+            self._writes += 1
+            if inserted:
+                self._size += 1
+            if self._writes % CACHE_SWEEP_INTERVAL == 0:
+                self._sweep()
+            elif self._size > self.max_size:
+                self._evict(self._size - self.max_size)
+                self._size = self.max_size
+
+    def _evict(self, count: int) -> None:
+        """
+        Evict the least recently used entries.
+
+        :param count: number of entries to evict
+        """
+        with self._connect() as connection:
+            with connection:
+                connection.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (count,))
+
+    def _sweep(self) -> None:
+        """Remove expired entries, evict the least recently used entries beyond max_size and recount the entries."""
+        with self._connect() as connection:
+            with connection:
+                if self.ttl is not None:
+                    connection.execute("DELETE FROM entries WHERE created_at <= ?", (time.time() - self.ttl,))
+                (count,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+                if count > self.max_size:
+                    connection.execute(
+                        "DELETE FROM entries WHERE key IN "
+                        "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                        (count - self.max_size,))
+            self._size = min(count, self.max_size)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._connect() as connection:
+            with connection:
+                connection.execute("DELETE FROM entries")
+            self._size = 0
+
+    def close(self) -> None:
+        """Close the database connection; it is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        with self._connect() as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
@@ -3,47 +3,98 @@
 
 import os
 import sys
+import json
+import time
 import argparse
-from typing import Dict
-from art import tprint
-from .functions import run_mytext
+import importlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Set, Tuple, Union, Callable, Optional, Any, Iterator, TextIO
+from .errors import MyTextError, MyTextValidationError
+from .cache import BaseCache, MemoryCache, SQLiteCache
+from .routing import ProviderRouter
+from .breaker import _get_circuit_breaker
 from .params import MY_TEXT_VERSION, MY_TEXT_OVERVIEW, MY_TEXT_REPO
-from .params import Mode, Tone, Provider
-from .params import OUTPUT_TEMPLATE
-from .params import TEXT_IS_REQUIRED_ERROR
+from .params import Mode, Tone, Provider, Strategy
+from .params import DEFAULT_HEDGE_DELAY, DEFAULT_CLI_MAX_WORKERS, STDIN_INPUT
+from .params import SERVE_COMMAND, DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT
+from .params import DEFAULT_SERVER_MAX_WORKERS, DEFAULT_SERVER_QUEUE_SIZE
+from .params import OUTPUT_TEMPLATE, CACHE_FILE_NAME, INPUT_SUMMARY_MESSAGE
+from .params import TEXT_IS_REQUIRED_ERROR, INVALID_CLI_MAX_WORKERS_ERROR, INVALID_SERVER_QUEUE_SIZE_ERROR
+from .params import INVALID_CLI_TIMEOUT_ERROR, INVALID_CLI_HEDGE_DELAY_ERROR, INPUT_FILE_NOT_FOUND_ERROR
+from .params import INVALID_REQUEST_OPTION_ERROR, INVALID_MODEL_ERROR
 from .params import NO_PROVIDER_SUCCEEDED_MESSAGE
 from .params import LOOP_INPUT_MESSAGE, EXIT_MESSAGE
 
 
+def run_mytext_auto(**kwargs: Any) -> Dict[str, Union[bool, str]]:
+    """
+    Run mytext across multiple providers, importing the provider stack on first use.
+
+    :param kwargs: run_mytext_auto keyword arguments
+    """
+    from .functions import run_mytext_auto as _run_mytext_auto
+    return _run_mytext_auto(**kwargs)
+
+
+def run_mytext_stream(**kwargs: Any) -> Iterator[str]:
+    """
+    Stream mytext output, importing the provider stack on first use.
+
+    :param kwargs: run_mytext_stream keyword arguments
+    """
+    from .functions import run_mytext_stream as _run_mytext_stream
+    return _run_mytext_stream(**kwargs)
+
+
 def _print_mytext_info() -> None:
     """Print mytext details."""
+    from art import tprint
     tprint("MyText")
     tprint("V:" + MY_TEXT_VERSION)
     print(MY_TEXT_OVERVIEW)
     print("Repo : " + MY_TEXT_REPO)
 
 
-def _load_auth_from_env() -> Dict[Provider, Dict[str, str]]:
+def _load_api_keys_from_env(prefix: str) -> Union[str, List[str], None]:
+    """
+    Load the API keys of a provider from environment.
+
+    Keys are read from `<PREFIX>_API_KEY` and the comma-separated `<PREFIX>_API_KEYS`; more than one key is
+    returned as a list to enable key rotation.
+
+    :param prefix: environment variable prefix
+    """
+    keys = [key.strip() for key in os.getenv(prefix + "_API_KEYS", "").split(",") if key.strip()]
+    key = os.getenv(prefix + "_API_KEY")
+    if key and key not in keys:
+        keys.insert(0, key)
+    if len(keys) > 1:
+        return keys
+    return keys[0] if keys else None
+
+
+def _load_auth_from_env() -> Dict[Provider, Dict[str, Union[str, List[str]]]]:
     """Load authentication parameters from environment."""
     return {
         Provider.AI_STUDIO: {
-            "api_key": os.getenv("AI_STUDIO_API_KEY")
+            "api_key": _load_api_keys_from_env("AI_STUDIO")
         },
         Provider.CLOUDFLARE: {
-            "api_key": os.getenv("CLOUDFLARE_API_KEY"),
+            "api_key": _load_api_keys_from_env("CLOUDFLARE"),
             "account_id": os.getenv("CLOUDFLARE_ACCOUNT_ID"),
         },
         Provider.OPENROUTER: {
-            "api_key": os.getenv("OPENROUTER_API_KEY"),
+            "api_key": _load_api_keys_from_env("OPENROUTER"),
         },
         Provider.CEREBRAS: {
-            "api_key": os.getenv("CEREBRAS_API_KEY"),
+            "api_key": _load_api_keys_from_env("CEREBRAS"),
         },
         Provider.GROQ: {
-            "api_key": os.getenv("GROQ_API_KEY"),
+            "api_key": _load_api_keys_from_env("GROQ"),
         },
         Provider.NVIDIA: {
-            "api_key": os.getenv("NVIDIA_API_KEY"),
+            "api_key": _load_api_keys_from_env("NVIDIA"),
         },
     }
 
@@ -61,10 +112,54 @@ def _load_model_from_env() -> Dict[Provider, str]:
     }
 
 
+def _load_cache(args: argparse.Namespace) -> Optional[SQLiteCache]:
+    """
+    Load the on-disk response cache.
+
+    :param args: parsed arguments
+    """
+    if args.no_cache:
+        return None
+    cache_dir = args.cache_dir or os.getenv("MYTEXT_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return SQLiteCache(os.path.join(os.path.expanduser(cache_dir), CACHE_FILE_NAME))
+
+
+def _get_routing_file(args: argparse.Namespace) -> Optional[str]:
+    """
+    Return the routing stats file path.
+
+    :param args: parsed arguments
+    """
+    return args.routing_file or os.getenv("MYTEXT_ROUTING_FILE")
+
+
+def _load_router(args: argparse.Namespace) -> Optional[ProviderRouter]:
+    """
+    Load the provider router with its persisted stats.
+
+    :param args: parsed arguments
+    """
+    routing_file = _get_routing_file(args)
+    if not routing_file or args.provider != "auto":
+        return None
+    router = ProviderRouter()
+    router.load(routing_file)
+    return router
+
+
 def _build_parser() -> argparse.ArgumentParser:
     """Build argument parser."""
     parser = argparse.ArgumentParser(description="mytext -- AI-powered text enhancer.")
 
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=[SERVE_COMMAND],
+        help="Run a local HTTP/JSON server (serve)"
+    )
+
     parser.add_argument('--version', help='Version', nargs="?", const=1)
 
     parser.add_argument('--info', help='Info', nargs="?", const=1)
@@ -107,9 +202,418 @@ def _build_parser() -> argparse.ArgumentParser:
 
     parser.add_argument("--loop", help="Loop mode flag", action='store_true', default=False)
 
+    parser.add_argument("--stream", help="Print the result while it is generated", action='store_true', default=False)
+
+    parser.add_argument(
+        "--strategy",
+        type=str.lower,
+        choices=[x.value for x in Strategy],
+        default=Strategy.SEQUENTIAL.value,
+        help="Provider selection strategy in auto mode (default: sequential)"
+    )
+
+    parser.add_argument(
+        "--hedge-delay",
+        type=float,
+        default=DEFAULT_HEDGE_DELAY,
+        help="Seconds to wait before dispatching to the next provider in hedge strategy (default: {delay})".format(
+            delay=DEFAULT_HEDGE_DELAY)
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Overall timeout in seconds of each text, shared by retries and provider fallback (default: no limit)"
+    )
+
+    parser.add_argument(
+        "--routing-file",
+        type=str,
+        help="File of the persisted provider routing stats (enables adaptive provider ordering in auto mode)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory of the on-disk response cache"
+    )
+
+    parser.add_argument("--no-cache", help="Disable the response cache", action='store_true', default=False)
+
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="File of line-delimited texts or JSONL records to transform ('-' for stdin)"
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="JSONL file to append the results to (default: stdout); records already in it are skipped "
+             "(their ids are held in memory while the input is processed)"
+    )
+
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Number of input records (or server requests) processed concurrently (default: {workers}, {server} "
+        "in serve mode)".format(workers=DEFAULT_CLI_MAX_WORKERS, server=DEFAULT_SERVER_MAX_WORKERS)
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=DEFAULT_SERVER_HOST,
+        help="Server host in serve mode (default: {host})".format(host=DEFAULT_SERVER_HOST)
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVER_PORT,
+        help="Server port in serve mode (default: {port})".format(port=DEFAULT_SERVER_PORT)
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_SERVER_QUEUE_SIZE,
+        help="Number of server requests waiting for a worker before new ones are rejected (default: {size})".format(
+            size=DEFAULT_SERVER_QUEUE_SIZE)
+    )
+
     return parser
 
 
+def _process_text(
+        text: str,
+        args: argparse.Namespace,
+        mode: Mode,
+        tone: Tone,
+        providers: List[Provider],
+        auth_map: Dict[Provider, Dict[str, str]],
+        model_map: Dict[Provider, str],
+        cache: Optional[SQLiteCache],
+        router: Optional[ProviderRouter] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Process a text with the configured providers and return the first successful result.
+
+    :param text: user text
+    :param args: parsed arguments
+    :param mode: mode
+    :param tone: tone
+    :param providers: providers in order of preference
+    :param auth_map: authentication parameters of each provider
+    :param model_map: LLM model of each provider
+    :param cache: response cache
+    :param router: provider router
+    """
+    if args.provider != "auto" and args.model:
+        model_map = dict(model_map)
+        for provider in providers:
+            model_map[provider] = args.model
+    return run_mytext_auto(
+        text=text,
+        auth_map=auth_map,
+        mode=mode,
+        tone=tone,
+        providers=providers,
+        model_map=model_map,
+        strategy=Strategy(args.strategy),
+        hedge_delay=args.hedge_delay,
+        cache=cache,
+        router=router,
+        timeout=args.timeout
+    )
+
+
+def _stream_text(
+        text: str,
+        args: argparse.Namespace,
+        mode: Mode,
+        tone: Tone,
+        providers: List[Provider],
+        auth_map: Dict[Provider, Dict[str, str]],
+        model_map: Dict[Provider, str]) -> bool:
+    """
+    Stream a text through the configured providers and print the result while it arrives.
+
+    A provider that fails before its first chunk is skipped in favour of the next one. The timeout is shared by all
+    providers, so each one gets the time left of it.
+
+    :param text: user text
+    :param args: parsed arguments
+    :param mode: mode
+    :param tone: tone
+    :param providers: providers in order of preference
+    :param auth_map: authentication parameters of each provider
+    :param model_map: LLM model of each provider
+    """
+    deadline = None if args.timeout is None else time.monotonic() + args.timeout
+    for provider in providers:
+        auth = auth_map.get(provider)
+        model = model_map.get(provider)
+        if args.provider != "auto":
+            model = args.model or model
+        if not auth or not all(auth.values()):
+            continue
+        if args.provider == "auto" and not _get_circuit_breaker(provider).is_available():
+            continue
+        timeout = None if deadline is None else deadline - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            break
+        started = False
+        try:
+            for chunk in run_mytext_stream(
+                    auth=auth,
+                    text=text,
+                    mode=mode,
+                    tone=tone,
+                    provider=provider,
+                    model=model,
+                    timeout=timeout):
+                if not started:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    print()
+                    started = True
+                print(chunk, end="", flush=True)
+        except MyTextError:
+            if started:
+                print("\n")
+                return False
+            continue
+        if started:
+            print("\n")
+        return True
+    return False
+
+
+def _read_records(file: TextIO) -> Iterator[Tuple[Any, str]]:
+    """
+    Read input records lazily and yield their ids and texts.
+
+    A line holding a JSON object with a string `text` field is a record (its `id` field defaults to the line
+    number); any other non-empty line is a plain text record identified by its line number.
+
+    :param file: input file
+    """
+    for line_number, line in enumerate(file, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        record_id, text = line_number, line
+        if line.lstrip().startswith("{"):
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = None
+            if isinstance(data, dict) and isinstance(data.get("text"), str):
+                record_id, text = data.get("id", line_number), data["text"]
+        yield record_id, text
+
+
+def _load_completed_ids(path: str) -> Set[str]:
+    """
+    Return the ids of the successful records of an output file.
+
+    The ids are held in memory for the whole run, so resuming costs memory proportional to the completed records.
+
+    :param path: output file path
+    """
+    completed = set()
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(data, dict) and data.get("status") is True and "id" in data:
+                    completed.add(str(data["id"]))
+    except OSError:
+        pass
+    return completed
+
+
+def _open_output(path: Optional[str]) -> TextIO:
+    """
+    Open the output file in append mode, terminating a partially written last line.
+
+    :param path: output file path (None for stdout)
+    """
+    if not path:
+        return sys.stdout
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            needs_newline = file.read(1) != b"\n"
+    file = open(path, "a", encoding="utf-8")
+    if needs_newline:
+        file.write("\n")
+    return file
+
+
+def _write_record(file: TextIO, record_id: Any, future: "Future[Dict[str, Union[bool, str]]]") -> bool:
+    """
+    Wait for a record result, write it as a JSON line and return its status.
+
+    :param file: output file
+    :param record_id: record id
+    :param future: future of the record result
+    """
+    result = future.result()
+    record = {
+        "id": record_id,
+        "status": result["status"],
+        "message": result["message"].strip(),
+        "model": result["model"]}
+    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    file.flush()
+    return result["status"]
+
+
+def _process_input(
+        args: argparse.Namespace,
+        mode: Mode,
+        tone: Tone,
+        providers: List[Provider],
+        auth_map: Dict[Provider, Dict[str, str]],
+        model_map: Dict[Provider, str],
+        cache: Optional[SQLiteCache],
+        router: Optional[ProviderRouter] = None) -> None:
+    """
+    Stream input records through the configured providers and write the results as JSON lines.
+
+    At most twice max_workers records are in flight at a time, so memory for the records in progress stays bounded
+    regardless of the input size. Results are written in input order, and records already written successfully to
+    the output file are skipped, so an interrupted run can be resumed; their ids are held in memory, which grows
+    with the number of completed records.
+
+    :param args: parsed arguments
+    :param mode: mode
+    :param tone: tone
+    :param providers: providers in order of preference
+    :param auth_map: authentication parameters of each provider
+    :param model_map: LLM model of each provider
+    :param cache: response cache
+    :param router: provider router
+    """
+    completed = _load_completed_ids(args.output) if args.output else set()
+    input_file = sys.stdin if args.input == STDIN_INPUT else open(args.input, "r", encoding="utf-8")
+    output_file = _open_output(args.output)
+    processed = failed = skipped = 0
+    window = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
+            for record_id, text in _read_records(input_file):
+                if str(record_id) in completed:
+                    skipped += 1
+                    continue
+                future = executor.submit(
+                    _process_text, text, args, mode, tone, providers, auth_map, model_map, cache, router)
+                window.append((record_id, future))
+                if len(window) >= 2 * args.max_workers:
+                    processed += 1
+                    failed += not _write_record(output_file, *window.popleft())
+            while window:
+                processed += 1
+                failed += not _write_record(output_file, *window.popleft())
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+        if router is not None:
+            router.save(_get_routing_file(args))
+    print(INPUT_SUMMARY_MESSAGE.format(processed=processed, failed=failed, skipped=skipped), file=sys.stderr)
+
+
+def _get_request_option(request: Dict[str, Any], name: str, enum: Any, default: str) -> Any:
+    """
+    Return an enum option of a server request.
+
+    :param request: server request
+    :param name: option name
+    :param enum: option enum
+    :param default: default option value
+    """
+    value = request.get(name, default)
+    try:
+        return enum(value.lower())
+    except (AttributeError, ValueError):
+        raise MyTextValidationError(
+            INVALID_REQUEST_OPTION_ERROR.format(name=name, choices=", ".join(x.value for x in enum)))
+
+
+def _build_request_processor(
+        args: argparse.Namespace,
+        auth_map: Dict[Provider, Dict[str, str]],
+        model_map: Dict[Provider, str],
+        cache: Optional[BaseCache],
+        router: Optional[ProviderRouter] = None) -> Callable[[Dict[str, Any]], Dict[str, Union[bool, str]]]:
+    """
+    Build the function processing server requests; request options override the CLI arguments.
+
+    :param args: parsed arguments
+    :param auth_map: authentication parameters of each provider
+    :param model_map: LLM model of each provider
+    :param cache: response cache
+    :param router: provider router
+    """
+    provider_choices = [x.value for x in Provider] + ["auto"]
+
+    def process(request: Dict[str, Any]) -> Dict[str, Union[bool, str]]:
+        """
+        Process a server request.
+
+        :param request: server request
+        """
+        mode = _get_request_option(request, "mode", Mode, args.mode)
+        tone = _get_request_option(request, "tone", Tone, args.tone)
+        provider = request.get("provider", args.provider)
+        if provider not in provider_choices:
+            raise MyTextValidationError(
+                INVALID_REQUEST_OPTION_ERROR.format(name="provider", choices=", ".join(provider_choices)))
+        model = request.get("model", args.model)
+        if model is not None and not isinstance(model, str):
+            raise MyTextValidationError(INVALID_MODEL_ERROR)
+        request_args = argparse.Namespace(**dict(vars(args), provider=provider, model=model))
+        providers = [x for x in Provider] if provider == "auto" else [Provider(provider)]
+        return _process_text(request["text"], request_args, mode, tone, providers, auth_map, model_map, cache, router)
+
+    return process
+
+
+def _serve(args: argparse.Namespace) -> None:
+    """
+    Run the mytext HTTP/JSON server with warm connection pools and a shared cache until it is interrupted.
+
+    :param args: parsed arguments
+    """
+    from .metrics import enable_metrics, get_metrics
+    from .sessions import close_sessions
+    from .server import serve
+    importlib.import_module("mytext.functions")
+    cache = _load_cache(args)
+    if cache is None and not args.no_cache:
+        cache = MemoryCache()
+    router = _load_router(args)
+    if get_metrics() is None:
+        enable_metrics()
+    process = _build_request_processor(args, _load_auth_from_env(), _load_model_from_env(), cache, router)
+    try:
+        serve(process, host=args.host, port=args.port, max_workers=args.max_workers, queue_size=args.queue_size)
+    finally:
+        if router is not None:
+            router.save(_get_routing_file(args))
+        if isinstance(cache, SQLiteCache):
+            cache.close()
+        close_sessions()
+
+
 def _run(parser: argparse.ArgumentParser) -> None:
     """
     Run mytext CLI.
@@ -122,50 +626,51 @@ def _run(parser: argparse.ArgumentParser) -> None:
     elif args.info:
         _print_mytext_info()
     else:
+        if args.max_workers is None:
+            args.max_workers = DEFAULT_SERVER_MAX_WORKERS if args.command == SERVE_COMMAND else DEFAULT_CLI_MAX_WORKERS
+        if args.max_workers < 1:
+            parser.error(INVALID_CLI_MAX_WORKERS_ERROR)
+        if args.queue_size < 1:
+            parser.error(INVALID_SERVER_QUEUE_SIZE_ERROR)
+        if args.timeout is not None and args.timeout <= 0:
+            parser.error(INVALID_CLI_TIMEOUT_ERROR)
+        if args.hedge_delay < 0:
+            parser.error(INVALID_CLI_HEDGE_DELAY_ERROR)
+        if args.command == SERVE_COMMAND:
+            _serve(args)
+            return
         text = args.text
-        if not text:
+        if not text and not args.input:
             if args.loop:
                 text = input(LOOP_INPUT_MESSAGE)
             else:
                 parser.error(TEXT_IS_REQUIRED_ERROR)
+        if args.input and args.input != STDIN_INPUT and not os.path.isfile(args.input):
+            parser.error(INPUT_FILE_NOT_FOUND_ERROR.format(path=args.input))
         tone = Tone(args.tone)
         mode = Mode(args.mode)
         auth_map = _load_auth_from_env()
         model_map = _load_model_from_env()
+        cache = _load_cache(args)
+        router = _load_router(args)
         providers = [x for x in Provider]
-        model = None
         if args.provider != "auto":
             providers = [Provider(args.provider)]
+        if args.input:
+            _process_input(args, mode, tone, providers, auth_map, model_map, cache, router)
+            return
         while True:
-            errors = []
-            successful_attempt = False
-            for provider in providers:
-                auth = auth_map.get(provider)
-                model = model_map.get(provider)
-                if args.provider != "auto":
-                    model = args.model or model
-                if not auth or not all(auth.values()):
-                    continue
-                result = run_mytext(
-                    auth=auth,
-                    text=text,
-                    mode=mode,
-                    tone=tone,
-                    provider=provider,
-                    model=model
-                )
-                if result["status"]:
+            if args.stream:
+                successful_attempt = _stream_text(text, args, mode, tone, providers, auth_map, model_map)
+            else:
+                result = _process_text(text, args, mode, tone, providers, auth_map, model_map, cache, router)
+                if router is not None:
+                    router.save(_get_routing_file(args))
+                successful_attempt = result["status"]
+                if successful_attempt:
                     print(OUTPUT_TEMPLATE.format(result=result["message"].strip()))
-                    successful_attempt = True
-                    break
-                else:
-                    errors.append((provider, result["message"]))
             if not successful_attempt:
                 print(NO_PROVIDER_SUCCEEDED_MESSAGE)
-            # if not errors:
-            #    print(NO_VALID_PROVIDER_CREDENTIALS_MESSAGE)
-            # else:
-            #    print(ALL_PROVIDERS_FAILED_MESSAGE)
             if args.loop:
                 text = input(LOOP_INPUT_MESSAGE)
             else:
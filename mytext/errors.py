@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """mytext errors."""
+from typing import Optional
 
 
 class MyTextError(Exception):
@@ -12,3 +13,23 @@ class MyTextValidationError(MyTextError, ValueError):
 
 class MyTextProviderError(MyTextError):
     """Raised when a provider call fails."""
+
+    def __init__(
+            self,
+            message: str = "",
+            status_code: Optional[int] = None,
+            retry_after: Optional[float] = None) -> None:
+        """
+        Initialize the provider error.
+
+        :param message: error message
+        :param status_code: HTTP status code
+        :param retry_after: provider requested delay in seconds before retrying
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class MyTextQueueFullError(MyTextError):
+    """Raised when a job is rejected because the scheduler queue is full."""
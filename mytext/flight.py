@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""mytext flight."""
+
+import json
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future, CancelledError
+from typing import Dict, Tuple, Callable, Awaitable, Optional, Any
+
+
+def _build_flight_key(cache_key: str, auth: Dict[str, Any], *options: Any) -> str:
+    """
+    Build the single-flight key of a request, so only calls with the same credentials and options are shared.
+
+    :param cache_key: cache key of the request
+    :param auth: authentication parameters
+    :param options: call options that change the result
+    """
+    payload = json.dumps([cache_key, auth, *options], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Thread-safe single-flight group that shares the result of identical in-flight calls."""
+
+    def __init__(self) -> None:
+        """Initialize the single-flight group."""
+        self._calls: Dict[str, Future] = dict()
+        self._lock = threading.Lock()
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """
+        Return the future of the in-flight call with the given key and whether the caller leads it.
+
+        :param key: call key
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(
+            self,
+            key: str,
+            future: Future,
+            result: Any = None,
+            error: Optional[BaseException] = None) -> None:
+        """
+        Complete an in-flight call and release its key.
+
+        An interrupted call (e.g. KeyboardInterrupt or task cancellation) is cancelled instead of shared, so the
+        waiting callers retry it rather than receive the interruption of another caller.
+
+        :param key: call key
+        :param future: call future
+        :param result: call result
+        :param error: raised error
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.cancel()
+
+    def do(self, key: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a function, or wait for the identical call already in flight and return its result.
+
+        :param key: call key
+        :param function: function
+        :param args: function positional arguments
+        :param kwargs: function keyword arguments
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except CancelledError:
+                continue
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: str, function: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await a coroutine function, or wait for the identical call already in flight and return its result.
+
+        Calls are shared between threads and event loops; cancelling a waiting caller leaves the shared call running.
+
+        :param key: call key
+        :param function: coroutine function
+        :param args: function positional arguments
+        :param kwargs: function keyword arguments
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+        try:
+            result = await function(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def __len__(self) -> int:
+        """Return the number of in-flight calls."""
+        with self._lock:
+            return len(self._calls)
+
+
+_SINGLE_FLIGHT = SingleFlight()
@@ -2,25 +2,54 @@
 """mytext functions."""
 
 
-from typing import Union, Dict, Any, Optional
+import re
+import time
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Union, Dict, Any, Optional, List, Tuple, Iterator, Callable
 from memor import Prompt, PromptTemplate
 from .errors import MyTextValidationError
-from .providers import _call_provider
-from .params import Mode, Tone, Provider
-from .params import DEFAULT_MODELS
-from .params import INSTRUCTIONS, TONE_HINTS, COMMON_RULES
+from .providers import _call_provider, _acall_provider, _stream_provider, _build_timing
+from .retry import RetryPolicy
+from .cache import BaseCache, _build_cache_key
+from .routing import ProviderRouter
+from .breaker import _get_circuit_breaker
+from .keys import _validate_api_keys
+from .flight import _SINGLE_FLIGHT, _build_flight_key
+from .metrics import _record_run
+from .tracing import _span
+from .offline import OFFLINE_BATCH_PROVIDER_MAP
+from .params import Mode, Tone, Provider, Strategy
+from .params import DEFAULT_MODELS, DEFAULT_MAX_WORKERS, DEFAULT_HEDGE_DELAY
+from .params import DEFAULT_MAX_CHUNK_TOKENS, CHARS_PER_TOKEN
+from .params import SPAN_RUN, SPAN_VALIDATE, SPAN_CACHE_LOOKUP, SPAN_BUILD_PROMPT
+from .params import INSTRUCTIONS, TONE_HINTS, COMMON_RULES, PROMPT_TEMPLATE
 from .params import INVALID_TEXT_ERROR, INVALID_AUTH_ERROR, INVALID_MODE_ERROR
 from .params import INVALID_TONE_ERROR, INVALID_PROVIDER_ERROR
 from .params import INVALID_MODEL_ERROR
+from .params import INVALID_TEXTS_ERROR, INVALID_MAX_WORKERS_ERROR
+from .params import INVALID_RETRY_POLICY_ERROR, INVALID_CACHE_ERROR, INVALID_TIMING_ERROR, INVALID_TIMEOUT_ERROR
+from .params import INVALID_CANCEL_EVENT_ERROR
+from .params import TIMEOUT_EXCEEDED_ERROR, CIRCUIT_OPEN_ERROR
+from .params import INVALID_AUTH_MAP_ERROR, INVALID_STRATEGY_ERROR, INVALID_HEDGE_DELAY_ERROR
+from .params import INVALID_ROUTER_ERROR
+from .params import NO_VALID_PROVIDER_CREDENTIALS_MESSAGE, ALL_PROVIDERS_FAILED_MESSAGE
+from .params import PROVIDER_FAILURE_TEMPLATE
+from .params import INVALID_MAX_CHUNK_TOKENS_ERROR, CHUNK_FAILED_ERROR
+from .params import DEFAULT_BATCH_POLL_INTERVAL, DEFAULT_BATCH_TIMEOUT
+from .params import INVALID_BATCH_TEXTS_ERROR, INVALID_POLL_INTERVAL_ERROR, INVALID_BATCH_TIMEOUT_ERROR
+from .params import INVALID_BASE_URL_ERROR, UNSUPPORTED_OFFLINE_BATCH_PROVIDER_ERROR, BATCH_MISSING_RESULT_ERROR
 from .params import MISSING_AI_STUDIO_KEYS_ERROR, MISSING_CLOUDFLARE_KEYS_ERROR
 from .params import MISSING_OPENROUTER_KEYS_ERROR
 from .params import MISSING_CEREBRAS_KEYS_ERROR, MISSING_GROQ_KEYS_ERROR
 from .params import MISSING_NVIDIA_KEYS_ERROR, MISSING_GITHUB_KEYS_ERROR
 
 
+@functools.lru_cache(maxsize=None)
 def _build_instruction(mode: Mode, tone: Tone) -> str:
     """
-    Retrieve and format the instruction template for the given mode.
+    Retrieve and format the instruction template for the given mode (memoized per mode and tone).
 
     :param mode: mode
     :param tone: tone
@@ -30,13 +59,103 @@ def _build_instruction(mode: Mode, tone: Tone) -> str:
     return template.format(tone=tone.value, tone_hint=tone_hint, common_rules=COMMON_RULES)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_prompt_template(mode: Mode, tone: Tone) -> PromptTemplate:
+    """
+    Return the prompt template for the given mode and tone (memoized per mode and tone).
+
+    :param mode: mode
+    :param tone: tone
+    """
+    return PromptTemplate(
+        content=PROMPT_TEMPLATE,
+        custom_map={"instruction": _build_instruction(mode, tone)},
+    )
+
+
+def _build_prompt(text: str, mode: Mode, tone: Tone) -> Prompt:
+    """
+    Build the user prompt for the given mode and tone.
+
+    :param text: user text
+    :param mode: mode
+    :param tone: tone
+    """
+    return Prompt(message=text, template=_get_prompt_template(mode, tone), init_check=False)
+
+
+def _get_cached_result(
+        cache: Optional[BaseCache],
+        cache_key: str) -> Optional[Dict[str, Union[bool, str]]]:
+    """
+    Return the cached result marked as cached, or None on a miss.
+
+    :param cache: response cache
+    :param cache_key: cache key
+    """
+    if cache is None:
+        return None
+    cached_result = cache.get(cache_key)
+    if cached_result is not None:
+        cached_result["cached"] = True
+    return cached_result
+
+
+def _store_result(
+        cache: Optional[BaseCache],
+        cache_key: str,
+        result: Dict[str, Union[bool, str]]) -> None:
+    """
+    Store a successful result in the cache and mark it as not cached.
+
+    :param cache: response cache
+    :param cache_key: cache key
+    :param result: result
+    """
+    if cache is None:
+        return
+    if result["status"]:
+        cache.set(cache_key, {key: value for key, value in result.items() if key != "timing"})
+    result["cached"] = False
+
+
+def _build_timeout_options(timeout: Optional[float], start_time: float) -> Dict[str, float]:
+    """
+    Build the provider call options of an overall timeout.
+
+    Only the deadline is passed on, so each attempt keeps its own API timeout and is merely shrunk to the time left.
+
+    :param timeout: overall timeout in seconds
+    :param start_time: run start time (monotonic)
+    """
+    if timeout is None:
+        return dict()
+    return {"deadline": start_time + timeout}
+
+
+def _get_remaining_timeout(deadline: Optional[float]) -> Optional[float]:
+    """
+    Return the seconds left until a deadline, or None if there is no deadline.
+
+    :param deadline: deadline (monotonic)
+    """
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
 def _validate_run_mytext_inputs(
         text: Any,
         auth: Any,
         mode: Any,
         tone: Any,
         provider: Any,
-        model: Any) -> None:
+        model: Any,
+        retry_policy: Any = None,
+        cache: Any = None,
+        timing: Any = False,
+        timeout: Any = None,
+        cancel_event: Any = None) -> None:
     """
     Validate run_mytext function inputs.
 
@@ -46,6 +165,11 @@ def _validate_run_mytext_inputs(
     :param tone: tone
     :param provider: API provider
     :param model: LLM model
+    :param retry_policy: retry policy
+    :param cache: response cache
+    :param timing: timing flag
+    :param timeout: overall timeout in seconds
+    :param cancel_event: cancellation event
     """
     if not isinstance(text, str):
         raise MyTextValidationError(INVALID_TEXT_ERROR)
@@ -65,6 +189,21 @@ def _validate_run_mytext_inputs(
     if model is not None and not isinstance(model, str):
         raise MyTextValidationError(INVALID_MODEL_ERROR)
 
+    if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+        raise MyTextValidationError(INVALID_RETRY_POLICY_ERROR)
+
+    if cache is not None and not isinstance(cache, BaseCache):
+        raise MyTextValidationError(INVALID_CACHE_ERROR)
+
+    if not isinstance(timing, bool):
+        raise MyTextValidationError(INVALID_TIMING_ERROR)
+
+    if timeout is not None and (not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0):
+        raise MyTextValidationError(INVALID_TIMEOUT_ERROR)
+
+    if cancel_event is not None and not isinstance(cancel_event, threading.Event):
+        raise MyTextValidationError(INVALID_CANCEL_EVENT_ERROR)
+
     if provider == Provider.AI_STUDIO:
         if "api_key" not in auth:
             raise MyTextValidationError(MISSING_AI_STUDIO_KEYS_ERROR)
@@ -87,6 +226,9 @@ def _validate_run_mytext_inputs(
         if "api_key" not in auth:
             raise MyTextValidationError(MISSING_GITHUB_KEYS_ERROR)
 
+    if isinstance(auth["api_key"], list):
+        _validate_api_keys(auth["api_key"])
+
 
 def run_mytext(
         text: str,
@@ -94,7 +236,12 @@ def run_mytext(
         mode: Mode = Mode.PARAPHRASE,
         tone: Tone = Tone.NEUTRAL,
         provider: Provider = Provider.AI_STUDIO,
-        model: Optional[str] = None) -> Dict[str, Union[bool, str]]:
+        model: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[BaseCache] = None,
+        timing: bool = False,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None) -> Dict[str, Union[bool, str]]:
     """
     Run mytext.
 
@@ -104,22 +251,695 @@ def run_mytext(
     :param tone: tone
     :param provider: API provider
     :param model: LLM model
+    :param retry_policy: retry policy
+    :param cache: response cache
+    :param timing: flag to add timing statistics (total and per-attempt latency, retries, backoff time, transferred
+        bytes and answering provider) to the result under the `timing` key
+    :param timeout: overall timeout in seconds shared by all attempts and backoff delays (None for no limit)
+    :param cancel_event: event that, once set, stops retrying and cuts the current backoff short (None for none)
     """
-    try:
-        _validate_run_mytext_inputs(text, auth, mode, tone, provider, model)
-        instruction_str = _build_instruction(mode, tone)
-        template = PromptTemplate(
-            content="{instruction}\n\nUser text:\n{prompt[message]}",
-            custom_map={"instruction": instruction_str},
-        )
-        prompt = Prompt(message=text, template=template)
-        result = _call_provider(provider=provider,
+    with _span(SPAN_RUN, provider=provider, mode=mode, tone=tone):
+        try:
+            start_time = time.monotonic()
+            with _span(SPAN_VALIDATE):
+                _validate_run_mytext_inputs(
+                    text, auth, mode, tone, provider, model, retry_policy, cache, timing, timeout, cancel_event)
+            model = model or DEFAULT_MODELS[provider]
+            instruction_str = _build_instruction(mode, tone)
+            cache_key = _build_cache_key(provider, model, instruction_str, text)
+            with _span(SPAN_CACHE_LOOKUP):
+                cached_result = _get_cached_result(cache, cache_key)
+            if cached_result is not None:
+                if timing:
+                    cached_result["timing"] = _build_timing(provider)
+                    cached_result["timing"]["total_time"] = time.monotonic() - start_time
+                _record_run(provider, model, mode, tone, True, time.monotonic() - start_time, cache_hit=True)
+                return cached_result
+            with _span(SPAN_BUILD_PROMPT):
+                prompt = _build_prompt(text, mode, tone)
+            flight_key = _build_flight_key(
+                cache_key, auth, timing, timeout, None if cancel_event is None else id(cancel_event))
+            result = dict(_SINGLE_FLIGHT.do(flight_key,
+                                            _call_provider,
+                                            provider=provider,
+                                            prompt=prompt,
+                                            auth=auth,
+                                            model=model,
+                                            retry_policy=retry_policy,
+                                            timing=timing,
+                                            cancel_event=cancel_event,
+                                            **_build_timeout_options(timeout, start_time)))
+            _store_result(cache, cache_key, result)
+            _record_run(
+                provider,
+                model,
+                mode,
+                tone,
+                result["status"],
+                time.monotonic() - start_time,
+                cache_hit=None if cache is None else False)
+            return result
+        except Exception as e:
+            return {
+                "status": False,
+                "message": str(e),
+                "model": "unknown"}
+
+
+async def arun_mytext(
+        text: str,
+        auth: dict,
+        mode: Mode = Mode.PARAPHRASE,
+        tone: Tone = Tone.NEUTRAL,
+        provider: Provider = Provider.AI_STUDIO,
+        model: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[BaseCache] = None,
+        timing: bool = False,
+        timeout: Optional[float] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Run mytext from a coroutine.
+
+    The provider requests are blocking and are offloaded to a bounded thread pool, so each in-flight call still
+    holds a thread; the event loop itself is never blocked.
+
+    :param text: user text
+    :param auth: authentication parameters
+    :param mode: mode
+    :param tone: tone
+    :param provider: API provider
+    :param model: LLM model
+    :param retry_policy: retry policy
+    :param cache: response cache
+    :param timing: flag to add timing statistics (total and per-attempt latency, retries, backoff time, transferred
+        bytes and answering provider) to the result under the `timing` key
+    :param timeout: overall timeout in seconds shared by all attempts and backoff delays (None for no limit)
+    """
+    with _span(SPAN_RUN, provider=provider, mode=mode, tone=tone):
+        try:
+            start_time = time.monotonic()
+            with _span(SPAN_VALIDATE):
+                _validate_run_mytext_inputs(
+                    text, auth, mode, tone, provider, model, retry_policy, cache, timing, timeout)
+            model = model or DEFAULT_MODELS[provider]
+            instruction_str = _build_instruction(mode, tone)
+            cache_key = _build_cache_key(provider, model, instruction_str, text)
+            with _span(SPAN_CACHE_LOOKUP):
+                cached_result = _get_cached_result(cache, cache_key)
+            if cached_result is not None:
+                if timing:
+                    cached_result["timing"] = _build_timing(provider)
+                    cached_result["timing"]["total_time"] = time.monotonic() - start_time
+                _record_run(provider, model, mode, tone, True, time.monotonic() - start_time, cache_hit=True)
+                return cached_result
+            with _span(SPAN_BUILD_PROMPT):
+                prompt = _build_prompt(text, mode, tone)
+            result = dict(await _SINGLE_FLIGHT.ado(_build_flight_key(cache_key, auth, timing, timeout),
+                                                   _acall_provider,
+                                                   provider=provider,
+                                                   prompt=prompt,
+                                                   auth=auth,
+                                                   model=model,
+                                                   retry_policy=retry_policy,
+                                                   timing=timing,
+                                                   **_build_timeout_options(timeout, start_time)))
+            _store_result(cache, cache_key, result)
+            _record_run(
+                provider,
+                model,
+                mode,
+                tone,
+                result["status"],
+                time.monotonic() - start_time,
+                cache_hit=None if cache is None else False)
+            return result
+        except Exception as e:
+            return {
+                "status": False,
+                "message": str(e),
+                "model": "unknown"}
+
+
+def run_mytext_stream(
+        text: str,
+        auth: dict,
+        mode: Mode = Mode.PARAPHRASE,
+        tone: Tone = Tone.NEUTRAL,
+        provider: Provider = Provider.AI_STUDIO,
+        model: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        timeout: Optional[float] = None) -> Iterator[str]:
+    """
+    Run mytext and yield the result as text chunks while they arrive.
+
+    Unlike run_mytext, failures are raised as MyTextError exceptions during iteration. The timeout is an overall
+    budget shared by retries; a stream still running when it is exhausted is cut off with a MyTextProviderError.
+
+    :param text: user text
+    :param auth: authentication parameters
+    :param mode: mode
+    :param tone: tone
+    :param provider: API provider
+    :param model: LLM model
+    :param retry_policy: retry policy
+    :param timeout: overall timeout in seconds (None for no limit)
+    """
+    start_time = time.monotonic()
+    _validate_run_mytext_inputs(text, auth, mode, tone, provider, model, retry_policy, timeout=timeout)
+    prompt = _build_prompt(text, mode, tone)
+    yield from _stream_provider(provider=provider,
                                 prompt=prompt,
                                 auth=auth,
-                                model=model or DEFAULT_MODELS[provider])
-        return result
+                                model=model or DEFAULT_MODELS[provider],
+                                retry_policy=retry_policy,
+                                **_build_timeout_options(timeout, start_time))
+
+
+def _validate_run_mytext_batch_inputs(texts: Any, max_workers: Any) -> None:
+    """
+    Validate run_mytext_batch function inputs.
+
+    :param texts: user texts
+    :param max_workers: maximum number of concurrent workers
+    """
+    if not isinstance(texts, (list, tuple)):
+        raise MyTextValidationError(INVALID_TEXTS_ERROR)
+
+    if not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1:
+        raise MyTextValidationError(INVALID_MAX_WORKERS_ERROR)
+
+
+def run_mytext_batch(
+        texts: List[str],
+        auth: dict,
+        mode: Mode = Mode.PARAPHRASE,
+        tone: Tone = Tone.NEUTRAL,
+        provider: Provider = Provider.AI_STUDIO,
+        model: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[BaseCache] = None) -> List[Dict[str, Union[bool, str]]]:
+    """
+    Run mytext on multiple texts concurrently.
+
+    Results are returned in the same order as the input texts, each with its own status.
+
+    :param texts: user texts
+    :param auth: authentication parameters
+    :param mode: mode
+    :param tone: tone
+    :param provider: API provider
+    :param model: LLM model
+    :param max_workers: maximum number of concurrent workers
+    :param retry_policy: retry policy
+    :param cache: response cache
+    """
+    _validate_run_mytext_batch_inputs(texts, max_workers)
+    if not texts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+        futures = [
+            executor.submit(
+                run_mytext,
+                text=text,
+                auth=auth,
+                mode=mode,
+                tone=tone,
+                provider=provider,
+                model=model,
+                retry_policy=retry_policy,
+                cache=cache) for text in texts]
+        return [future.result() for future in futures]
+
+
+def _validate_run_mytext_offline_batch_inputs(
+        texts: Any,
+        provider: Provider,
+        poll_interval: Any,
+        timeout: Any,
+        base_url: Any,
+        retry_policy: Any = None) -> None:
+    """
+    Validate run_mytext_offline_batch function inputs.
+
+    :param texts: user texts
+    :param provider: API provider
+    :param poll_interval: seconds between batch status checks
+    :param timeout: maximum seconds to wait for the batch
+    :param base_url: API base URL
+    :param retry_policy: retry policy
+    """
+    if isinstance(texts, dict):
+        if not all(isinstance(key, str) and isinstance(value, str) for key, value in texts.items()):
+            raise MyTextValidationError(INVALID_BATCH_TEXTS_ERROR)
+    elif not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        raise MyTextValidationError(INVALID_BATCH_TEXTS_ERROR)
+
+    if provider not in OFFLINE_BATCH_PROVIDER_MAP:
+        raise MyTextValidationError(UNSUPPORTED_OFFLINE_BATCH_PROVIDER_ERROR.format(
+            providers=", ".join(item.value for item in OFFLINE_BATCH_PROVIDER_MAP)))
+
+    if not isinstance(poll_interval, (int, float)) or isinstance(poll_interval, bool) or poll_interval <= 0:
+        raise MyTextValidationError(INVALID_POLL_INTERVAL_ERROR)
+
+    if not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0:
+        raise MyTextValidationError(INVALID_BATCH_TIMEOUT_ERROR)
+
+    if base_url is not None and not isinstance(base_url, str):
+        raise MyTextValidationError(INVALID_BASE_URL_ERROR)
+
+    if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+        raise MyTextValidationError(INVALID_RETRY_POLICY_ERROR)
+
+
+def run_mytext_offline_batch(
+        texts: Union[List[str], Dict[str, str]],
+        auth: dict,
+        mode: Mode = Mode.PARAPHRASE,
+        tone: Tone = Tone.NEUTRAL,
+        provider: Provider = Provider.GROQ,
+        model: Optional[str] = None,
+        poll_interval: float = DEFAULT_BATCH_POLL_INTERVAL,
+        timeout: float = DEFAULT_BATCH_TIMEOUT,
+        base_url: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None) -> Dict[str, Dict[str, Union[bool, str]]]:
+    """
+    Run mytext on multiple texts through the provider's asynchronous batch API.
+
+    The call blocks until the batch job finishes, which may take hours; results are returned by input ID (the
+    dictionary keys, or the list indices as strings), each with its own status.
+
+    :param texts: user texts (a list, or a dictionary mapping IDs to texts)
+    :param auth: authentication parameters
+    :param mode: mode
+    :param tone: tone
+    :param provider: API provider
+    :param model: LLM model
+    :param poll_interval: seconds between batch status checks
+    :param timeout: maximum seconds to wait for the batch (the batch is cancelled afterwards)
+    :param base_url: API base URL override
+    :param retry_policy: retry policy of the status checks and downloads sent after the batch is created
+    """
+    _validate_run_mytext_offline_batch_inputs(texts, provider, poll_interval, timeout, base_url, retry_policy)
+    _validate_run_mytext_inputs("", auth, mode, tone, provider, model)
+    if isinstance(texts, list):
+        texts = {str(index): text for index, text in enumerate(texts)}
+    if not texts:
+        return dict()
+    model = model or DEFAULT_MODELS[provider]
+    prompts = {custom_id: _build_prompt(text, mode, tone) for custom_id, text in texts.items()}
+    error_message = BATCH_MISSING_RESULT_ERROR
+    try:
+        results = OFFLINE_BATCH_PROVIDER_MAP[provider](
+            prompts=prompts,
+            auth=auth,
+            model=model,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            base_url=base_url,
+            retry_policy=retry_policy)
     except Exception as e:
+        results = dict()
+        error_message = str(e)
+    return {
+        custom_id: results.get(custom_id) or {"status": False, "message": error_message, "model": model}
+        for custom_id in prompts}
+
+
+def _validate_run_mytext_auto_inputs(
+        auth_map: Any,
+        strategy: Any,
+        hedge_delay: Any,
+        router: Any = None,
+        timeout: Any = None) -> None:
+    """
+    Validate run_mytext_auto function inputs.
+
+    :param auth_map: authentication parameters of each provider
+    :param strategy: provider selection strategy
+    :param hedge_delay: delay in seconds before dispatching to the next provider
+    :param router: provider router
+    :param timeout: overall timeout in seconds
+    """
+    if not isinstance(auth_map, dict):
+        raise MyTextValidationError(INVALID_AUTH_MAP_ERROR)
+
+    if not isinstance(strategy, Strategy):
+        raise MyTextValidationError(INVALID_STRATEGY_ERROR)
+
+    if not isinstance(hedge_delay, (int, float)) or isinstance(hedge_delay, bool) or hedge_delay < 0:
+        raise MyTextValidationError(INVALID_HEDGE_DELAY_ERROR)
+
+    if router is not None and not isinstance(router, ProviderRouter):
+        raise MyTextValidationError(INVALID_ROUTER_ERROR)
+
+    if timeout is not None and (not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0):
+        raise MyTextValidationError(INVALID_TIMEOUT_ERROR)
+
+
+def _get_candidate_providers(
+        auth_map: Dict[Provider, dict],
+        providers: Optional[List[Provider]]) -> Tuple[List[Provider], List[tuple]]:
+    """
+    Return the providers with complete authentication parameters and an available circuit, in order.
+
+    Providers skipped because their circuit is open are returned as (provider, message) errors.
+
+    :param auth_map: authentication parameters of each provider
+    :param providers: providers in order of preference
+    """
+    if providers is None:
+        providers = list(Provider)
+    candidates = []
+    errors = []
+    for provider in providers:
+        auth = auth_map.get(provider)
+        if not auth or not all(auth.values()):
+            continue
+        if _get_circuit_breaker(provider).is_available():
+            candidates.append(provider)
+        else:
+            errors.append((provider, CIRCUIT_OPEN_ERROR.format(provider=provider.value)))
+    return candidates, errors
+
+
+def _build_failure_result(errors: List[tuple]) -> Dict[str, Union[bool, str]]:
+    """
+    Build the result of a run in which no provider succeeded.
+
+    :param errors: (provider, message) pairs of failed providers
+    """
+    if not errors:
+        message = NO_VALID_PROVIDER_CREDENTIALS_MESSAGE
+    else:
+        message = ALL_PROVIDERS_FAILED_MESSAGE
+        for provider, error_message in errors:
+            message += PROVIDER_FAILURE_TEMPLATE.format(provider=provider.value, message=error_message)
+    return {
+        "status": False,
+        "message": message,
+        "model": "unknown"}
+
+
+def _submit_daemon(function: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run a function on a daemon thread and return its future.
+
+    Losing hedge and race calls are abandoned on these threads, so they never keep the process alive at exit.
+
+    :param function: function
+    :param args: function arguments
+    """
+    future = Future()
+
+    def run() -> None:
+        """Run the function and store its outcome in the future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="mytext-auto", daemon=True).start()
+    return future
+
+
+def run_mytext_auto(
+        text: str,
+        auth_map: Dict[Provider, dict],
+        mode: Mode = Mode.PARAPHRASE,
+        tone: Tone = Tone.NEUTRAL,
+        providers: Optional[List[Provider]] = None,
+        model_map: Optional[Dict[Provider, str]] = None,
+        strategy: Strategy = Strategy.SEQUENTIAL,
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[BaseCache] = None,
+        router: Optional[ProviderRouter] = None,
+        timeout: Optional[float] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Run mytext over multiple providers and return the first successful result.
+
+    The sequential strategy tries providers one after another. The hedge strategy dispatches to the first provider
+    and, whenever no response has arrived within hedge_delay seconds (or a provider fails), dispatches to the next one.
+    The race strategy dispatches to all providers at once. Once the run returns, in-flight losers are cancelled: they
+    stop retrying and cut their backoff short, and their results are discarded. They run on daemon threads, so an
+    attempt still in flight never delays interpreter exit. When a router is given, providers are ordered by their
+    observed latency and success rate, and the outcome of every call that reached the provider is recorded (cache
+    hits are not). The timeout is an overall budget: each provider gets the time left of it, and providers still
+    running when it is exhausted are reported as timed out.
+
+    :param text: user text
+    :param auth_map: authentication parameters of each provider
+    :param mode: mode
+    :param tone: tone
+    :param providers: providers in order of preference (default: Provider enum order)
+    :param model_map: LLM model of each provider
+    :param strategy: provider selection strategy
+    :param hedge_delay: delay in seconds before dispatching to the next provider (hedge strategy)
+    :param retry_policy: retry policy
+    :param cache: response cache
+    :param router: provider router
+    :param timeout: overall timeout in seconds (None for no limit)
+    """
+    try:
+        _validate_run_mytext_auto_inputs(auth_map, strategy, hedge_delay, router, timeout)
+    except MyTextValidationError as e:
+        return {
+            "status": False,
+            "message": str(e),
+            "model": "unknown"}
+    model_map = model_map or dict()
+    candidates, errors = _get_candidate_providers(auth_map, providers)
+    if router is not None:
+        candidates = router.order(candidates, model_map)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    cancel_event = threading.Event()
+
+    def run_provider(provider: Provider) -> Dict[str, Union[bool, str]]:
+        """
+        Run mytext with the given provider.
+
+        :param provider: API provider
+        """
+        remaining = _get_remaining_timeout(deadline)
+        if remaining is not None and remaining <= 0:
+            return {
+                "status": False,
+                "message": TIMEOUT_EXCEEDED_ERROR,
+                "model": "unknown"}
+        start_time = time.perf_counter()
+        result = run_mytext(
+            text=text,
+            auth=auth_map[provider],
+            mode=mode,
+            tone=tone,
+            provider=provider,
+            model=model_map.get(provider),
+            retry_policy=retry_policy,
+            cache=cache,
+            timing=router is not None,
+            timeout=remaining,
+            cancel_event=cancel_event)
+        timing = result.pop("timing", None)
+        if router is not None and timing is not None and timing["attempts"] and not cancel_event.is_set():
+            router.record(provider, model_map.get(provider), time.perf_counter() - start_time, result["status"])
+        return result
+
+    try:
+        if strategy == Strategy.SEQUENTIAL or len(candidates) < 2:
+            for provider in candidates:
+                result = run_provider(provider)
+                if result["status"]:
+                    result["provider"] = provider.value
+                    return result
+                errors.append((provider, result["message"]))
+            return _build_failure_result(errors)
+
+        if strategy == Strategy.RACE:
+            hedge_delay = 0
+        futures = dict()
+        next_index = 0
+        while True:
+            if next_index < len(candidates) and (not futures or hedge_delay == 0):
+                futures[_submit_daemon(run_provider, candidates[next_index])] = candidates[next_index]
+                next_index += 1
+                continue
+            if not futures:
+                return _build_failure_result(errors)
+            wait_timeout = hedge_delay if next_index < len(candidates) else None
+            remaining = _get_remaining_timeout(deadline)
+            if remaining is not None:
+                wait_timeout = max(0, remaining if wait_timeout is None else min(wait_timeout, remaining))
+            done, _ = wait(futures, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                remaining = _get_remaining_timeout(deadline)
+                if remaining is not None and remaining <= 0:
+                    errors.extend((provider, TIMEOUT_EXCEEDED_ERROR) for provider in futures.values())
+                    return _build_failure_result(errors)
+                if next_index == len(candidates):
+                    continue
+                futures[_submit_daemon(run_provider, candidates[next_index])] = candidates[next_index]
+                next_index += 1
+                continue
+            for future in done:
+                provider = futures.pop(future)
+                result = future.result()
+                if result["status"]:
+                    result["provider"] = provider.value
+                    return result
+                errors.append((provider, result["message"]))
+            if next_index < len(candidates):
+                futures[_submit_daemon(run_provider, candidates[next_index])] = candidates[next_index]
+                next_index += 1
+    finally:
+        cancel_event.set()
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    :param text: text
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_long_segment(segment: str, max_chunk_tokens: int) -> List[str]:
+    """
+    Split a segment that exceeds the token budget on sentence, then word boundaries.
+
+    :param segment: text segment
+    :param max_chunk_tokens: maximum number of tokens per chunk
+    """
+    max_chars = max_chunk_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for sentence in re.split(r"(?<=[.!?])\s+", segment):
+        while len(sentence) > max_chars:
+            split_index = sentence.rfind(" ", 0, max_chars + 1)
+            if split_index <= 0:
+                split_index = max_chars
+            pieces.append(sentence[:split_index].strip())
+            sentence = sentence[split_index:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def _split_text(text: str, max_chunk_tokens: int) -> List[str]:
+    """
+    Split a text into chunks under the token budget on paragraph and sentence boundaries.
+
+    :param text: user text
+    :param max_chunk_tokens: maximum number of tokens per chunk
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for paragraph in re.split(r"\n\s*\n", text.strip()):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        units = [(paragraph, "\n\n")]
+        if _estimate_tokens(paragraph) > max_chunk_tokens:
+            pieces = _split_long_segment(paragraph, max_chunk_tokens)
+            units = [(pieces[0], "\n\n")] + [(piece, " ") for piece in pieces[1:]]
+        for unit, separator in units:
+            unit_tokens = _estimate_tokens(unit)
+            if current and current_tokens + unit_tokens > max_chunk_tokens:
+                chunks.append("".join(current).strip())
+                current = []
+                current_tokens = 0
+            if current:
+                current.append(separator)
+            current.append(unit)
+            current_tokens += unit_tokens
+    if current:
+        chunks.append("".join(current).strip())
+    return chunks
+
+
+def run_mytext_long(
+        text: str,
+        auth: dict,
+        mode: Mode = Mode.PARAPHRASE,
+        tone: Tone = Tone.NEUTRAL,
+        provider: Provider = Provider.AI_STUDIO,
+        model: Optional[str] = None,
+        max_chunk_tokens: int = DEFAULT_MAX_CHUNK_TOKENS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[BaseCache] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Run mytext on a long document.
+
+    The text is split on paragraph and sentence boundaries into chunks under the token budget, the chunks are
+    processed concurrently and their outputs are stitched back in order. In summarize mode, the chunk summaries
+    are summarized again until they fit in a single chunk.
+
+    :param text: user text
+    :param auth: authentication parameters
+    :param mode: mode
+    :param tone: tone
+    :param provider: API provider
+    :param model: LLM model
+    :param max_chunk_tokens: maximum number of estimated tokens per chunk
+    :param max_workers: maximum number of concurrent workers
+    :param retry_policy: retry policy
+    :param cache: response cache
+    """
+    try:
+        _validate_run_mytext_inputs(text, auth, mode, tone, provider, model, retry_policy, cache)
+        if not isinstance(max_chunk_tokens, int) or isinstance(max_chunk_tokens, bool) or max_chunk_tokens < 1:
+            raise MyTextValidationError(INVALID_MAX_CHUNK_TOKENS_ERROR)
+        _validate_run_mytext_batch_inputs([], max_workers)
+    except MyTextValidationError as e:
         return {
             "status": False,
             "message": str(e),
             "model": "unknown"}
+    chunks = _split_text(text, max_chunk_tokens)
+    if len(chunks) <= 1:
+        return run_mytext(
+            text=text,
+            auth=auth,
+            mode=mode,
+            tone=tone,
+            provider=provider,
+            model=model,
+            retry_policy=retry_policy,
+            cache=cache)
+    results = run_mytext_batch(
+        texts=chunks,
+        auth=auth,
+        mode=mode,
+        tone=tone,
+        provider=provider,
+        model=model,
+        max_workers=max_workers,
+        retry_policy=retry_policy,
+        cache=cache)
+    for index, result in enumerate(results, 1):
+        if not result["status"]:
+            return {
+                "status": False,
+                "message": CHUNK_FAILED_ERROR.format(index=index, message=result["message"]),
+                "model": result["model"]}
+    message = "\n\n".join(result["message"].strip() for result in results)
+    if mode == Mode.SUMMARIZE and len(message) < len(text):
+        return run_mytext_long(
+            text=message,
+            auth=auth,
+            mode=mode,
+            tone=tone,
+            provider=provider,
+            model=model,
+            max_chunk_tokens=max_chunk_tokens,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+            cache=cache)
+    return {
+        "status": True,
+        "message": message,
+        "model": results[0]["model"]}
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""mytext keys."""
+
+import time
+import threading
+from typing import Dict, List, Tuple, Optional, Any
+from .errors import MyTextValidationError
+from .params import Provider, KeyRotation
+from .params import DEFAULT_QUARANTINE_TIME
+from .params import INVALID_API_KEYS_ERROR, INVALID_KEY_ROTATION_ERROR, INVALID_QUARANTINE_TIME_ERROR
+
+
+def _validate_api_keys(keys: Any) -> None:
+    """
+    Validate a list of API keys.
+
+    :param keys: API keys
+    """
+    if not isinstance(keys, list) or not keys or not all(isinstance(key, str) and key for key in keys):
+        raise MyTextValidationError(INVALID_API_KEYS_ERROR)
+
+
+class KeyPool:
+    """Thread-safe pool of API keys of a provider with rotation and temporary quarantine."""
+
+    def __init__(
+            self,
+            keys: List[str],
+            strategy: KeyRotation = KeyRotation.ROUND_ROBIN,
+            quarantine_time: float = DEFAULT_QUARANTINE_TIME) -> None:
+        """
+        Initialize the key pool.
+
+        :param keys: API keys
+        :param strategy: key rotation strategy
+        :param quarantine_time: seconds a rejected key is skipped (unless the provider sends Retry-After)
+        """
+        _validate_api_keys(keys)
+        if not isinstance(strategy, KeyRotation):
+            raise MyTextValidationError(INVALID_KEY_ROTATION_ERROR)
+        if not isinstance(quarantine_time, (int, float)) or isinstance(quarantine_time, bool) or quarantine_time <= 0:
+            raise MyTextValidationError(INVALID_QUARANTINE_TIME_ERROR)
+        self.keys = list(dict.fromkeys(keys))
+        self.strategy = strategy
+        self.quarantine_time = quarantine_time
+        self._index = 0
+        self._quarantined_until = {key: float("-inf") for key in self.keys}
+        self._throttled_at = {key: float("-inf") for key in self.keys}
+        self._used_at = {key: float("-inf") for key in self.keys}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return len(self.keys)
+
+    def _get_available_keys(self, now: float) -> List[str]:
+        """
+        Return the keys that are not quarantined.
+
+        :param now: current monotonic time
+        """
+        return [key for key in self.keys if self._quarantined_until[key] <= now]
+
+    def next_key(self) -> str:
+        """Return the key to use for the next request; if all keys are quarantined, the one released first."""
+        with self._lock:
+            now = time.monotonic()
+            available = self._get_available_keys(now)
+            if not available:
+                key = min(self.keys, key=self._quarantined_until.get)
+            elif self.strategy == KeyRotation.ROUND_ROBIN:
+                for offset in range(len(self.keys)):
+                    key = self.keys[(self._index + offset) % len(self.keys)]
+                    if key in available:
+                        break
+                self._index = (self.keys.index(key) + 1) % len(self.keys)
+            else:
+                key = min(available, key=lambda item: (self._throttled_at[item], self._used_at[item]))
+            self._used_at[key] = now
+            return key
+
+    def quarantine(self, key: str, duration: Optional[float] = None) -> None:
+        """
+        Skip a key rejected by the provider for a while.
+
+        :param key: API key
+        :param duration: quarantine duration in seconds (default: quarantine_time)
+        """
+        with self._lock:
+            if key not in self._quarantined_until:
+                return
+            now = time.monotonic()
+            self._quarantined_until[key] = now + (duration or self.quarantine_time)
+            self._throttled_at[key] = now
+
+    def has_available(self) -> bool:
+        """Return True if at least one key is not quarantined."""
+        with self._lock:
+            return len(self._get_available_keys(time.monotonic())) > 0
+
+
+_KEY_ROTATIONS: Dict[Provider, Tuple[KeyRotation, float]] = dict()
+_KEY_POOLS: Dict[Tuple[Provider, Tuple[str, ...]], KeyPool] = dict()
+_KEY_POOLS_LOCK = threading.Lock()
+
+
+def _get_key_pool(provider: Provider, keys: List[str]) -> KeyPool:
+    """
+    Return the shared key pool of the given provider and keys.
+
+    :param provider: LLM provider
+    :param keys: API keys
+    """
+    pool_key = (provider, tuple(keys))
+    with _KEY_POOLS_LOCK:
+        pool = _KEY_POOLS.get(pool_key)
+        if pool is None:
+            strategy, quarantine_time = _KEY_ROTATIONS.get(
+                provider, (KeyRotation.ROUND_ROBIN, DEFAULT_QUARANTINE_TIME))
+            pool = KeyPool(keys, strategy=strategy, quarantine_time=quarantine_time)
+            _KEY_POOLS[pool_key] = pool
+        return pool
+
+
+def configure_key_rotation(
+        provider: Optional[Provider] = None,
+        strategy: KeyRotation = KeyRotation.ROUND_ROBIN,
+        quarantine_time: float = DEFAULT_QUARANTINE_TIME) -> None:
+    """
+    Configure the API key rotation of a provider (or of all providers).
+
+    :param provider: LLM provider (None for all providers)
+    :param strategy: key rotation strategy
+    :param quarantine_time: seconds a rejected key is skipped (unless the provider sends Retry-After)
+    """
+    KeyPool(["-"], strategy=strategy, quarantine_time=quarantine_time)
+    providers = list(Provider) if provider is None else [provider]
+    with _KEY_POOLS_LOCK:
+        for item in providers:
+            _KEY_ROTATIONS[item] = (strategy, quarantine_time)
+        for pool_key in [pool_key for pool_key in _KEY_POOLS if pool_key[0] in providers]:
+            del _KEY_POOLS[pool_key]
+
+
+def reset_key_pools() -> None:
+    """Restore the default key rotation of all providers and release all quarantined keys."""
+    with _KEY_POOLS_LOCK:
+        _KEY_ROTATIONS.clear()
+        _KEY_POOLS.clear()
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""mytext metrics."""
+
+import math
+import bisect
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple, Iterable, Optional, Any
+from .errors import MyTextValidationError, MyTextProviderError
+from .params import Provider, Mode, Tone
+from .params import DEFAULT_METRICS_BUCKETS, DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT
+from .params import METRICS_PATH, METRICS_CONTENT_TYPE, METRICS_HELP
+from .params import METRIC_REQUESTS, METRIC_REQUEST_DURATION, METRIC_CACHE_LOOKUPS, METRIC_CACHE_HIT_RATIO
+from .params import METRIC_PROVIDER_ATTEMPTS, METRIC_PROVIDER_ERRORS, METRIC_PROVIDER_RETRIES
+from .params import INVALID_METRICS_BUCKETS_ERROR
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _build_labels(**labels: Any) -> Labels:
+    """
+    Build the sorted label set of a sample.
+
+    :param labels: label values
+    """
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels, *extra: Tuple[str, str]) -> str:
+    """
+    Format a label set in the text exposition format.
+
+    :param labels: label set
+    :param extra: additional labels
+    """
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = []
+    for name, value in items:
+        value = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        escaped.append("{name}=\"{value}\"".format(name=name, value=value))
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_number(value: float) -> str:
+    """
+    Format a sample value in the text exposition format.
+
+    :param value: value
+    """
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters and histograms rendered in the OpenMetrics text format."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_METRICS_BUCKETS) -> None:
+        """
+        Initialize the metrics registry.
+
+        :param buckets: upper bounds of the latency histogram buckets in seconds
+        """
+        try:
+            buckets = sorted(float(bucket) for bucket in buckets)
+        except (TypeError, ValueError):
+            raise MyTextValidationError(INVALID_METRICS_BUCKETS_ERROR)
+        if not buckets or buckets[0] <= 0:
+            raise MyTextValidationError(INVALID_METRICS_BUCKETS_ERROR)
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[Labels, int]] = dict()
+        self._histograms: Dict[str, Dict[Labels, List[Any]]] = dict()
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: Labels, amount: int = 1) -> None:
+        """
+        Increment a counter.
+
+        :param name: metric name
+        :param labels: label set
+        :param amount: increment
+        """
+        with self._lock:
+            samples = self._counters.setdefault(name, dict())
+            samples[labels] = samples.get(labels, 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """
+        Record an observation in a histogram.
+
+        :param name: metric name
+        :param labels: label set
+        :param value: observed value
+        """
+        with self._lock:
+            samples = self._histograms.setdefault(name, dict())
+            sample = samples.get(labels)
+            if sample is None:
+                sample = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                samples[labels] = sample
+            sample[0][bisect.bisect_left(self.buckets, value)] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    def get(self, name: str, **labels: Any) -> int:
+        """
+        Return the value of a counter (or the observation count of a histogram).
+
+        :param name: metric name
+        :param labels: label values
+        """
+        labels = _build_labels(**labels)
+        with self._lock:
+            if name in self._histograms:
+                sample = self._histograms[name].get(labels)
+                return 0 if sample is None else sample[2]
+            return self._counters.get(name, dict()).get(labels, 0)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _get_cache_hit_ratios(self) -> Dict[Labels, float]:
+        """Return the cache hit ratio of each label set."""
+        totals = dict()
+        hits = dict()
+        for labels, value in self._counters.get(METRIC_CACHE_LOOKUPS, dict()).items():
+            base_labels = tuple(item for item in labels if item[0] != "result")
+            totals[base_labels] = totals.get(base_labels, 0) + value
+            if ("result", "hit") in labels:
+                hits[base_labels] = hits.get(base_labels, 0) + value
+        return {labels: hits.get(labels, 0) / total for labels, total in totals.items() if total}
+
+    def render(self) -> str:
+        """Return all metrics in the OpenMetrics text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append("# HELP {name} {help}".format(name=name, help=METRICS_HELP.get(name, name)))
+                lines.append("# TYPE {name} counter".format(name=name))
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append("{name}_total{labels} {value}".format(
+                        name=name, labels=_format_labels(labels), value=_format_number(value)))
+            ratios = self._get_cache_hit_ratios()
+            if ratios:
+                name = METRIC_CACHE_HIT_RATIO
+                lines.append("# HELP {name} {help}".format(name=name, help=METRICS_HELP[name]))
+                lines.append("# TYPE {name} gauge".format(name=name))
+                for labels, value in sorted(ratios.items()):
+                    lines.append("{name}{labels} {value}".format(
+                        name=name, labels=_format_labels(labels), value=_format_number(float(value))))
+            for name in sorted(self._histograms):
+                lines.append("# HELP {name} {help}".format(name=name, help=METRICS_HELP.get(name, name)))
+                lines.append("# TYPE {name} histogram".format(name=name))
+                for labels, (bucket_counts, total, count) in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets + (math.inf,), bucket_counts):
+                        cumulative += bucket_count
+                        lines.append("{name}_bucket{labels} {value}".format(
+                            name=name,
+                            labels=_format_labels(labels, ("le", _format_number(bound))),
+                            value=cumulative))
+                    lines.append("{name}_count{labels} {value}".format(
+                        name=name, labels=_format_labels(labels), value=count))
+                    lines.append("{name}_sum{labels} {value}".format(
+                        name=name, labels=_format_labels(labels), value=_format_number(total)))
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+_METRICS: Optional[MetricsRegistry] = None
+
+
+def enable_metrics(buckets: Iterable[float] = DEFAULT_METRICS_BUCKETS) -> MetricsRegistry:
+    """
+    Start recording metrics of all calls in a new registry and return it.
+
+    :param buckets: upper bounds of the latency histogram buckets in seconds
+    """
+    global _METRICS
+    _METRICS = MetricsRegistry(buckets=buckets)
+    return _METRICS
+
+
+def disable_metrics() -> None:
+    """Stop recording metrics."""
+    global _METRICS
+    _METRICS = None
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """Return the active metrics registry, or None if metrics are disabled."""
+    return _METRICS
+
+
+def _record_run(
+        provider: Provider,
+        model: str,
+        mode: Mode,
+        tone: Tone,
+        status: bool,
+        duration: float,
+        cache_hit: Optional[bool] = None) -> None:
+    """
+    Record a run_mytext call in the active metrics registry.
+
+    :param provider: LLM provider
+    :param model: LLM model
+    :param mode: mode
+    :param tone: tone
+    :param status: result status
+    :param duration: call duration in seconds
+    :param cache_hit: cache lookup outcome (None if no cache is used)
+    """
+    registry = _METRICS
+    if registry is None:
+        return
+    labels = dict(provider=provider.value, model=model, mode=mode.value, tone=tone.value)
+    registry.inc(METRIC_REQUESTS, _build_labels(status="success" if status else "failure", **labels))
+    registry.observe(METRIC_REQUEST_DURATION, _build_labels(**labels), duration)
+    if cache_hit is not None:
+        registry.inc(METRIC_CACHE_LOOKUPS, _build_labels(result="hit" if cache_hit else "miss", **labels))
+
+
+def _record_provider_attempt(provider: Provider, model: str, error: Optional[Exception] = None) -> None:
+    """
+    Record a provider request in the active metrics registry.
+
+    :param provider: LLM provider
+    :param model: LLM model
+    :param error: raised error (None on success)
+    """
+    registry = _METRICS
+    if registry is None:
+        return
+    registry.inc(METRIC_PROVIDER_ATTEMPTS, _build_labels(provider=provider.value, model=model))
+    if error is not None:
+        status_code = error.status_code if isinstance(error, MyTextProviderError) else None
+        registry.inc(
+            METRIC_PROVIDER_ERRORS,
+            _build_labels(provider=provider.value, model=model, status_code=status_code or "none"))
+
+
+def _record_provider_retry(provider: Provider, model: str) -> None:
+    """
+    Record a provider request retry in the active metrics registry.
+
+    :param provider: LLM provider
+    :param model: LLM model
+    """
+    registry = _METRICS
+    if registry is not None:
+        registry.inc(METRIC_PROVIDER_RETRIES, _build_labels(provider=provider.value, model=model))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Request handler serving the metrics text exposition."""
+
+    def log_message(self, *args: Any) -> None:
+        """
+        Disable request logging.
+
+        :param args: log arguments
+        """
+
+    def do_GET(self) -> None:
+        """Serve the metrics of the server registry (or of the active registry)."""
+        if self.path.split("?")[0] != METRICS_PATH:
+            self.send_error(404)
+            return
+        registry = self.server.registry or _METRICS
+        body = (registry.render() if registry is not None else "# EOF\n").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(
+        port: int = DEFAULT_METRICS_PORT,
+        host: str = DEFAULT_METRICS_HOST,
+        registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at /metrics from a background thread and return the server (stop it with shutdown()).
+
+    :param port: port (0 for any free port)
+    :param host: host
+    :param registry: metrics registry (default: the active registry)
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""mytext offline batch."""
+
+import json
+import time
+import contextlib
+from typing import Dict, List, Union, Callable, Optional, Any
+from memor import Prompt, RenderFormat
+from .errors import MyTextProviderError
+from .sessions import _get_session
+from .providers import _build_provider_error, _get_auth_key_pool, _select_auth
+from .retry import RetryPolicy
+from .params import Provider
+from .params import BATCH_COMPLETION_WINDOW, BATCH_CHAT_COMPLETIONS_ENDPOINT
+from .params import BATCH_FINAL_STATUSES, AI_STUDIO_BATCH_FINAL_STATES
+from .params import AI_STUDIO_BATCH_BASE_URL, AI_STUDIO_HEADERS
+from .params import GROQ_BATCH_BASE_URL, GROQ_HEADERS
+from .params import BATCH_REQUEST_TIMEOUT
+from .params import PROVIDER_ERROR_MESSAGE, BATCH_FAILED_ERROR, BATCH_TIMEOUT_ERROR, BATCH_REQUEST_ERROR
+
+
+def _get_json(response: Any) -> Dict[str, Any]:
+    """
+    Return the JSON body of a successful response, raising on unsuccessful status codes.
+
+    :param response: provider response
+    """
+    if response.status_code not in (200, 201):
+        raise _build_provider_error(response)
+    return response.json()
+
+
+def _get_text(response: Any) -> str:
+    """
+    Return the text body of a successful response, raising on unsuccessful status codes.
+
+    :param response: provider response
+    """
+    if response.status_code not in (200, 201):
+        raise _build_provider_error(response)
+    return response.text
+
+
+def _call_batch_api(
+        function: Callable[[], Any],
+        retry_policy: RetryPolicy,
+        batch_id: str,
+        deadline: Optional[float] = None) -> Any:
+    """
+    Call a batch API endpoint of a created batch, retrying transient failures according to the retry policy.
+
+    The error raised once the retries are exhausted names the batch, so its results can still be fetched later.
+
+    :param function: function sending the request
+    :param retry_policy: retry policy
+    :param batch_id: batch ID
+    :param deadline: time (monotonic) after which no retry starts
+    """
+    retry_index = 0
+    start_time = time.monotonic()
+    while True:
+        try:
+            return function()
+        except Exception as e:
+            retry_index += 1
+            delay = retry_policy.get_delay(retry_index, e, time.monotonic() - start_time)
+            if delay is None or (deadline is not None and time.monotonic() + delay > deadline):
+                raise MyTextProviderError(
+                    BATCH_REQUEST_ERROR.format(batch_id=batch_id, message=e),
+                    status_code=getattr(e, "status_code", None)) from e
+            time.sleep(delay)
+
+
+def _wait_for_batch(
+        fetch: Callable[[], Dict[str, Any]],
+        is_final: Callable[[Dict[str, Any]], bool],
+        cancel: Callable[[], Any],
+        batch_id: str,
+        poll_interval: float,
+        timeout: float,
+        retry_policy: RetryPolicy) -> Dict[str, Any]:
+    """
+    Poll a batch job until it reaches a final state and return its last status.
+
+    Failed status checks are retried according to the retry policy. The job is cancelled if it does not finish
+    within the timeout.
+
+    :param fetch: function returning the batch status
+    :param is_final: function checking whether a batch status is final
+    :param cancel: function cancelling the batch
+    :param batch_id: batch ID
+    :param poll_interval: seconds between status checks
+    :param timeout: maximum seconds to wait for the batch
+    :param retry_policy: retry policy of the status checks
+    """
+    start_time = time.monotonic()
+    while True:
+        data = _call_batch_api(fetch, retry_policy, batch_id, start_time + timeout)
+        if is_final(data):
+            return data
+        if time.monotonic() - start_time + poll_interval > timeout:
+            with contextlib.suppress(Exception):
+                cancel()
+            raise MyTextProviderError(BATCH_TIMEOUT_ERROR.format(batch_id=batch_id, timeout=timeout))
+        time.sleep(poll_interval)
+
+
+def _build_groq_result(record: Dict[str, Any], model: str) -> Dict[str, Union[bool, str]]:
+    """
+    Convert a line of a Groq batch output or error file into a result.
+
+    :param record: batch output record
+    :param model: LLM model
+    """
+    response = record.get("response") or dict()
+    body = response.get("body") or dict()
+    if response.get("status_code") in (200, 201) and body.get("choices"):
+        return {
+            "status": True,
+            "message": body["choices"][0]["message"]["content"],
+            "model": model}
+    error = record.get("error") or body.get("error") or dict()
+    message = error.get("message") or PROVIDER_ERROR_MESSAGE.format(
+        status_code=response.get("status_code"),
+        content=json.dumps(body))
+    return {
+        "status": False,
+        "message": message,
+        "model": model}
+
+
+def _run_groq_batch(
+        prompts: Dict[str, Prompt],
+        auth: Dict[str, Any],
+        model: str,
+        poll_interval: float,
+        timeout: float,
+        base_url: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None) -> Dict[str, Dict[str, Union[bool, str]]]:
+    """
+    Run prompts through the Groq batch API and return the results by ID.
+
+    The prompts are uploaded as a JSONL file, the batch is polled until it finishes, and the output and error
+    files are downloaded.
+
+    :param prompts: prompts by ID
+    :param auth: authentication parameters
+    :param model: LLM model
+    :param poll_interval: seconds between status checks
+    :param timeout: maximum seconds to wait for the batch
+    :param base_url: API base URL
+    :param retry_policy: retry policy of the requests sent after the batch is created
+    """
+    retry_policy = retry_policy or RetryPolicy()
+    base_url = (base_url or GROQ_BATCH_BASE_URL).rstrip("/")
+    api_key = _select_auth(auth, _get_auth_key_pool(Provider.GROQ, auth))["api_key"]
+    headers = {"Authorization": GROQ_HEADERS["Authorization"].format(api_key=api_key)}
+    session = _get_session(base_url)
+    lines = []
+    for custom_id, prompt in prompts.items():
+        lines.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_CHAT_COMPLETIONS_ENDPOINT,
+            "body": {"model": model, "messages": [prompt.render(RenderFormat.OPENAI)]}}, ensure_ascii=False))
+    file_data = _get_json(session.post(
+        base_url + "/files",
+        headers=headers,
+        data={"purpose": "batch"},
+        files={"file": ("mytext_batch.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl")},
+        timeout=BATCH_REQUEST_TIMEOUT))
+    batch_data = _get_json(session.post(
+        base_url + "/batches",
+        headers=headers,
+        json={
+            "input_file_id": file_data["id"],
+            "endpoint": BATCH_CHAT_COMPLETIONS_ENDPOINT,
+            "completion_window": BATCH_COMPLETION_WINDOW},
+        timeout=BATCH_REQUEST_TIMEOUT))
+    batch_id = batch_data["id"]
+    batch_url = "{base_url}/batches/{batch_id}".format(base_url=base_url, batch_id=batch_id)
+    batch_data = _wait_for_batch(
+        fetch=lambda: _get_json(session.get(batch_url, headers=headers, timeout=BATCH_REQUEST_TIMEOUT)),
+        is_final=lambda data: data.get("status") in BATCH_FINAL_STATUSES,
+        cancel=lambda: session.post(batch_url + "/cancel", headers=headers, timeout=BATCH_REQUEST_TIMEOUT),
+        batch_id=batch_id,
+        poll_interval=poll_interval,
+        timeout=timeout,
+        retry_policy=retry_policy)
+    results = dict()
+    for file_key in ("output_file_id", "error_file_id"):
+        file_id = batch_data.get(file_key)
+        if not file_id:
+            continue
+        file_url = "{base_url}/files/{file_id}/content".format(base_url=base_url, file_id=file_id)
+        content = _call_batch_api(
+            lambda: _get_text(session.get(file_url, headers=headers, timeout=BATCH_REQUEST_TIMEOUT)),
+            retry_policy,
+            batch_id)
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            results[record["custom_id"]] = _build_groq_result(record, model)
+    if not results:
+        raise MyTextProviderError(BATCH_FAILED_ERROR.format(batch_id=batch_id, status=batch_data.get("status")))
+    return results
+
+
+def _build_ai_studio_result(item: Dict[str, Any], model: str) -> Dict[str, Union[bool, str]]:
+    """
+    Convert an inlined AI Studio batch response into a result.
+
+    :param item: inlined batch response
+    :param model: LLM model
+    """
+    try:
+        return {
+            "status": True,
+            "message": item["response"]["candidates"][0]["content"]["parts"][0]["text"],
+            "model": model}
+    except (KeyError, IndexError, TypeError):
+        error = item.get("error") or dict()
+        return {
+            "status": False,
+            "message": error.get("message") or json.dumps(item),
+            "model": model}
+
+
+def _run_ai_studio_batch(
+        prompts: Dict[str, Prompt],
+        auth: Dict[str, Any],
+        model: str,
+        poll_interval: float,
+        timeout: float,
+        base_url: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None) -> Dict[str, Dict[str, Union[bool, str]]]:
+    """
+    Run prompts through the AI Studio (Gemini) batch API and return the results by ID.
+
+    The prompts are sent as inlined requests tagged with their IDs and the batch is polled until it finishes.
+
+    :param prompts: prompts by ID
+    :param auth: authentication parameters
+    :param model: LLM model
+    :param poll_interval: seconds between status checks
+    :param timeout: maximum seconds to wait for the batch
+    :param base_url: API base URL
+    :param retry_policy: retry policy of the requests sent after the batch is created
+    """
+    retry_policy = retry_policy or RetryPolicy()
+    base_url = (base_url or AI_STUDIO_BATCH_BASE_URL).rstrip("/")
+    params = {"key": _select_auth(auth, _get_auth_key_pool(Provider.AI_STUDIO, auth))["api_key"]}
+    session = _get_session(base_url)
+    ids: List[str] = list(prompts)
+    requests_data = [
+        {"request": {"contents": prompt.render(RenderFormat.AI_STUDIO)}, "metadata": {"key": custom_id}}
+        for custom_id, prompt in prompts.items()]
+    batch_data = _get_json(session.post(
+        "{base_url}/models/{model}:batchGenerateContent".format(base_url=base_url, model=model),
+        headers=AI_STUDIO_HEADERS,
+        params=params,
+        json={"batch": {"display_name": "mytext", "input_config": {"requests": {"requests": requests_data}}}},
+        timeout=BATCH_REQUEST_TIMEOUT))
+    batch_id = batch_data["name"]
+    batch_url = "{base_url}/{batch_id}".format(base_url=base_url, batch_id=batch_id)
+
+    def get_state(data: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the state of a batch.
+
+        :param data: batch status
+        """
+        return (data.get("metadata") or dict()).get("state") or data.get("state")
+
+    batch_data = _wait_for_batch(
+        fetch=lambda: _get_json(session.get(batch_url, params=params, timeout=BATCH_REQUEST_TIMEOUT)),
+        is_final=lambda data: bool(data.get("done")) or get_state(data) in AI_STUDIO_BATCH_FINAL_STATES,
+        cancel=lambda: session.post(batch_url + ":cancel", params=params, timeout=BATCH_REQUEST_TIMEOUT),
+        batch_id=batch_id,
+        poll_interval=poll_interval,
+        timeout=timeout,
+        retry_policy=retry_policy)
+    output = batch_data.get("response") or (batch_data.get("metadata") or dict()).get("output") or dict()
+    items = (output.get("inlinedResponses") or dict()).get("inlinedResponses") or []
+    results = dict()
+    for index, item in enumerate(items):
+        custom_id = (item.get("metadata") or dict()).get("key")
+        if custom_id is None and index < len(ids):
+            custom_id = ids[index]
+        results[custom_id] = _build_ai_studio_result(item, model)
+    if not results:
+        raise MyTextProviderError(BATCH_FAILED_ERROR.format(batch_id=batch_id, status=get_state(batch_data)))
+    return results
+
+
+OFFLINE_BATCH_PROVIDER_MAP = {
+    Provider.AI_STUDIO: _run_ai_studio_batch,
+    Provider.GROQ: _run_groq_batch,
+}
@@ -2,12 +2,27 @@
 """mytext providers."""
 
 import time
+import json
+import asyncio
+import functools
+import threading
+import email.utils
+from typing import Union, Dict, Tuple, Optional, Callable, Any, Iterator
 import requests
-from typing import Union, Dict
 from memor import Prompt, RenderFormat
 from .errors import MyTextProviderError
-from .params import Provider
-from .params import AI_STUDIO_API_URL, AI_STUDIO_HEADERS
+from .sessions import _get_session, _get_offload_executor, _get_async_client, _import_httpx
+from .retry import RetryPolicy
+from .breaker import CircuitBreaker, _get_circuit_breaker
+from .ratelimit import RateLimiter, _get_rate_limiter
+from .keys import KeyPool, _get_key_pool
+from .metrics import _record_provider_attempt, _record_provider_retry
+from .tracing import _span
+from .params import Provider, CHARS_PER_TOKEN, QUARANTINE_STATUS_CODES
+from .params import DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, DEFAULT_BACKOFF_FACTOR, DEFAULT_API_TIMEOUT
+from .params import PROVIDER_ERROR_MESSAGE, CIRCUIT_OPEN_ERROR, TIMEOUT_EXCEEDED_ERROR, CALL_CANCELLED_ERROR
+from .params import SPAN_ATTEMPT, SPAN_RENDER, SPAN_HTTP, SPAN_PARSE, SPAN_BACKOFF, SPAN_RATE_LIMIT
+from .params import AI_STUDIO_API_URL, AI_STUDIO_STREAM_API_URL, AI_STUDIO_HEADERS
 from .params import CLOUDFLARE_API_URL, CLOUDFLARE_HEADERS
 from .params import OPENROUTER_API_URL, OPENROUTER_HEADERS
 from .params import CEREBRAS_API_URL, CEREBRAS_HEADERS
@@ -16,52 +31,403 @@ from .params import NVIDIA_API_URL, NVIDIA_HEADERS
 from .params import GITHUB_API_URL, GITHUB_HEADERS
 
 
-def _call_github(
+def _parse_retry_after(value: Any) -> Optional[float]:
+    """
+    Parse the Retry-After header value into seconds.
+
+    :param value: Retry-After header value (delta-seconds or HTTP-date)
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date is None:
+        return None
+    return max(0.0, retry_date.timestamp() - time.time())
+
+
+def _build_provider_error(response: Any) -> MyTextProviderError:
+    """
+    Build a provider error from an unsuccessful response.
+
+    :param response: provider response
+    """
+    return MyTextProviderError(
+        PROVIDER_ERROR_MESSAGE.format(
+            status_code=response.status_code,
+            content=response.text),
+        status_code=response.status_code,
+        retry_after=_parse_retry_after(response.headers.get("Retry-After")))
+
+
+def _record_transfer(stats: Optional[Dict[str, Any]], response: Any) -> None:
+    """
+    Record the request and response body sizes of a provider call in the timing statistics.
+
+    :param stats: timing statistics
+    :param response: provider response
+    """
+    if stats is None:
+        return
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None)
+    if body is None:
+        body = getattr(request, "content", None)
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if isinstance(body, bytes):
+        stats["bytes_sent"] += len(body)
+    content = getattr(response, "content", None)
+    if isinstance(content, bytes):
+        stats["bytes_received"] += len(content)
+
+
+def _render_prompt(prompt: Prompt, render_format: RenderFormat) -> Any:
+    """
+    Render the prompt in a provider format.
+
+    :param prompt: user prompt
+    :param render_format: render format
+    """
+    with _span(SPAN_RENDER, format=render_format.name):
+        return prompt.render(render_format)
+
+
+def _send(session: Any, api_url: str, **kwargs: Any) -> Any:
+    """
+    Send a provider request.
+
+    :param session: HTTP session
+    :param api_url: API URL
+    :param kwargs: request keyword arguments
+    """
+    with _span(SPAN_HTTP):
+        return session.post(api_url, **kwargs)
+
+
+async def _asend(client: Any, api_url: str, **kwargs: Any) -> Any:
+    """
+    Send a provider request over a non-blocking HTTP client.
+
+    Transport errors are raised as the equivalent requests exceptions, so they are retried like blocking ones.
+
+    :param client: non-blocking HTTP client (httpx.AsyncClient)
+    :param api_url: API URL
+    :param kwargs: request keyword arguments
+    """
+    httpx = _import_httpx()
+    with _span(SPAN_HTTP):
+        try:
+            return await client.post(api_url, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+
+def _parse_json(response: Any) -> Dict[str, Any]:
+    """
+    Parse the JSON body of a provider response.
+
+    :param response: provider response
+    """
+    with _span(SPAN_PARSE):
+        return response.json()
+
+
+def _get_openai_message(response_data: Dict[str, Any]) -> str:
+    """
+    Return the message of an OpenAI-compatible chat completions response.
+
+    :param response_data: response data
+    """
+    return response_data["choices"][0]["message"]["content"]
+
+
+def _get_ai_studio_message(response_data: Dict[str, Any]) -> str:
+    """
+    Return the message of an AI Studio response.
+
+    :param response_data: response data
+    """
+    return response_data['candidates'][0]['content']['parts'][0]['text']
+
+
+def _get_cloudflare_message(response_data: Dict[str, Any]) -> str:
+    """
+    Return the message of a Cloudflare response.
+
+    :param response_data: response data
+    """
+    return response_data["result"]["response"]
+
+
+def _build_bearer_headers(headers_template: Dict[str, str], auth: Dict[str, str]) -> Dict[str, str]:
+    """
+    Return the request headers with the API key filled in the Authorization header.
+
+    :param headers_template: request headers template
+    :param auth: authentication parameters
+    """
+    headers = headers_template.copy()
+    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
+    return headers
+
+
+def _build_ai_studio_request(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of an AI Studio API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    data = dict()
+    data.update({"contents": _render_prompt(prompt, RenderFormat.AI_STUDIO)})
+    api_url = AI_STUDIO_API_URL.format(
+        api_key=auth["api_key"],
+        model=model)
+    return api_url, AI_STUDIO_HEADERS, data
+
+
+def _build_cloudflare_request(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of a Cloudflare API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    data = dict()
+    data["messages"] = [_render_prompt(prompt, RenderFormat.OPENAI)]
+    api_url = CLOUDFLARE_API_URL.format(
+        account_id=auth["account_id"],
+        model=model)
+    return api_url, _build_bearer_headers(CLOUDFLARE_HEADERS, auth), data
+
+
+def _build_openai_compatible_request(
+        api_url: str,
+        headers_template: Dict[str, str],
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of an OpenAI-compatible chat completions API request.
+
+    :param api_url: API URL
+    :param headers_template: request headers template
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    data = {
+        "model": model,
+        "messages": [_render_prompt(prompt, RenderFormat.OPENAI)]
+    }
+    return api_url, _build_bearer_headers(headers_template, auth), data
+
+
+def _build_openrouter_request(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of an OpenRouter API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    return _build_openai_compatible_request(OPENROUTER_API_URL, OPENROUTER_HEADERS, prompt, auth, model)
+
+
+def _build_cerebras_request(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of a Cerebras API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    return _build_openai_compatible_request(CEREBRAS_API_URL, CEREBRAS_HEADERS, prompt, auth, model)
+
+
+def _build_groq_request(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of a Groq API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    return _build_openai_compatible_request(GROQ_API_URL, GROQ_HEADERS, prompt, auth, model)
+
+
+def _build_nvidia_request(
         prompt: Prompt,
         auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of an NVIDIA NIM API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    return _build_openai_compatible_request(NVIDIA_API_URL, NVIDIA_HEADERS, prompt, auth, model)
+
+
+def _build_github_request(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build the URL, headers and data of a GitHub Models API request.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    """
+    return _build_openai_compatible_request(GITHUB_API_URL, GITHUB_HEADERS, prompt, auth, model)
+
+
+PROVIDER_REQUEST_MAP = {
+    Provider.AI_STUDIO: (_build_ai_studio_request, _get_ai_studio_message),
+    Provider.CLOUDFLARE: (_build_cloudflare_request, _get_cloudflare_message),
+    Provider.OPENROUTER: (_build_openrouter_request, _get_openai_message),
+    Provider.CEREBRAS: (_build_cerebras_request, _get_openai_message),
+    Provider.GROQ: (_build_groq_request, _get_openai_message),
+    Provider.NVIDIA: (_build_nvidia_request, _get_openai_message),
+    Provider.GITHUB: (_build_github_request, _get_openai_message),
+}
+
+
+def _build_result(
+        response: Any,
+        get_message: Callable[[Dict[str, Any]], str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        stats: Optional[Dict[str, Any]]) -> Dict[str, Union[bool, str]]:
     """
-    Call GitHub Models API and return the response.
+    Return the result of a provider response, raising on unsuccessful status codes.
+
+    :param response: provider response
+    :param get_message: function returning the message of the response data
+    :param model: model
+    :param stats: timing statistics to record the transferred bytes in
+    """
+    _record_transfer(stats, response)
+    if response.status_code in (200, 201):
+        response_data = _parse_json(response)
+        return {
+            "status": True,
+            "message": get_message(response_data),
+            "model": model}
+    raise _build_provider_error(response)
+
 
+def _call_http(
+        provider: Provider,
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Call a provider API over the shared pooled sessions and return the response.
+
+    :param provider: LLM provider
     :param prompt: user prompt
     :param auth: authentication parameters
-    :param model: model (e.g. "openai/gpt-4o-mini")
+    :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = dict()
-    data["model"] = model
-    data["messages"] = [prompt.render(RenderFormat.OPENAI)]
+    build_request, get_message = PROVIDER_REQUEST_MAP[provider]
+    api_url, headers, data = build_request(prompt, auth, model)
+    session = _get_session(api_url)
+    response = _send(
+        session,
+        api_url,
+        headers=headers,
+        json=data,
+        timeout=timeout)
+    return _build_result(response, get_message, model, stats)
 
-    headers = GITHUB_HEADERS.copy()
-    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
 
-    with requests.Session() as session:
-        response = session.post(
-            GITHUB_API_URL,
-            headers=headers,
-            json=data,
-            timeout=timeout)
+async def _acall_http(
+        client: Any,
+        provider: Provider,
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Call a provider API over a non-blocking HTTP client and return the response.
+
+    :param client: non-blocking HTTP client (httpx.AsyncClient)
+    :param provider: LLM provider
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
+    """
+    build_request, get_message = PROVIDER_REQUEST_MAP[provider]
+    api_url, headers, data = build_request(prompt, auth, model)
+    response = await _asend(
+        client,
+        api_url,
+        headers=headers,
+        json=data,
+        timeout=timeout)
+    return _build_result(response, get_message, model, stats)
+
 
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            return {
-                "status": True,
-                "message": response_data["choices"][0]["message"]["content"],
-                "model": model
-            }
+def _call_github(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Call GitHub Models API and return the response.
 
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text))
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model (e.g. "openai/gpt-4o-mini")
+    :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
+    """
+    return _call_http(Provider.GITHUB, prompt, auth, model, timeout, stats)
 
 
 def _call_ai_studio(
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
     """
     Call AI Studio API and return the response.
 
@@ -69,35 +435,17 @@ def _call_ai_studio(
     :param auth: authentication parameters
     :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = dict()
-    data.update({"contents": prompt.render(RenderFormat.AI_STUDIO)})
-    api_url = AI_STUDIO_API_URL.format(
-        api_key=auth["api_key"],
-        model=model)
-    with requests.Session() as session:
-        response = session.post(
-            api_url,
-            headers=AI_STUDIO_HEADERS,
-            json=data,
-            timeout=timeout)
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            return {
-                "status": True,
-                "message": response_data['candidates'][0]['content']['parts'][0]['text'],
-                "model": model}
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text))
+    return _call_http(Provider.AI_STUDIO, prompt, auth, model, timeout, stats)
 
 
 def _call_cloudflare(
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
     """
     Call Cloudflare API and return the response.
 
@@ -105,37 +453,17 @@ def _call_cloudflare(
     :param auth: authentication parameters
     :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = dict()
-    data["messages"] = [prompt.render(RenderFormat.OPENAI)]
-    api_url = CLOUDFLARE_API_URL.format(
-        account_id=auth["account_id"],
-        model=model)
-    headers = CLOUDFLARE_HEADERS.copy()
-    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
-    with requests.Session() as session:
-        response = session.post(
-            api_url,
-            headers=headers,
-            json=data,
-            timeout=timeout)
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            return {
-                "status": True,
-                "message": response_data["result"]["response"],
-                "model": model}
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text))
+    return _call_http(Provider.CLOUDFLARE, prompt, auth, model, timeout, stats)
 
 
 def _call_openrouter(
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
     """
     Call OpenRouter API and return the response.
 
@@ -143,37 +471,17 @@ def _call_openrouter(
     :param auth: authentication parameters
     :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = {
-        "model": model,
-        "messages": [prompt.render(RenderFormat.OPENAI)]
-    }
-    headers = OPENROUTER_HEADERS.copy()
-    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
-    with requests.Session() as session:
-        response = session.post(
-            OPENROUTER_API_URL,
-            headers=headers,
-            json=data,
-            timeout=timeout)
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            message_text = response_data["choices"][0]["message"]["content"]
-            return {
-                "status": True,
-                "message": message_text,
-                "model": model}
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text))
+    return _call_http(Provider.OPENROUTER, prompt, auth, model, timeout, stats)
 
 
 def _call_cerebras(
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
     """
     Call Cerebras API and return the response.
 
@@ -181,41 +489,17 @@ def _call_cerebras(
     :param auth: authentication parameters
     :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = dict()
-    data["messages"] = [prompt.render(RenderFormat.OPENAI)]
-    headers = CEREBRAS_HEADERS.copy()
-    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
-    with requests.Session() as session:
-        response = session.post(
-            CEREBRAS_API_URL,
-            headers=headers,
-            json={
-                "model": model,
-                "messages": data["messages"]
-            },
-            timeout=timeout,
-        )
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            return {
-                "status": True,
-                "message": response_data["choices"][0]["message"]["content"],
-                "model": model
-            }
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text
-            )
-        )
+    return _call_http(Provider.CEREBRAS, prompt, auth, model, timeout, stats)
 
 
 def _call_groq(
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
     """
     Call Groq API and return the response.
 
@@ -223,35 +507,17 @@ def _call_groq(
     :param auth: authentication parameters
     :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = dict()
-    data["messages"] = [prompt.render(RenderFormat.OPENAI)]
-    data["model"] = model
-    headers = GROQ_HEADERS.copy()
-    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
-    with requests.Session() as session:
-        response = session.post(
-            GROQ_API_URL,
-            headers=headers,
-            json=data,
-            timeout=timeout)
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            return {
-                "status": True,
-                "message": response_data["choices"][0]["message"]["content"],
-                "model": model}
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text))
+    return _call_http(Provider.GROQ, prompt, auth, model, timeout, stats)
 
 
 def _call_nvidia(
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bool, str]]:
     """
     Call NVIDIA NIM API and return the response.
 
@@ -259,33 +525,9 @@ def _call_nvidia(
     :param auth: authentication parameters
     :param model: model
     :param timeout: API timeout
+    :param stats: timing statistics to record the transferred bytes in
     """
-    data = {
-        "messages": [prompt.render(RenderFormat.OPENAI)],
-        "model": model
-    }
-    headers = NVIDIA_HEADERS.copy()
-    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
-    with requests.Session() as session:
-        response = session.post(
-            NVIDIA_API_URL,
-            headers=headers,
-            json=data,
-            timeout=timeout
-        )
-        if response.status_code in (200, 201):
-            response_data = response.json()
-            return {
-                "status": True,
-                "message": response_data["choices"][0]["message"]["content"],
-                "model": model
-            }
-        raise MyTextProviderError(
-            "Status Code: {status_code}\n\nContent:\n{content}".format(
-                status_code=response.status_code,
-                content=response.text
-            )
-        )
+    return _call_http(Provider.NVIDIA, prompt, auth, model, timeout, stats)
 
 
 PROVIDER_MAP = {
@@ -299,15 +541,408 @@ PROVIDER_MAP = {
 }
 
 
+def _record_breaker_outcome(breaker: CircuitBreaker, retry_policy: RetryPolicy, error: Exception) -> None:
+    """
+    Record a failed attempt in the circuit breaker.
+
+    Only transient failures count against the provider; other errors (e.g. invalid credentials) show that the
+    provider itself is reachable.
+
+    :param breaker: circuit breaker
+    :param retry_policy: retry policy
+    :param error: raised error
+    """
+    if retry_policy.is_retryable(error):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _build_timing(provider: Provider) -> Dict[str, Any]:
+    """
+    Build empty timing statistics of a provider call.
+
+    :param provider: LLM provider
+    """
+    return {
+        "provider": provider.value,
+        "total_time": 0.0,
+        "attempts": [],
+        "retries": 0,
+        "backoff_time": 0.0,
+        "bytes_sent": 0,
+        "bytes_received": 0}
+
+
+def _estimate_prompt_tokens(prompt: Prompt, limiter: RateLimiter) -> int:
+    """
+    Estimate the tokens a request consumes: the prompt plus a completion about the size of the user text.
+
+    The prompt size is taken from its template and fields without rendering it, and nothing is estimated when the
+    rate limiter has no token limit.
+
+    :param prompt: user prompt
+    :param limiter: rate limiter
+    """
+    if limiter.tokens_per_minute is None:
+        return 0
+    template = prompt.template
+    template_size = len(template.content) + sum(len(str(value)) for value in template.custom_map.values())
+    return -(-(template_size + 2 * len(prompt.message)) // CHARS_PER_TOKEN)
+
+
+def _record_rate_limit(limiter: RateLimiter, error: Exception, max_delay: float) -> None:
+    """
+    Throttle the rate limiter if the provider rejected a request for exceeding its rate limit.
+
+    :param limiter: rate limiter
+    :param error: raised error
+    :param max_delay: maximum delay between attempts in seconds (caps the Retry-After header value)
+    """
+    if isinstance(error, MyTextProviderError) and error.status_code == 429:
+        retry_after = error.retry_after
+        if retry_after is not None:
+            retry_after = min(retry_after, max_delay)
+        limiter.throttle(retry_after)
+
+
+def _get_auth_key_pool(provider: Provider, auth: Dict[str, Any]) -> Optional[KeyPool]:
+    """
+    Return the shared key pool of the authentication parameters, or None if they hold a single API key.
+
+    :param provider: LLM provider
+    :param auth: authentication parameters
+    """
+    keys = auth.get("api_key")
+    if isinstance(keys, list):
+        return _get_key_pool(provider, keys)
+    return None
+
+
+def _select_auth(auth: Dict[str, Any], key_pool: Optional[KeyPool]) -> Dict[str, str]:
+    """
+    Return the authentication parameters of the next attempt, with a single API key taken from the key pool.
+
+    :param auth: authentication parameters
+    :param key_pool: key pool
+    """
+    if key_pool is None:
+        return auth
+    selected_auth = dict(auth)
+    selected_auth["api_key"] = key_pool.next_key()
+    return selected_auth
+
+
+def _quarantine_key(key_pool: Optional[KeyPool], auth: Dict[str, str], error: Exception) -> bool:
+    """
+    Quarantine the API key of a request rejected with 401 or 429 and return True if another key can be tried.
+
+    :param key_pool: key pool
+    :param auth: authentication parameters of the rejected request
+    :param error: raised error
+    """
+    if key_pool is None or not isinstance(error, MyTextProviderError):
+        return False
+    if error.status_code not in QUARANTINE_STATUS_CODES:
+        return False
+    key_pool.quarantine(auth["api_key"], error.retry_after)
+    return key_pool.has_available()
+
+
+def _record_attempt(stats: Optional[Dict[str, Any]], attempt_start: float) -> None:
+    """
+    Record the duration of a provider attempt in the timing statistics.
+
+    :param stats: timing statistics
+    :param attempt_start: attempt start time (perf_counter)
+    """
+    if stats is not None:
+        stats["attempts"].append(time.perf_counter() - attempt_start)
+
+
+def _record_backoff(stats: Optional[Dict[str, Any]], delay: float) -> None:
+    """
+    Record a backoff sleep before the next attempt in the timing statistics.
+
+    :param stats: timing statistics
+    :param delay: backoff delay in seconds
+    """
+    if stats is not None:
+        stats["retries"] += 1
+        stats["backoff_time"] += delay
+
+
+def _attach_timing(
+        result: Dict[str, Union[bool, str]],
+        stats: Optional[Dict[str, Any]],
+        attempt_start: Optional[float],
+        start_time: float) -> Dict[str, Union[bool, str]]:
+    """
+    Complete the timing statistics of a provider call and add them to its result.
+
+    :param result: result
+    :param stats: timing statistics (None if timing is disabled)
+    :param attempt_start: start time of the successful attempt (perf_counter), or None if the call failed
+    :param start_time: call start time (monotonic)
+    """
+    if stats is None:
+        return result
+    if attempt_start is not None:
+        _record_attempt(stats, attempt_start)
+    stats["total_time"] = time.monotonic() - start_time
+    result["timing"] = stats
+    return result
+
+
+def _reserve_retry(
+        limiter: RateLimiter,
+        tokens: int,
+        next_delay: float,
+        deadline: Optional[float]) -> Optional[float]:
+    """
+    Reserve the rate limit slot of a retry and return the delay before it, or None if it would outlast the deadline.
+
+    The deadline is checked against the delay that is actually slept, the longer of the backoff delay and the rate
+    limiter wait. Nothing is reserved when the retry is abandoned, so it does not hold back later requests.
+
+    :param limiter: rate limiter
+    :param tokens: estimated number of tokens of the request
+    :param next_delay: backoff delay of the retry policy
+    :param deadline: time (monotonic) by which the call must complete
+    """
+    max_delay = None if deadline is None else deadline - time.monotonic()
+    if max_delay is not None and next_delay >= max_delay:
+        return None
+    delay = limiter.reserve(tokens, max_delay)
+    if delay is None:
+        return None
+    return max(next_delay, delay)
+
+
+def _get_attempt_timeout(timeout: float, deadline: Optional[float]) -> Optional[float]:
+    """
+    Return the timeout of the next attempt, shrunk to the remaining budget, or None if the budget is exhausted.
+
+    :param timeout: API timeout
+    :param deadline: time (monotonic) by which the call must complete
+    """
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    return min(timeout, remaining)
+
+
+def _sleep(delay: float, cancel_event: Optional[threading.Event]) -> None:
+    """
+    Sleep for the given delay, waking up early when the call is cancelled.
+
+    :param delay: delay in seconds
+    :param cancel_event: cancellation event
+    """
+    if cancel_event is None:
+        time.sleep(delay)
+    else:
+        cancel_event.wait(delay)
+
+
+class _ProviderCall:
+    """
+    Attempt state of a provider call, shared by the blocking, async and streaming call paths.
+
+    It applies the circuit breaker, rate limiter, key rotation, retry policy, deadline and timing statistics; the
+    caller only sends each attempt and sleeps (blocking or asynchronously) for the returned delays.
+    """
+
+    def __init__(
+            self,
+            provider: Provider,
+            prompt: Prompt,
+            auth: Dict[str, Any],
+            model: str,
+            timeout: float,
+            retry_policy: RetryPolicy,
+            timing: bool = False,
+            deadline: Optional[float] = None,
+            cancel_event: Optional[threading.Event] = None) -> None:
+        """
+        Initialize the provider call.
+
+        :param provider: LLM provider
+        :param prompt: user prompt
+        :param auth: authentication parameters
+        :param model: LLM model
+        :param timeout: API timeout
+        :param retry_policy: retry policy
+        :param timing: flag to collect timing statistics
+        :param deadline: time (monotonic) by which the call must complete
+        :param cancel_event: event that stops the call before its next attempt or backoff once set
+        """
+        self.provider = provider
+        self.model = model
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        self.start_time = time.monotonic()
+        self._retry_deadline = deadline
+        if retry_policy.deadline is not None:
+            policy_deadline = self.start_time + retry_policy.deadline
+            self._retry_deadline = policy_deadline if deadline is None else min(deadline, policy_deadline)
+        self.stats = _build_timing(provider) if timing else None
+        self.error = None
+        self.error_message = ""
+        self.attempt_timeout = None
+        self._auth = auth
+        self._breaker = _get_circuit_breaker(provider)
+        self._key_pool = _get_auth_key_pool(provider, auth)
+        self.auth = _select_auth(auth, self._key_pool)
+        self._limiter = _get_rate_limiter(provider, self.auth.get("api_key"))
+        self._tokens = _estimate_prompt_tokens(prompt, self._limiter)
+        self._reserved = False
+        self._retry_index = 0
+        self._rotations = 0
+        self._attempt_start = None
+
+    def _stop(self, message: str) -> None:
+        """
+        Stop the call with an error message that is not raised by an attempt.
+
+        :param message: error message
+        """
+        self.error = None
+        self.error_message = message
+
+    def _is_cancelled(self) -> bool:
+        """Stop the call and return True if it was cancelled."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self._stop(CALL_CANCELLED_ERROR)
+            return True
+        return False
+
+    def refresh_timeout(self) -> bool:
+        """
+        Shrink the timeout of the next attempt to the remaining budget.
+
+        Return False if the budget is exhausted or the call was cancelled.
+        """
+        if self._is_cancelled():
+            return False
+        self.attempt_timeout = _get_attempt_timeout(self.timeout, self.deadline)
+        if self.attempt_timeout is None:
+            self._stop(TIMEOUT_EXCEEDED_ERROR)
+            return False
+        return True
+
+    def next_attempt(self) -> Optional[float]:
+        """Return the rate limit wait before the next attempt, or None if no further attempt may start."""
+        if not self.refresh_timeout():
+            return None
+        if not self._breaker.allow_request():
+            self._stop(CIRCUIT_OPEN_ERROR.format(provider=self.provider.value))
+            return None
+        if self._reserved:
+            return 0
+        delay = self._limiter.reserve(self._tokens, None if self.deadline is None else self.deadline - time.monotonic())
+        if delay is None:
+            self._stop(TIMEOUT_EXCEEDED_ERROR)
+            return None
+        self._reserved = True
+        return delay
+
+    def attempt_kwargs(self) -> Dict[str, Any]:
+        """Return the authentication parameters, model and timeout of the next attempt."""
+        return {"auth": self.auth, "model": self.model, "timeout": self.attempt_timeout}
+
+    def attempt_span(self) -> Any:
+        """Start timing the next attempt and return its span."""
+        self._attempt_start = time.perf_counter()
+        return _span(SPAN_ATTEMPT, provider=self.provider, model=self.model,
+                     attempt=self._retry_index + self._rotations + 1)
+
+    def succeed(self, result: Optional[Dict[str, Union[bool, str]]] = None) -> Optional[Dict[str, Union[bool, str]]]:
+        """
+        Record a successful attempt and return its result with the timing statistics.
+
+        :param result: result (None for a stream)
+        """
+        self._breaker.record_success()
+        _record_provider_attempt(self.provider, self.model)
+        if result is None:
+            return None
+        return _attach_timing(result, self.stats, self._attempt_start, self.start_time)
+
+    def fail(self, error: Exception, retry: bool = True) -> Optional[float]:
+        """
+        Record a failed attempt and return the backoff delay before the next one, or None to give up.
+
+        The rate limit slot of the next attempt is reserved here, so it is not reserved again before sending it.
+
+        :param error: raised error
+        :param retry: flag to allow another attempt (False once a stream has started)
+        """
+        _record_attempt(self.stats, self._attempt_start)
+        _record_provider_attempt(self.provider, self.model, error)
+        _record_rate_limit(self._limiter, error, self.retry_policy.max_delay)
+        self.error = error
+        self.error_message = str(error)
+        if retry and _quarantine_key(self._key_pool, self.auth, error) and self._rotations < len(self._key_pool) - 1:
+            self._breaker.record_success()
+            self._rotations += 1
+            next_delay = 0
+        else:
+            _record_breaker_outcome(self._breaker, self.retry_policy, error)
+            self._retry_index += 1
+            if not retry:
+                return None
+            next_delay = self.retry_policy.get_delay(self._retry_index, error, time.monotonic() - self.start_time)
+            if next_delay is None:
+                return None
+        if self._is_cancelled():
+            return None
+        self.auth = _select_auth(self._auth, self._key_pool)
+        self._limiter = _get_rate_limiter(self.provider, self.auth.get("api_key"))
+        return _reserve_retry(self._limiter, self._tokens, next_delay, self._retry_deadline)
+
+    def record_backoff(self, delay: float) -> None:
+        """
+        Record a backoff sleep before the next attempt.
+
+        :param delay: backoff delay in seconds
+        """
+        _record_backoff(self.stats, delay)
+        _record_provider_retry(self.provider, self.model)
+
+    def failure(self) -> Dict[str, Union[bool, str]]:
+        """Return the result of the failed call with the timing statistics."""
+        return _attach_timing({
+            "status": False,
+            "message": self.error_message,
+            "model": self.model}, self.stats, None, self.start_time)
+
+    def raise_error(self) -> None:
+        """Raise the error of the failed call as a MyTextProviderError."""
+        if isinstance(self.error, MyTextProviderError):
+            raise self.error
+        if self.error is not None:
+            raise MyTextProviderError(str(self.error)) from self.error
+        raise MyTextProviderError(self.error_message)
+
+
 def _call_provider(
         provider: Provider,
         prompt: Prompt,
         auth: Dict[str, str],
         model: str,
-        timeout: float = 15,
-        max_retries: int = 4,
-        retry_delay: float = 0.5,
-        backoff_factor: float = 1.2) -> Dict[str, Union[bool, str]]:
+        timeout: float = DEFAULT_API_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        retry_policy: Optional[RetryPolicy] = None,
+        timing: bool = False,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None) -> Dict[str, Union[bool, str]]:
     """
     Call a provider and return the response.
 
@@ -319,20 +954,303 @@ def _call_provider(
     :param max_retries: max retries
     :param retry_delay: retry delay
     :param backoff_factor: backoff factor
+    :param retry_policy: retry policy (overrides max_retries, retry_delay and backoff_factor)
+    :param timing: flag to add timing statistics to the result
+    :param deadline: time (monotonic) by which the call must complete; attempt timeouts shrink to the remaining
+        budget and no attempt or backoff starts once it is exhausted
+    :param cancel_event: event that stops the call before its next attempt and cuts its backoff short once set
     """
-    retry_index = 0
-    error_message = ""
-    next_delay = retry_delay
-    selected_model = model
-    while retry_index < max_retries:
+    if retry_policy is None:
+        retry_policy = RetryPolicy(max_retries=max_retries, retry_delay=retry_delay, backoff_factor=backoff_factor)
+    call = _ProviderCall(provider, prompt, auth, model, timeout, retry_policy, timing, deadline, cancel_event)
+    delay = call.next_attempt()
+    while delay is not None:
+        if delay > 0:
+            with _span(SPAN_RATE_LIMIT, delay=delay):
+                _sleep(delay, cancel_event)
+            if not call.refresh_timeout():
+                break
         try:
-            return PROVIDER_MAP[provider](prompt=prompt, auth=auth, model=selected_model, timeout=timeout)
+            with call.attempt_span():
+                result = PROVIDER_MAP[provider](prompt=prompt, stats=call.stats, **call.attempt_kwargs())
+            return call.succeed(result)
         except Exception as e:
-            error_message = str(e)
-            retry_index += 1
-            time.sleep(next_delay)
-            next_delay = next_delay * backoff_factor
-    return {
-        "status": False,
-        "message": error_message,
-        "model": selected_model}
+            delay = call.fail(e)
+            if delay is None:
+                break
+            with _span(SPAN_BACKOFF, delay=delay):
+                _sleep(delay, cancel_event)
+            call.record_backoff(delay)
+        delay = call.next_attempt()
+    return call.failure()
+
+
+def _iter_sse_data(response: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the JSON payloads of a server-sent events response.
+
+    :param response: streamed provider response
+    """
+    for line in response.iter_lines(decode_unicode=True):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            return
+        yield json.loads(payload)
+
+
+def _post_stream(api_url: str, headers: Dict[str, str], data: Dict[str, Any], timeout: float) -> Any:
+    """
+    Send a streaming request and return the response, raising on unsuccessful status codes.
+
+    The HTTP span ends once the response headers arrive; the streamed body is read by the caller.
+
+    :param api_url: API URL
+    :param headers: request headers
+    :param data: request data
+    :param timeout: API timeout
+    """
+    session = _get_session(api_url)
+    response = _send(
+        session,
+        api_url,
+        headers=headers,
+        json=data,
+        timeout=timeout,
+        stream=True)
+    if response.status_code not in (200, 201):
+        try:
+            raise _build_provider_error(response)
+        finally:
+            response.close()
+    return response
+
+
+def _stream_openai_compatible(
+        api_url: str,
+        headers_template: Dict[str, str],
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT) -> Iterator[str]:
+    """
+    Stream an OpenAI-compatible chat completions API response.
+
+    :param api_url: API URL
+    :param headers_template: request headers template
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    :param timeout: API timeout
+    """
+    data = {
+        "model": model,
+        "messages": [_render_prompt(prompt, RenderFormat.OPENAI)],
+        "stream": True
+    }
+    headers = headers_template.copy()
+    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
+    response = _post_stream(api_url, headers, data, timeout)
+    try:
+        for event in _iter_sse_data(response):
+            choices = event.get("choices") or [{}]
+            content = (choices[0].get("delta") or dict()).get("content")
+            if content:
+                yield content
+    finally:
+        response.close()
+
+
+def _stream_ai_studio(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT) -> Iterator[str]:
+    """
+    Stream AI Studio API response.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    :param timeout: API timeout
+    """
+    data = {"contents": _render_prompt(prompt, RenderFormat.AI_STUDIO)}
+    api_url = AI_STUDIO_STREAM_API_URL.format(
+        api_key=auth["api_key"],
+        model=model)
+    response = _post_stream(api_url, AI_STUDIO_HEADERS, data, timeout)
+    try:
+        for event in _iter_sse_data(response):
+            for candidate in event.get("candidates", [])[:1]:
+                for part in candidate.get("content", dict()).get("parts", []):
+                    if part.get("text"):
+                        yield part["text"]
+    finally:
+        response.close()
+
+
+def _stream_cloudflare(
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT) -> Iterator[str]:
+    """
+    Stream Cloudflare API response.
+
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: model
+    :param timeout: API timeout
+    """
+    data = {
+        "messages": [_render_prompt(prompt, RenderFormat.OPENAI)],
+        "stream": True
+    }
+    api_url = CLOUDFLARE_API_URL.format(
+        account_id=auth["account_id"],
+        model=model)
+    headers = CLOUDFLARE_HEADERS.copy()
+    headers["Authorization"] = headers["Authorization"].format(api_key=auth["api_key"])
+    response = _post_stream(api_url, headers, data, timeout)
+    try:
+        for event in _iter_sse_data(response):
+            if event.get("response"):
+                yield event["response"]
+    finally:
+        response.close()
+
+
+STREAM_PROVIDER_MAP = {
+    Provider.AI_STUDIO: _stream_ai_studio,
+    Provider.CLOUDFLARE: _stream_cloudflare,
+    Provider.OPENROUTER: functools.partial(_stream_openai_compatible, OPENROUTER_API_URL, OPENROUTER_HEADERS),
+    Provider.CEREBRAS: functools.partial(_stream_openai_compatible, CEREBRAS_API_URL, CEREBRAS_HEADERS),
+    Provider.GROQ: functools.partial(_stream_openai_compatible, GROQ_API_URL, GROQ_HEADERS),
+    Provider.NVIDIA: functools.partial(_stream_openai_compatible, NVIDIA_API_URL, NVIDIA_HEADERS),
+    Provider.GITHUB: functools.partial(_stream_openai_compatible, GITHUB_API_URL, GITHUB_HEADERS),
+}
+
+
+def _stream_provider(
+        provider: Provider,
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT,
+        retry_policy: Optional[RetryPolicy] = None,
+        deadline: Optional[float] = None) -> Iterator[str]:
+    """
+    Stream a provider response as text chunks.
+
+    Failures before the first chunk are retried according to the retry policy; failures after it are raised.
+
+    :param provider: LLM provider
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: LLM model
+    :param timeout: API timeout
+    :param retry_policy: retry policy
+    :param deadline: time (monotonic) by which the stream must complete; attempt timeouts shrink to the remaining
+        budget, no attempt or backoff starts once it is exhausted and a stream still running then is cut off
+    """
+    if retry_policy is None:
+        retry_policy = RetryPolicy()
+    call = _ProviderCall(provider, prompt, auth, model, timeout, retry_policy, deadline=deadline)
+    delay = call.next_attempt()
+    while delay is not None:
+        if delay > 0:
+            with _span(SPAN_RATE_LIMIT, delay=delay):
+                time.sleep(delay)
+            if not call.refresh_timeout():
+                break
+        started = False
+        timed_out = False
+        try:
+            with call.attempt_span():
+                for chunk in STREAM_PROVIDER_MAP[provider](prompt=prompt, **call.attempt_kwargs()):
+                    started = True
+                    yield chunk
+                    if _get_attempt_timeout(timeout, deadline) is None:
+                        timed_out = True
+                        break
+        except Exception as e:
+            delay = call.fail(e, retry=not started)
+            if delay is None:
+                break
+            with _span(SPAN_BACKOFF, delay=delay):
+                time.sleep(delay)
+            call.record_backoff(delay)
+        else:
+            call.succeed()
+            if timed_out:
+                raise MyTextProviderError(TIMEOUT_EXCEEDED_ERROR)
+            return
+        delay = call.next_attempt()
+    call.raise_error()
+
+
+async def _acall_provider(
+        provider: Provider,
+        prompt: Prompt,
+        auth: Dict[str, str],
+        model: str,
+        timeout: float = DEFAULT_API_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        retry_policy: Optional[RetryPolicy] = None,
+        timing: bool = False,
+        deadline: Optional[float] = None) -> Dict[str, Union[bool, str]]:
+    """
+    Call a provider asynchronously and return the response.
+
+    When httpx is installed (mytext[async]), attempts are sent over the shared session pool's non-blocking client
+    and no thread is held. Otherwise the blocking client is used, and each attempt is offloaded to the shared
+    session pool's bounded thread pool; only the backoff (asyncio.sleep) then avoids holding a thread.
+
+    :param provider: LLM provider
+    :param prompt: user prompt
+    :param auth: authentication parameters
+    :param model: LLM model
+    :param timeout: API timeout
+    :param max_retries: max retries
+    :param retry_delay: retry delay
+    :param backoff_factor: backoff factor
+    :param retry_policy: retry policy (overrides max_retries, retry_delay and backoff_factor)
+    :param timing: flag to add timing statistics to the result
+    :param deadline: time (monotonic) by which the call must complete; attempt timeouts shrink to the remaining
+        budget and no attempt or backoff starts once it is exhausted
+    """
+    if retry_policy is None:
+        retry_policy = RetryPolicy(max_retries=max_retries, retry_delay=retry_delay, backoff_factor=backoff_factor)
+    loop = asyncio.get_running_loop()
+    call = _ProviderCall(provider, prompt, auth, model, timeout, retry_policy, timing, deadline)
+    delay = call.next_attempt()
+    while delay is not None:
+        if delay > 0:
+            with _span(SPAN_RATE_LIMIT, delay=delay):
+                await asyncio.sleep(delay)
+            if not call.refresh_timeout():
+                break
+        try:
+            with call.attempt_span():
+                client = _get_async_client()
+                if client is not None:
+                    result = await _acall_http(client, provider, prompt, stats=call.stats, **call.attempt_kwargs())
+                else:
+                    result = await loop.run_in_executor(
+                        _get_offload_executor(),
+                        functools.partial(PROVIDER_MAP[provider], prompt=prompt, stats=call.stats, **call.attempt_kwargs()))
+            return call.succeed(result)
+        except Exception as e:
+            delay = call.fail(e)
+            if delay is None:
+                break
+            with _span(SPAN_BACKOFF, delay=delay):
+                await asyncio.sleep(delay)
+            call.record_backoff(delay)
+        delay = call.next_attempt()
+    return call.failure()
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""mytext rate limit."""
+
+import time
+import asyncio
+import threading
+from typing import Dict, Tuple, Optional
+from .errors import MyTextValidationError
+from .params import Provider
+from .params import FREE_TIER_RATE_LIMITS
+from .params import INVALID_RATE_LIMIT_ERROR
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, capacity: float) -> None:
+        """
+        Initialize the token bucket.
+
+        :param capacity: bucket capacity (tokens per minute)
+        """
+        self.capacity = capacity
+        self.rate = capacity / 60
+        self.level = capacity
+        self.updated_at = time.monotonic()
+
+    def get_delay(self, amount: float, now: float) -> float:
+        """
+        Refill the bucket and return the seconds to wait until the given tokens are available.
+
+        :param amount: number of tokens
+        :param now: current monotonic time
+        """
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        level = self.level - min(amount, self.capacity)
+        if level >= 0:
+            return 0
+        return -level / self.rate
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take tokens from the bucket and return the seconds to wait until they are available.
+
+        The level may go negative, so concurrent callers queue up behind each other instead of racing.
+
+        :param amount: number of tokens
+        :param now: current monotonic time
+        """
+        delay = self.get_delay(amount, now)
+        self.level -= min(amount, self.capacity)
+        return delay
+
+    def drain(self, now: float) -> None:
+        """
+        Empty the bucket.
+
+        :param now: current monotonic time
+        """
+        self.level = min(self.level, 0)
+        self.updated_at = now
+
+
+class RateLimiter:
+    """Thread-safe client-side rate limiter on requests and tokens per minute."""
+
+    def __init__(
+            self,
+            requests_per_minute: Optional[float] = None,
+            tokens_per_minute: Optional[float] = None) -> None:
+        """
+        Initialize the rate limiter.
+
+        :param requests_per_minute: maximum number of requests per minute (None for unlimited)
+        :param tokens_per_minute: maximum number of estimated tokens per minute (None for unlimited)
+        """
+        for limit in (requests_per_minute, tokens_per_minute):
+            if limit is not None and (not isinstance(limit, (int, float)) or isinstance(limit, bool) or limit <= 0):
+                raise MyTextValidationError(INVALID_RATE_LIMIT_ERROR)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._buckets = []
+        if requests_per_minute is not None:
+            self._request_bucket = _TokenBucket(requests_per_minute)
+            self._buckets.append((self._request_bucket, False))
+        if tokens_per_minute is not None:
+            self._buckets.append((_TokenBucket(tokens_per_minute), True))
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0, max_delay: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve a request slot and return the seconds to wait before sending it.
+
+        When the wait would not be shorter than max_delay, nothing is reserved and None is returned.
+
+        :param tokens: estimated number of tokens of the request
+        :param max_delay: maximum number of seconds the caller can wait (None for no limit)
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self._blocked_until - now, 0)
+            for bucket, is_token_bucket in self._buckets:
+                delay = max(delay, bucket.get_delay(tokens if is_token_bucket else 1, now))
+            if max_delay is not None and delay >= max_delay:
+                return None
+            for bucket, is_token_bucket in self._buckets:
+                bucket.reserve(tokens if is_token_bucket else 1, now)
+            return delay
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until a request slot is available.
+
+        :param tokens: estimated number of tokens of the request
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """
+        Wait asynchronously until a request slot is available.
+
+        :param tokens: estimated number of tokens of the request
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttle(self, delay: Optional[float] = None) -> None:
+        """
+        Hold back all requests after the provider reported a rate limit.
+
+        :param delay: seconds to block requests for (e.g. the Retry-After header value)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if delay:
+                self._blocked_until = max(self._blocked_until, now + delay)
+            if self.requests_per_minute is not None:
+                self._request_bucket.drain(now)
+
+
+_RATE_LIMITS: Dict[Provider, Tuple[Optional[float], Optional[float]]] = dict()
+_RATE_LIMITERS: Dict[Tuple[Provider, Optional[str]], RateLimiter] = dict()
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_rate_limiter(provider: Provider, api_key: Optional[str]) -> RateLimiter:
+    """
+    Return the shared rate limiter of the given provider and API key.
+
+    :param provider: LLM provider
+    :param api_key: API key
+    """
+    key = (provider, api_key)
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            requests_per_minute, tokens_per_minute = _RATE_LIMITS.get(provider, (None, None))
+            limiter = RateLimiter(requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+            _RATE_LIMITERS[key] = limiter
+        return limiter
+
+
+def configure_rate_limiter(
+        provider: Optional[Provider] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None) -> None:
+    """
+    Configure the rate limits of a provider (or of all providers); None limits disable rate limiting.
+
+    :param provider: LLM provider (None for all providers)
+    :param requests_per_minute: maximum number of requests per minute and API key
+    :param tokens_per_minute: maximum number of estimated tokens per minute and API key
+    """
+    RateLimiter(requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+    providers = list(Provider) if provider is None else [provider]
+    with _RATE_LIMITERS_LOCK:
+        for item in providers:
+            _RATE_LIMITS[item] = (requests_per_minute, tokens_per_minute)
+        for key in [key for key in _RATE_LIMITERS if key[0] in providers]:
+            del _RATE_LIMITERS[key]
+
+
+def enable_free_tier_rate_limits(provider: Optional[Provider] = None) -> None:
+    """
+    Limit a provider (or all providers) to the request and token rates of its free tier.
+
+    :param provider: LLM provider (None for all providers)
+    """
+    providers = list(Provider) if provider is None else [provider]
+    for item in providers:
+        requests_per_minute, tokens_per_minute = FREE_TIER_RATE_LIMITS[item]
+        configure_rate_limiter(item, requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+
+
+def reset_rate_limiters() -> None:
+    """Remove the rate limits of all providers (the default) and empty the limiters."""
+    with _RATE_LIMITERS_LOCK:
+        _RATE_LIMITS.clear()
+        _RATE_LIMITERS.clear()
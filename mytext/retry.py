@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""mytext retry."""
+
+import random
+from typing import Optional, Iterable
+import requests
+from .errors import MyTextProviderError, MyTextValidationError
+from .params import DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, DEFAULT_BACKOFF_FACTOR
+from .params import DEFAULT_MAX_RETRY_DELAY, RETRYABLE_STATUS_CODES
+from .params import INVALID_MAX_RETRIES_ERROR, INVALID_RETRY_DELAY_ERROR
+from .params import INVALID_BACKOFF_FACTOR_ERROR, INVALID_DEADLINE_ERROR
+
+
+class RetryPolicy:
+    """Retry policy with status-based classification, full jitter, Retry-After support and a deadline budget."""
+
+    def __init__(
+            self,
+            max_retries: int = DEFAULT_MAX_RETRIES,
+            retry_delay: float = DEFAULT_RETRY_DELAY,
+            backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+            max_delay: float = DEFAULT_MAX_RETRY_DELAY,
+            jitter: bool = True,
+            deadline: Optional[float] = None,
+            retryable_status_codes: Iterable[int] = RETRYABLE_STATUS_CODES) -> None:
+        """
+        Initialize the retry policy.
+
+        :param max_retries: maximum number of attempts
+        :param retry_delay: base retry delay in seconds
+        :param backoff_factor: backoff factor
+        :param max_delay: maximum delay between attempts in seconds
+        :param jitter: full jitter flag
+        :param deadline: total time budget in seconds for all attempts and delays
+        :param retryable_status_codes: HTTP status codes considered transient
+        """
+        if not isinstance(max_retries, int) or isinstance(max_retries, bool) or max_retries < 1:
+            raise MyTextValidationError(INVALID_MAX_RETRIES_ERROR)
+        for delay in (retry_delay, max_delay):
+            if not isinstance(delay, (int, float)) or isinstance(delay, bool) or delay < 0:
+                raise MyTextValidationError(INVALID_RETRY_DELAY_ERROR)
+        if not isinstance(backoff_factor, (int, float)) or isinstance(backoff_factor, bool) or backoff_factor < 1:
+            raise MyTextValidationError(INVALID_BACKOFF_FACTOR_ERROR)
+        if deadline is not None and (not isinstance(deadline, (int, float))
+                                     or isinstance(deadline, bool) or deadline <= 0):
+            raise MyTextValidationError(INVALID_DEADLINE_ERROR)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retryable_status_codes = frozenset(retryable_status_codes)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Check whether the error is a transient failure worth retrying.
+
+        :param error: raised error
+        """
+        if isinstance(error, MyTextProviderError):
+            return error.status_code is None or error.status_code in self.retryable_status_codes
+        return isinstance(error, requests.RequestException)
+
+    def get_delay(self, retry_index: int, error: Exception, elapsed: float = 0) -> Optional[float]:
+        """
+        Return the delay before the next attempt, or None when no further attempt should be made.
+
+        A Retry-After longer than max_delay is capped at max_delay rather than giving up.
+
+        :param retry_index: number of failed attempts so far
+        :param error: error raised by the last attempt
+        :param elapsed: time spent so far in seconds
+        """
+        if retry_index >= self.max_retries or not self.is_retryable(error):
+            return None
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = min(self.max_delay, retry_after)
+        else:
+            delay = min(self.max_delay, self.retry_delay * (self.backoff_factor ** (retry_index - 1)))
+            if self.jitter:
+                delay = random.uniform(0, delay)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""mytext routing."""
+
+import os
+import json
+import random
+import threading
+from typing import Dict, List, Optional, Any
+from .errors import MyTextValidationError
+from .params import Provider, DEFAULT_MODELS
+from .params import DEFAULT_ROUTER_ALPHA, DEFAULT_EXPLORATION_RATE, MIN_SUCCESS_RATE
+from .params import INVALID_ROUTER_ALPHA_ERROR, INVALID_EXPLORATION_RATE_ERROR
+
+
+class ProviderRouter:
+    """Latency-aware provider router based on exponentially weighted moving averages."""
+
+    def __init__(
+            self,
+            alpha: float = DEFAULT_ROUTER_ALPHA,
+            exploration_rate: float = DEFAULT_EXPLORATION_RATE) -> None:
+        """
+        Initialize the router.
+
+        :param alpha: smoothing factor of the moving averages (weight of the newest observation)
+        :param exploration_rate: probability of promoting a random provider to the front
+        """
+        if not isinstance(alpha, (int, float)) or isinstance(alpha, bool) or not 0 < alpha <= 1:
+            raise MyTextValidationError(INVALID_ROUTER_ALPHA_ERROR)
+        if not isinstance(exploration_rate, (int, float)) or isinstance(
+                exploration_rate, bool) or not 0 <= exploration_rate <= 1:
+            raise MyTextValidationError(INVALID_EXPLORATION_RATE_ERROR)
+        self.alpha = alpha
+        self.exploration_rate = exploration_rate
+        self._stats: Dict[str, Dict[str, float]] = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(provider: Provider, model: Optional[str]) -> str:
+        """
+        Return the stats key of a provider and model.
+
+        :param provider: LLM provider
+        :param model: LLM model (None for the provider default model)
+        """
+        return "{provider}|{model}".format(provider=provider.value, model=model or DEFAULT_MODELS[provider])
+
+    def record(self, provider: Provider, model: Optional[str], latency: float, success: bool) -> None:
+        """
+        Record the outcome of a provider call.
+
+        :param provider: LLM provider
+        :param model: LLM model
+        :param latency: call latency in seconds
+        :param success: success flag
+        """
+        key = self._get_key(provider, model)
+        success_value = 1.0 if success else 0.0
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = {"latency": latency, "success_rate": success_value, "count": 1}
+                return
+            stats["latency"] = self.alpha * latency + (1 - self.alpha) * stats["latency"]
+            stats["success_rate"] = self.alpha * success_value + (1 - self.alpha) * stats["success_rate"]
+            stats["count"] += 1
+
+    def get_stats(self, provider: Provider, model: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Return the stats of a provider and model, or None if it has not been observed.
+
+        :param provider: LLM provider
+        :param model: LLM model
+        """
+        with self._lock:
+            stats = self._stats.get(self._get_key(provider, model))
+            if stats is None:
+                return None
+            return dict(stats)
+
+    def _get_score(self, provider: Provider, model: Optional[str]) -> Optional[float]:
+        """
+        Return the expected cost of a provider (lower is better), or None if it has not been observed.
+
+        :param provider: LLM provider
+        :param model: LLM model
+        """
+        stats = self.get_stats(provider, model)
+        if stats is None:
+            return None
+        return stats["latency"] / max(stats["success_rate"], MIN_SUCCESS_RATE)
+
+    def order(
+            self,
+            providers: List[Provider],
+            model_map: Optional[Dict[Provider, str]] = None) -> List[Provider]:
+        """
+        Order providers so the fastest healthy one comes first.
+
+        Observed providers are sorted by latency divided by success rate, followed by unobserved ones in their
+        original order. With probability exploration_rate, a random provider is promoted to the front.
+
+        :param providers: providers
+        :param model_map: LLM model of each provider
+        """
+        model_map = model_map or dict()
+        scored = []
+        unscored = []
+        for index, provider in enumerate(providers):
+            score = self._get_score(provider, model_map.get(provider))
+            if score is None:
+                unscored.append(provider)
+            else:
+                scored.append((score, index, provider))
+        ordered = [provider for _, _, provider in sorted(scored)] + unscored
+        if len(ordered) > 1 and random.random() < self.exploration_rate:
+            explored = ordered.pop(random.randrange(1, len(ordered)))
+            ordered.insert(0, explored)
+        return ordered
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the router state as a dictionary."""
+        with self._lock:
+            return {key: dict(stats) for key, stats in self._stats.items()}
+
+    def save(self, path: str) -> None:
+        """
+        Save the router stats to a JSON file.
+
+        :param path: file path
+        """
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(temp_path, path)
+
+    def load(self, path: str) -> None:
+        """
+        Load the router stats from a JSON file (missing or invalid files are ignored).
+
+        :param path: file path
+        """
+        try:
+            with open(os.path.expanduser(path), "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        stats = dict()
+        for key, value in data.items():
+            try:
+                stats[key] = {
+                    "latency": float(value["latency"]),
+                    "success_rate": float(value["success_rate"]),
+                    "count": int(value["count"])}
+            except (KeyError, TypeError, ValueError):
+                continue
+        with self._lock:
+            self._stats.update(stats)
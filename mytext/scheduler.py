@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""mytext scheduler."""
+
+import math
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple, Optional, Any
+from .errors import MyTextValidationError, MyTextQueueFullError
+from .functions import run_mytext
+from .params import Provider, Priority, PRIORITY_RANKS
+from .params import DEFAULT_SCHEDULER_QUEUE_SIZE, DEFAULT_SCHEDULER_WORKERS
+from .params import INVALID_QUEUE_SIZE_ERROR, INVALID_SCHEDULER_WORKERS_ERROR
+from .params import INVALID_PRIORITY_ERROR, INVALID_DEADLINE_ERROR, INVALID_BLOCK_TIMEOUT_ERROR
+from .params import SCHEDULER_QUEUE_FULL_ERROR, SCHEDULER_SHUTDOWN_ERROR, JOB_DEADLINE_EXCEEDED_ERROR
+
+_Job = Tuple[int, float, int, Future, Dict[str, Any]]
+
+
+def _is_positive_int(value: Any) -> bool:
+    """
+    Check that a value is a positive integer.
+
+    :param value: value
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _is_positive_number(value: Any) -> bool:
+    """
+    Check that a value is a positive number.
+
+    :param value: value
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+class Scheduler:
+    """
+    Bounded priority queue of run_mytext jobs executed by per-provider worker threads.
+
+    Jobs are ordered by priority, then by deadline, then by submission order, so interactive jobs jump ahead of
+    queued batch work. When the queue is full, submission blocks or is rejected with MyTextQueueFullError.
+    """
+
+    def __init__(
+            self,
+            queue_size: int = DEFAULT_SCHEDULER_QUEUE_SIZE,
+            workers: Optional[Dict[Provider, int]] = None,
+            default_workers: int = DEFAULT_SCHEDULER_WORKERS) -> None:
+        """
+        Initialize the scheduler.
+
+        :param queue_size: maximum number of jobs waiting for a worker
+        :param workers: number of worker threads of each provider
+        :param default_workers: number of worker threads of providers missing from `workers`
+        """
+        if not _is_positive_int(queue_size):
+            raise MyTextValidationError(INVALID_QUEUE_SIZE_ERROR)
+        workers = workers or dict()
+        if not isinstance(workers, dict) or not all(
+                isinstance(provider, Provider) and _is_positive_int(count) for provider, count in workers.items()):
+            raise MyTextValidationError(INVALID_SCHEDULER_WORKERS_ERROR)
+        if not _is_positive_int(default_workers):
+            raise MyTextValidationError(INVALID_SCHEDULER_WORKERS_ERROR)
+        self.queue_size = queue_size
+        self.workers = dict(workers)
+        self.default_workers = default_workers
+        self._condition = threading.Condition(threading.RLock())
+        self._queues: Dict[Provider, List[_Job]] = dict()
+        self._threads: Dict[Provider, List[threading.Thread]] = dict()
+        self._counter = itertools.count()
+        self._size = 0
+        self._shutdown = False
+
+    def __len__(self) -> int:
+        """Return the number of jobs waiting for a worker."""
+        with self._condition:
+            return self._size
+
+    def __enter__(self) -> "Scheduler":
+        """Enter the scheduler context."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """
+        Shut down the scheduler, waiting for the queued jobs.
+
+        :param args: exception information
+        """
+        self.shutdown(wait=True)
+
+    def _start_workers(self, provider: Provider) -> None:
+        """
+        Start the worker threads of a provider on its first job.
+
+        :param provider: API provider
+        """
+        if provider in self._threads:
+            return
+        self._queues[provider] = []
+        self._threads[provider] = []
+        for index in range(self.workers.get(provider, self.default_workers)):
+            thread = threading.Thread(
+                target=self._work,
+                args=(provider,),
+                name="mytext-scheduler-{provider}-{index}".format(
+                    provider=getattr(provider, "value", provider), index=index),
+                daemon=True)
+            thread.start()
+            self._threads[provider].append(thread)
+
+    def _release(self, future: Future) -> None:
+        """
+        Release the queue slot of a job cancelled while waiting.
+
+        :param future: job future
+        """
+        if future.cancelled():
+            with self._condition:
+                self._size -= 1
+                self._condition.notify_all()
+
+    def _next_job(self, provider: Provider) -> Optional[_Job]:
+        """
+        Wait for the next runnable job of a provider, or return None once the scheduler is shut down and drained.
+
+        :param provider: API provider
+        """
+        queue = self._queues[provider]
+        with self._condition:
+            while True:
+                while not queue and not self._shutdown:
+                    self._condition.wait()
+                if not queue:
+                    return None
+                job = heapq.heappop(queue)
+                if job[3].set_running_or_notify_cancel():
+                    self._size -= 1
+                    self._condition.notify_all()
+                    return job
+
+    def _work(self, provider: Provider) -> None:
+        """
+        Run the jobs of a provider until the scheduler is shut down.
+
+        :param provider: API provider
+        """
+        while True:
+            job = self._next_job(provider)
+            if job is None:
+                return
+            _, deadline, _, future, kwargs = job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                future.set_result({
+                    "status": False,
+                    "message": JOB_DEADLINE_EXCEEDED_ERROR,
+                    "model": "unknown"})
+                continue
+            if deadline != math.inf:
+                kwargs["timeout"] = min(remaining, kwargs.get("timeout") or remaining)
+            try:
+                future.set_result(run_mytext(**kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+    def submit(
+            self,
+            text: str,
+            auth: dict,
+            priority: Priority = Priority.NORMAL,
+            deadline: Optional[float] = None,
+            block: bool = True,
+            block_timeout: Optional[float] = None,
+            **kwargs: Any) -> Future:
+        """
+        Queue a run_mytext job and return its future.
+
+        Cancelling the future before a worker picks the job up frees its queue slot; a job whose deadline passes
+        while it waits resolves to a failure result without calling the provider, and otherwise runs with the time
+        left until its deadline as the run_mytext timeout.
+
+        :param text: user text
+        :param auth: authentication parameters
+        :param priority: job priority
+        :param deadline: number of seconds from submission within which the job must complete
+        :param block: flag to wait for a free queue slot when the queue is full instead of rejecting the job
+        :param block_timeout: maximum number of seconds to wait for a free queue slot (None for no limit)
+        :param kwargs: other run_mytext parameters (mode, tone, provider, model, retry_policy, cache, timing, timeout)
+        """
+        if not isinstance(priority, Priority):
+            raise MyTextValidationError(INVALID_PRIORITY_ERROR)
+        if deadline is not None and not _is_positive_number(deadline):
+            raise MyTextValidationError(INVALID_DEADLINE_ERROR)
+        if block_timeout is not None and not _is_positive_number(block_timeout):
+            raise MyTextValidationError(INVALID_BLOCK_TIMEOUT_ERROR)
+        provider = kwargs.get("provider", Provider.AI_STUDIO)
+        submit_time = time.monotonic()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError(SCHEDULER_SHUTDOWN_ERROR)
+            if block:
+                if not self._condition.wait_for(
+                        lambda: self._shutdown or self._size < self.queue_size, timeout=block_timeout):
+                    raise MyTextQueueFullError(SCHEDULER_QUEUE_FULL_ERROR)
+                if self._shutdown:
+                    raise RuntimeError(SCHEDULER_SHUTDOWN_ERROR)
+            elif self._size >= self.queue_size:
+                raise MyTextQueueFullError(SCHEDULER_QUEUE_FULL_ERROR)
+            self._start_workers(provider)
+            future = Future()
+            heapq.heappush(self._queues[provider], (
+                PRIORITY_RANKS[priority],
+                math.inf if deadline is None else submit_time + deadline,
+                next(self._counter),
+                future,
+                dict(kwargs, text=text, auth=auth)))
+            self._size += 1
+            self._condition.notify_all()
+        future.add_done_callback(self._release)
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop accepting jobs and stop the workers once the queue is drained.
+
+        :param wait: flag to wait for the workers to finish
+        :param cancel_pending: flag to cancel the jobs that are still waiting instead of running them
+        """
+        with self._condition:
+            self._shutdown = True
+            if cancel_pending:
+                for queue in self._queues.values():
+                    for job in queue:
+                        job[3].cancel()
+            self._condition.notify_all()
+            threads = [thread for provider_threads in self._threads.values() for thread in provider_threads]
+        if wait:
+            for thread in threads:
+                thread.join()
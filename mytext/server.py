@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""mytext server."""
+
+import sys
+import json
+import signal
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Union, Callable, Optional, Any
+from .errors import MyTextValidationError
+from .metrics import get_metrics
+from .params import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, DEFAULT_SERVER_MAX_WORKERS, DEFAULT_SERVER_QUEUE_SIZE
+from .params import SERVER_MAX_BODY_SIZE, SERVER_BUSY_RETRY_AFTER, SERVER_REQUEST_TIMEOUT
+from .params import METRICS_PATH, METRICS_CONTENT_TYPE
+from .params import SERVER_START_MESSAGE, SERVER_STOP_MESSAGE
+from .params import INVALID_MAX_WORKERS_ERROR, INVALID_QUEUE_SIZE_ERROR
+from .params import INVALID_REQUEST_BODY_ERROR, REQUEST_BODY_TOO_LARGE_ERROR
+from .params import INVALID_REQUEST_TEXT_ERROR, INVALID_REQUEST_TEXTS_ERROR
+from .params import SERVER_BUSY_ERROR, SERVER_NOT_FOUND_ERROR, BATCH_TOO_LARGE_ERROR
+
+Processor = Callable[[Dict[str, Any]], Dict[str, Union[bool, str]]]
+
+
+def _build_error_result(message: str) -> Dict[str, Union[bool, str]]:
+    """
+    Build a failure result.
+
+    :param message: error message
+    """
+    return {
+        "status": False,
+        "message": message,
+        "model": "unknown"}
+
+
+class _MyTextRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of the mytext HTTP/JSON API."""
+
+    timeout = SERVER_REQUEST_TIMEOUT
+
+    def log_message(self, *args: Any) -> None:
+        """
+        Disable request logging.
+
+        :param args: log arguments
+        """
+
+    def _send(self, status_code: int, body: str, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Send a response.
+
+        :param status_code: HTTP status code
+        :param body: response body
+        :param content_type: response content type
+        :param headers: additional response headers
+        """
+        data = body.encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or dict()).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status_code: int, data: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Send a JSON response.
+
+        :param status_code: HTTP status code
+        :param data: response data
+        :param headers: additional response headers
+        """
+        self._send(status_code, json.dumps(data, ensure_ascii=False), "application/json; charset=utf-8", headers)
+
+    def _read_json(self) -> Optional[Dict[str, Any]]:
+        """Read the JSON object of the request body, sending an error response and returning None if invalid."""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length > SERVER_MAX_BODY_SIZE:
+            self._send_json(413, _build_error_result(REQUEST_BODY_TOO_LARGE_ERROR.format(size=SERVER_MAX_BODY_SIZE)))
+            return None
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8")) if length > 0 else None
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            self._send_json(400, _build_error_result(INVALID_REQUEST_BODY_ERROR))
+            return None
+        return data
+
+    def _send_busy(self) -> None:
+        """Send the response of a request rejected because the queue is full."""
+        self._send_json(
+            503,
+            _build_error_result(SERVER_BUSY_ERROR),
+            {"Retry-After": str(SERVER_BUSY_RETRY_AFTER)})
+
+    def do_GET(self) -> None:
+        """Serve the health and metrics endpoints."""
+        path = self.path.split("?")[0]
+        if path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "pending": self.server.pending,
+                "max_workers": self.server.max_workers,
+                "queue_size": self.server.queue_size})
+        elif path == METRICS_PATH:
+            registry = get_metrics()
+            self._send(200, registry.render() if registry is not None else "# EOF\n", METRICS_CONTENT_TYPE)
+        else:
+            self._send_json(404, _build_error_result(SERVER_NOT_FOUND_ERROR))
+
+    def do_POST(self) -> None:
+        """Serve the run and batch endpoints."""
+        path = self.path.split("?")[0]
+        if path not in ("/run", "/batch"):
+            self._send_json(404, _build_error_result(SERVER_NOT_FOUND_ERROR))
+            return
+        data = self._read_json()
+        if data is None:
+            return
+        if path == "/run":
+            if not isinstance(data.get("text"), str):
+                self._send_json(400, _build_error_result(INVALID_REQUEST_TEXT_ERROR))
+                return
+            futures = self.server.submit([data])
+            if futures is None:
+                self._send_busy()
+                return
+            try:
+                self._send_json(200, futures[0].result())
+            except MyTextValidationError as e:
+                self._send_json(400, _build_error_result(str(e)))
+            return
+        texts = data.pop("texts", None)
+        if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+            self._send_json(400, _build_error_result(INVALID_REQUEST_TEXTS_ERROR))
+            return
+        if len(texts) > self.server.capacity:
+            self._send_json(
+                413,
+                _build_error_result(BATCH_TOO_LARGE_ERROR.format(count=len(texts), capacity=self.server.capacity)))
+            return
+        futures = self.server.submit([dict(data, text=text) for text in texts])
+        if futures is None:
+            self._send_busy()
+            return
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except MyTextValidationError as e:
+                results.append(_build_error_result(str(e)))
+        self._send_json(200, {"results": results})
+
+
+class MyTextServer(ThreadingHTTPServer):
+    """HTTP/JSON server that runs requests on a bounded worker queue, sharing sessions and caches across requests."""
+
+    daemon_threads = False
+
+    def __init__(
+            self,
+            process: Processor,
+            host: str = DEFAULT_SERVER_HOST,
+            port: int = DEFAULT_SERVER_PORT,
+            max_workers: int = DEFAULT_SERVER_MAX_WORKERS,
+            queue_size: int = DEFAULT_SERVER_QUEUE_SIZE) -> None:
+        """
+        Initialize the server.
+
+        :param process: function processing a request (a dictionary with `text` and options) into a result
+        :param host: host
+        :param port: port (0 for any free port)
+        :param max_workers: number of requests processed concurrently
+        :param queue_size: number of requests waiting for a worker before new ones are rejected with 503
+        """
+        if not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1:
+            raise MyTextValidationError(INVALID_MAX_WORKERS_ERROR)
+        if not isinstance(queue_size, int) or isinstance(queue_size, bool) or queue_size < 1:
+            raise MyTextValidationError(INVALID_QUEUE_SIZE_ERROR)
+        super().__init__((host, port), _MyTextRequestHandler)
+        self.process = process
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Return the server URL."""
+        host, port = self.server_address[:2]
+        return "http://{host}:{port}".format(host=host, port=port)
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of queued and running requests."""
+        return self.max_workers + self.queue_size
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued and running requests."""
+        with self._lock:
+            return self._pending
+
+    def _run_item(self, item: Dict[str, Any]) -> Dict[str, Union[bool, str]]:
+        """
+        Process a request, turning unexpected errors (other than validation errors) into failure results.
+
+        :param item: request
+        """
+        try:
+            return dict(self.process(item))
+        except MyTextValidationError:
+            raise
+        except Exception as e:
+            return _build_error_result(str(e))
+
+    def _release(self, *args: Any) -> None:
+        """
+        Release the queue slot of a finished request.
+
+        :param args: done callback arguments (request future)
+        """
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, items: List[Dict[str, Any]]) -> Optional[List[Future]]:
+        """
+        Queue requests as a whole and return their futures, or None if the queue has no room for all of them.
+
+        :param items: requests
+        """
+        with self._lock:
+            if self._pending + len(items) > self.capacity:
+                return None
+            self._pending += len(items)
+        futures = []
+        for item in items:
+            future = self._executor.submit(self._run_item, item)
+            future.add_done_callback(self._release)
+            futures.append(future)
+        return futures
+
+    def server_close(self) -> None:
+        """Finish the queued requests, wait for their responses and close the server."""
+        self._executor.shutdown(wait=True)
+        super().server_close()
+
+
+def serve(
+        process: Processor,
+        host: str = DEFAULT_SERVER_HOST,
+        port: int = DEFAULT_SERVER_PORT,
+        max_workers: int = DEFAULT_SERVER_MAX_WORKERS,
+        queue_size: int = DEFAULT_SERVER_QUEUE_SIZE) -> None:
+    """
+    Run a server until it is interrupted (Ctrl+C or SIGTERM), then finish the accepted requests and close it.
+
+    :param process: function processing a request (a dictionary with `text` and options) into a result
+    :param host: host
+    :param port: port
+    :param max_workers: number of requests processed concurrently
+    :param queue_size: number of requests waiting for a worker before new ones are rejected with 503
+    """
+    server = MyTextServer(process, host=host, port=port, max_workers=max_workers, queue_size=queue_size)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *args: threading.Thread(target=server.shutdown).start())
+    print(SERVER_START_MESSAGE.format(host=host, port=server.server_address[1]), file=sys.stderr)
+    try:
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    finally:
+        server.server_close()
+        print(SERVER_STOP_MESSAGE, file=sys.stderr)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""mytext sessions."""
+
+import asyncio
+import weakref
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from .errors import MyTextValidationError
+from .params import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, OFFLOAD_THREAD_NAME_PREFIX
+from .params import INVALID_POOL_SIZE_ERROR, INVALID_KEEP_ALIVE_ERROR
+
+
+@functools.lru_cache(maxsize=None)
+def _import_httpx() -> Optional[Any]:
+    """Return the httpx module, or None when the optional async extra is not installed."""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx
+
+
+def _schedule_aclose(loop: asyncio.AbstractEventLoop, client: Any) -> None:
+    """
+    Schedule closing a non-blocking HTTP client on its event loop.
+
+    :param loop: event loop the client belongs to
+    :param client: non-blocking HTTP client
+    """
+    loop.create_task(client.aclose())
+
+
+class SessionPool:
+    """
+    Thread-safe pool of HTTP sessions, one pooled session per provider host, with a bounded offload executor.
+
+    When httpx is installed, coroutine callers get a non-blocking client per event loop instead of the executor.
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            keep_alive: bool = True) -> None:
+        """
+        Initialize the session pool.
+
+        :param pool_connections: number of connection pools to cache per session
+        :param pool_maxsize: maximum number of connections to keep per host
+        :param keep_alive: keep-alive flag
+        """
+        for size in (pool_connections, pool_maxsize):
+            if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+                raise MyTextValidationError(INVALID_POOL_SIZE_ERROR)
+        if not isinstance(keep_alive, bool):
+            raise MyTextValidationError(INVALID_KEEP_ALIVE_ERROR)
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._keep_alive = keep_alive
+        self._sessions: Dict[str, requests.Session] = dict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Create a new pooled session."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self._keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """
+        Return the pooled session for the given URL's host.
+
+        :param url: request URL
+        """
+        parts = urlsplit(url)
+        host = "{scheme}://{netloc}".format(scheme=parts.scheme, netloc=parts.netloc)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def get_offload_executor(self) -> ThreadPoolExecutor:
+        """
+        Return the bounded thread pool that coroutine callers offload their blocking requests to.
+
+        The requests still block one thread each; the pool has one thread per pooled connection
+        (pool_connections * pool_maxsize), so it bounds the number of requests in flight from async callers.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._pool_connections * self._pool_maxsize,
+                    thread_name_prefix=OFFLOAD_THREAD_NAME_PREFIX)
+            return self._executor
+
+    def get_async_client(self) -> Optional[Any]:
+        """
+        Return the non-blocking HTTP client (httpx.AsyncClient) of the running event loop.
+
+        Returns None when httpx is not installed; coroutine callers then fall back to the offload executor.
+        The client keeps up to pool_connections * pool_maxsize idle connections, like the pooled sessions.
+        """
+        httpx = _import_httpx()
+        if httpx is None:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                keepalive = self._pool_connections * self._pool_maxsize if self._keep_alive else 0
+                headers = None if self._keep_alive else {"Connection": "close"}
+                client = httpx.AsyncClient(
+                    headers=headers,
+                    limits=httpx.Limits(max_connections=None, max_keepalive_connections=keepalive))
+                self._async_clients[loop] = client
+            return client
+
+    def close(self) -> None:
+        """Close all pooled sessions and clients and shut down the offload executor once its running requests finish."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+            executor = self._executor
+            self._executor = None
+        for session in sessions:
+            session.close()
+        for loop, client in async_clients:
+            try:
+                loop.call_soon_threadsafe(_schedule_aclose, loop, client)
+            except RuntimeError:
+                pass
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __len__(self) -> int:
+        """Return the number of open sessions."""
+        with self._lock:
+            return len(self._sessions)
+
+    def __enter__(self) -> "SessionPool":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """
+        Exit the context manager.
+
+        :param args: exception information
+        """
+        self.close()
+
+
+_SESSION_POOL = SessionPool()
+_SESSION_POOL_LOCK = threading.Lock()
+
+
+def _get_session(url: str) -> requests.Session:
+    """
+    Return the shared pooled session for the given URL.
+
+    :param url: request URL
+    """
+    return _SESSION_POOL.get(url)
+
+
+def _get_offload_executor() -> ThreadPoolExecutor:
+    """Return the offload executor of the shared session pool."""
+    return _SESSION_POOL.get_offload_executor()
+
+
+def _get_async_client() -> Optional[Any]:
+    """Return the non-blocking HTTP client of the shared session pool for the running event loop, if any."""
+    return _SESSION_POOL.get_async_client()
+
+
+def configure_sessions(
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True) -> None:
+    """
+    Replace the shared session pool with a new configuration.
+
+    :param pool_connections: number of connection pools to cache per session
+    :param pool_maxsize: maximum number of connections to keep per host
+    :param keep_alive: keep-alive flag
+    """
+    global _SESSION_POOL
+    new_pool = SessionPool(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        keep_alive=keep_alive)
+    with _SESSION_POOL_LOCK:
+        old_pool = _SESSION_POOL
+        _SESSION_POOL = new_pool
+    old_pool.close()
+
+
+def close_sessions() -> None:
+    """Close all shared pooled sessions."""
+    _SESSION_POOL.close()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""mytext tracing."""
+
+import contextlib
+from typing import Dict, Tuple, Callable, Optional, Any
+from .errors import MyTextValidationError
+from .params import INVALID_TRACING_HOOKS_ERROR
+
+StartHook = Callable[[str, Dict[str, Any]], Any]
+EndHook = Callable[[Any, Optional[BaseException]], None]
+
+
+class _Span:
+    """Span context manager that reports its start and end to the tracing hooks."""
+
+    __slots__ = ("_hooks", "_name", "_attributes", "_span")
+
+    def __init__(self, hooks: Tuple[StartHook, EndHook], name: str, attributes: Dict[str, Any]) -> None:
+        """
+        Initialize the span.
+
+        :param hooks: start and end hooks
+        :param name: span name
+        :param attributes: span attributes
+        """
+        self._hooks = hooks
+        self._name = name
+        self._attributes = attributes
+        self._span = None
+
+    def __enter__(self) -> "_Span":
+        """Start the span."""
+        attributes = {key: getattr(value, "value", value) for key, value in self._attributes.items()}
+        with contextlib.suppress(Exception):
+            self._span = self._hooks[0](self._name, attributes)
+        return self
+
+    def __exit__(self, *args: Any) -> bool:
+        """
+        End the span, passing the raised error (if any) to the end hook.
+
+        :param args: exception information
+        """
+        with contextlib.suppress(Exception):
+            self._hooks[1](self._span, args[1])
+        return False
+
+
+_NOOP_SPAN = contextlib.nullcontext()
+_TRACING_HOOKS: Optional[Tuple[StartHook, EndHook]] = None
+
+
+def _span(name: str, **attributes: Any) -> Any:
+    """
+    Return a span context manager for a pipeline stage, or a shared no-op one when tracing is disabled.
+
+    :param name: span name
+    :param attributes: span attributes (enum members are reported by value)
+    """
+    hooks = _TRACING_HOOKS
+    if hooks is None:
+        return _NOOP_SPAN
+    return _Span(hooks, name, attributes)
+
+
+def configure_tracing(on_start: StartHook, on_end: EndHook) -> None:
+    """
+    Trace the request pipeline with the given hooks.
+
+    on_start(name, attributes) is called when a stage starts and its return value is passed to
+    on_end(span, error) when the stage ends. Errors raised by the hooks are ignored.
+
+    :param on_start: span start hook
+    :param on_end: span end hook
+    """
+    global _TRACING_HOOKS
+    if not callable(on_start) or not callable(on_end):
+        raise MyTextValidationError(INVALID_TRACING_HOOKS_ERROR)
+    _TRACING_HOOKS = (on_start, on_end)
+
+
+def reset_tracing() -> None:
+    """Disable tracing."""
+    global _TRACING_HOOKS
+    _TRACING_HOOKS = None
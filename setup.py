@@ -39,6 +39,9 @@ setup(
         'requests>=2.20.0',
         'art>=5.3'
     ],
+    extras_require={
+        'async': ['httpx>=0.23.0']
+    },
     python_requires='>=3.7',
     classifiers=[
         'Development Status :: 4 - Beta',
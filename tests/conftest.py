@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""mytext test fixtures."""
+
+from unittest.mock import patch
+import pytest
+from mytext import reset_circuit_breakers, reset_rate_limiters, reset_key_pools, disable_metrics, reset_tracing
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    """Reset the process-wide circuit breakers, rate limiters, key pools, metrics and tracing around each test."""
+    reset_circuit_breakers()
+    reset_rate_limiters()
+    reset_key_pools()
+    disable_metrics()
+    reset_tracing()
+    yield
+    reset_circuit_breakers()
+    reset_rate_limiters()
+    reset_key_pools()
+    disable_metrics()
+    reset_tracing()
+
+
+@pytest.fixture(autouse=True)
+def blocking_async_transport():
+    """Send async calls through the blocking client, so tests can mock requests whether or not httpx is installed."""
+    with patch("mytext.sessions._import_httpx", return_value=None):
+        yield
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+from unittest.mock import patch
+import pytest
+from mytext import Provider, run_mytext
+from mytext import providers, sessions, configure_rate_limiter
+from mytext.ratelimit import _get_rate_limiter
+from mytext.bench import run_benchmark, main, MockProviderServer, _redirect_providers, _percentile
+from mytext.params import GROQ_API_URL, BENCH_PATHS
+
+TEST_CASE_NAME = "Benchmark tests"
+
+
+def test_percentile():
+    values = [5, 1, 4, 2, 3]
+    assert _percentile(values, 50) == 3
+    assert _percentile(values, 99) == 5
+    assert _percentile(values, 0) == 1
+    assert _percentile([], 50) is None
+
+
+def test_run_benchmark_all_paths():
+    report = run_benchmark(requests=8, concurrency=4, latency=0)
+    assert list(report) == list(BENCH_PATHS)
+    for path, stats in report.items():
+        assert stats["requests"] == 8
+        assert stats["errors"] == 0
+        assert stats["throughput"] > 0
+        assert stats["cpu_per_request"] >= 0
+        if path == "batch":
+            assert stats["p50"] is None
+        else:
+            assert 0 < stats["p50"] <= stats["p95"] <= stats["p99"]
+
+
+def test_run_benchmark_restores_configuration():
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=6)
+    limiter = _get_rate_limiter(Provider.GROQ, "KEY")
+    pool = sessions._SESSION_POOL
+    run_benchmark(requests=2, concurrency=2, latency=0, paths=["threaded"])
+    assert sessions._SESSION_POOL is pool
+    assert _get_rate_limiter(Provider.GROQ, "KEY") is limiter
+    assert limiter.requests_per_minute == 6
+
+
+def test_run_benchmark_error_rate():
+    report = run_benchmark(requests=4, concurrency=2, latency=0, error_rate=1, paths=["threaded"])
+    assert report["threaded"]["errors"] == 4
+
+
+def test_redirect_providers_restores_urls():
+    with _redirect_providers("http://127.0.0.1:1"):
+        assert providers.GROQ_API_URL == "http://127.0.0.1:1/openai/v1/chat/completions"
+        assert providers.CLOUDFLARE_API_URL.startswith("http://127.0.0.1:1/client/v4/accounts/{account_id}/")
+    assert providers.GROQ_API_URL == GROQ_API_URL
+
+
+@pytest.mark.parametrize("provider", list(Provider))
+def test_mock_provider_formats(provider):
+    auth = {"api_key": "BENCH_KEY", "account_id": "BENCH_ACCOUNT"}
+    with MockProviderServer(latency=0) as server, _redirect_providers(server.url):
+        result = run_mytext("Mock provider text.", auth=auth, provider=provider)
+    assert result["status"]
+    assert result["message"] == "Benchmark output."
+
+
+def test_main_table_output(capsys):
+    argv = ["bench", "--requests", "3", "--concurrency", "2", "--latency", "0", "--paths", "sequential", "batch"]
+    with patch.object(sys, "argv", argv):
+        main()
+    output = capsys.readouterr().out.splitlines()
+    assert output[0].split()[:3] == ["Path", "Requests", "Errors"]
+    assert output[1].split()[:3] == ["sequential", "3", "0"]
+    assert output[2].split()[:3] == ["batch", "3", "0"]
+
+
+def test_main_json_output(capsys):
+    argv = ["bench", "--requests", "2", "--latency", "0", "--paths", "async", "--json"]
+    with patch.object(sys, "argv", argv):
+        main()
+    report = json.loads(capsys.readouterr().out)
+    assert report["async"]["requests"] == 2
+    assert report["async"]["errors"] == 0
+
+
+@pytest.mark.parametrize("option, value, message", [
+    ("--requests", "0", "--requests must be a positive integer."),
+    ("--concurrency", "0", "--concurrency must be a positive integer."),
+    ("--latency", "-1", "--latency must be a non-negative number."),
+    ("--error-rate", "1.5", "--error-rate must be a number between 0 and 1."),
+    ("--max-retries", "0", "--max-retries must be a positive integer."),
+])
+def test_main_invalid_option(option, value, message, capsys):
+    with patch.object(sys, "argv", ["bench", option, value]):
+        with pytest.raises(SystemExit):
+            main()
+    assert message in capsys.readouterr().err
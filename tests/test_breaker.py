@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch, MagicMock
+import time
+import pytest
+from mytext import Provider, CircuitState
+from mytext import run_mytext, run_mytext_auto
+from mytext import CircuitBreaker, configure_circuit_breaker
+from mytext import RetryPolicy
+from mytext import MyTextValidationError
+from mytext.breaker import _get_circuit_breaker
+from mytext.cli import main
+
+TEST_CASE_NAME = "Circuit breaker tests"
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(failure_threshold=2, cool_down=0.05)
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert not breaker.is_available()
+    time.sleep(0.1)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.is_available()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert not breaker.is_available()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    time.sleep(0.1)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_circuit_breaker_abandoned_trial():
+    breaker = CircuitBreaker(failure_threshold=1, cool_down=0.05)
+    breaker.record_failure()
+    time.sleep(0.1)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    time.sleep(0.1)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    time.sleep(0.1)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_circuit_breaker_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    breaker.reset()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_circuit_breaker_invalid():
+    with pytest.raises(MyTextValidationError, match="`failure_threshold` must be a positive integer."):
+        CircuitBreaker(failure_threshold=0)
+    with pytest.raises(MyTextValidationError, match="`cool_down` must be a non-negative number."):
+        CircuitBreaker(cool_down=-1)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_open_circuit_skips_provider(mock_post, mock_sleep):
+    mock_response = MagicMock()
+    mock_response.status_code = 503
+    mock_response.text = "Unavailable"
+    mock_post.return_value = mock_response
+    configure_circuit_breaker(Provider.GROQ, failure_threshold=3)
+    try:
+        result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ,
+                            retry_policy=RetryPolicy(max_retries=10))
+        assert not result["status"]
+        assert mock_post.call_count == 3
+        assert result["message"] == "Circuit breaker of groq provider is open."
+        result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+        assert result["message"] == "Circuit breaker of groq provider is open."
+        assert mock_post.call_count == 3
+    finally:
+        configure_circuit_breaker(Provider.GROQ)
+
+
+@patch("requests.Session.post")
+def test_non_transient_errors_keep_circuit_closed(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 401
+    mock_response.text = "Unauthorized"
+    mock_post.return_value = mock_response
+    for _ in range(10):
+        run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert _get_circuit_breaker(Provider.GROQ).state == CircuitState.CLOSED
+
+
+@patch("mytext.functions.run_mytext")
+def test_run_mytext_auto_skips_open_circuit(mock_run):
+    mock_run.return_value = {"status": True, "message": "OK!", "model": "m"}
+    breaker = _get_circuit_breaker(Provider.AI_STUDIO)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    auth_map = {Provider.AI_STUDIO: {"api_key": "KEY"}, Provider.GROQ: {"api_key": "KEY"}}
+    result = run_mytext_auto(text="hello", auth_map=auth_map)
+    assert result["provider"] == "groq"
+    assert mock_run.call_count == 1
+
+
+@patch("mytext.functions.run_mytext")
+def test_run_mytext_auto_all_circuits_open(mock_run):
+    for provider in (Provider.AI_STUDIO, Provider.GROQ):
+        breaker = _get_circuit_breaker(provider)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+    auth_map = {Provider.AI_STUDIO: {"api_key": "KEY"}, Provider.GROQ: {"api_key": "KEY"}}
+    result = run_mytext_auto(text="hello", auth_map=auth_map)
+    assert not result["status"]
+    assert "No valid provider credentials" not in result["message"]
+    assert "Circuit breaker of ai-studio provider is open." in result["message"]
+    assert "Circuit breaker of groq provider is open." in result["message"]
+    mock_run.assert_not_called()
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_skips_open_circuit(mock_run, mock_env, capsys):
+    mock_env.return_value = {Provider.AI_STUDIO: {"api_key": "x"}, Provider.GROQ: {"api_key": "y"}}
+    mock_run.return_value = {"status": True, "message": "DONE", "model": "m"}
+    breaker = _get_circuit_breaker(Provider.AI_STUDIO)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    with patch("sys.argv", ["mytext", "--text", "hello"]):
+        main()
+    _, kwargs = mock_run.call_args
+    assert kwargs["provider"] == Provider.GROQ
+    assert mock_run.call_count == 1
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch, MagicMock
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+import pytest
+from mytext import Mode, Tone, Provider
+from mytext import run_mytext, arun_mytext
+from mytext import BaseCache, MemoryCache, SQLiteCache
+from mytext import MyTextValidationError
+from mytext.cache import _build_cache_key
+
+TEST_CASE_NAME = "Cache tests"
+
+
+def _success_response(content="OK!"):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return mock_response
+
+
+def test_incomplete_cache_backend():
+    class IncompleteCache(BaseCache):
+        def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()
+
+
+def test_build_cache_key():
+    key1 = _build_cache_key(Provider.GROQ, "model", "instruction", "text")
+    key2 = _build_cache_key(Provider.GROQ, "model", "instruction", "text")
+    key3 = _build_cache_key(Provider.CEREBRAS, "model", "instruction", "text")
+    key4 = _build_cache_key(Provider.GROQ, "model", "instruction", "other text")
+    assert key1 == key2
+    assert key1 != key3
+    assert key1 != key4
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_size=2)
+    cache.set("a", {"status": True, "message": "A", "model": "m"})
+    cache.set("b", {"status": True, "message": "B", "model": "m"})
+    assert cache.get("a")["message"] == "A"
+    cache.set("c", {"status": True, "message": "C", "model": "m"})
+    assert cache.get("b") is None
+    assert cache.get("a")["message"] == "A"
+    assert cache.get("c")["message"] == "C"
+    assert len(cache) == 2
+    assert cache.hits == 3
+    assert cache.misses == 1
+    assert cache.hit_ratio == 0.75
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_memory_cache_ttl():
+    cache = MemoryCache(ttl=0.05)
+    cache.set("a", {"status": True, "message": "A", "model": "m"})
+    assert cache.get("a") is not None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_invalid():
+    with pytest.raises(MyTextValidationError, match="`max_size` must be a positive integer."):
+        MemoryCache(max_size=0)
+    with pytest.raises(MyTextValidationError, match="`ttl` must be a positive number or None."):
+        MemoryCache(ttl=-1)
+    assert MemoryCache().hit_ratio == 0
+
+
+@patch("requests.Session.post")
+def test_run_mytext_cache_hit(mock_post):
+    mock_post.return_value = _success_response()
+    cache = MemoryCache()
+    auth = {"api_key": "KEY"}
+    result1 = run_mytext(text="hello", auth=auth, provider=Provider.GROQ, cache=cache)
+    result2 = run_mytext(text="hello", auth=auth, provider=Provider.GROQ, cache=cache)
+    result3 = run_mytext(text="hello", auth=auth, provider=Provider.GROQ, tone=Tone.FORMAL, cache=cache)
+    assert result1["status"] and result2["status"] and result3["status"]
+    assert not result1["cached"]
+    assert result2["cached"]
+    assert not result3["cached"]
+    assert result2["message"] == result1["message"]
+    assert mock_post.call_count == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+@patch("requests.Session.post")
+def test_run_mytext_cache_skips_failures(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 401
+    mock_response.text = "Unauthorized"
+    mock_post.return_value = mock_response
+    cache = MemoryCache()
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, cache=cache)
+    assert not result["status"]
+    assert not result["cached"]
+    assert len(cache) == 0
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_cache_hit(mock_post):
+    mock_post.return_value = _success_response()
+    cache = MemoryCache()
+    auth = {"api_key": "KEY"}
+    run_mytext(text="hello", auth=auth, provider=Provider.GROQ, mode=Mode.GRAMMAR, cache=cache)
+    result = asyncio.run(arun_mytext(text="hello", auth=auth, provider=Provider.GROQ, mode=Mode.GRAMMAR, cache=cache))
+    assert result["cached"]
+    assert mock_post.call_count == 1
+
+
+def test_run_mytext_invalid_cache():
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, cache={})
+    assert not result["status"]
+    assert result["message"] == "`cache` must be an instance of BaseCache or None."
+
+
+def test_sqlite_cache_persistence(tmp_path):
+    path = str(tmp_path / "cache" / "cache.sqlite3")
+    cache = SQLiteCache(path)
+    cache.set("a", {"status": True, "message": "A", "model": "m"})
+    cache.close()
+    cache = SQLiteCache(path)
+    assert cache.get("a") == {"status": True, "message": "A", "model": "m"}
+    assert cache.get("b") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+    with open(path + "-wal", "rb"):
+        pass
+    cache.clear()
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_sqlite_cache_user_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    cache = SQLiteCache("~/cachedir/c.db")
+    assert cache.path == str(tmp_path / "cachedir" / "c.db")
+    cache.set("a", {"status": True, "message": "A", "model": "m"})
+    assert cache.get("a")["message"] == "A"
+    cache.close()
+    assert (tmp_path / "cachedir" / "c.db").exists()
+    assert not (tmp_path / "~").exists()
+
+
+def test_sqlite_cache_eviction(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_size=2)
+    cache.set("a", {"status": True, "message": "A", "model": "m"})
+    time.sleep(0.01)
+    cache.set("b", {"status": True, "message": "B", "model": "m"})
+    time.sleep(0.01)
+    assert cache.get("a") is not None
+    time.sleep(0.01)
+    cache.set("c", {"status": True, "message": "C", "model": "m"})
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    cache.close()
+
+
+def test_sqlite_cache_shared_sweep(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache1 = SQLiteCache(path, max_size=3)
+    cache2 = SQLiteCache(path, max_size=3)
+    with patch("mytext.cache.CACHE_SWEEP_INTERVAL", 4):
+        for key in ["a", "b", "a"]:
+            cache1.set(key, {"status": True, "message": key, "model": "m"})
+        assert len(cache1) == 2
+        for key in ["c", "d", "e"]:
+            cache2.set(key, {"status": True, "message": key, "model": "m"})
+        assert len(cache1) == 5
+        cache2.set("f", {"status": True, "message": "f", "model": "m"})
+        assert len(cache1) == 3
+        assert cache1.get("f")["message"] == "f"
+    cache1.close()
+    cache2.close()
+
+
+def test_sqlite_cache_ttl(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=0.05)
+    cache.set("a", {"status": True, "message": "A", "model": "m"})
+    assert cache.get("a") is not None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_sqlite_cache_threads(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+
+    def worker(index):
+        key = "key{index}".format(index=index)
+        cache.set(key, {"status": True, "message": key, "model": "m"})
+        return cache.get(key)["message"] == key
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert all(executor.map(worker, range(20)))
+    assert len(cache) == 20
+    cache.close()
+
+
+def test_sqlite_cache_short_lived_threads(tmp_path):
+    with patch("mytext.cache.sqlite3.connect", wraps=sqlite3.connect) as mock_connect:
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+
+        def worker(index):
+            key = "key{index}".format(index=index)
+            cache.set(key, {"status": True, "message": key, "model": "m"})
+            assert cache.get(key)["message"] == key
+
+        for index in range(50):
+            thread = threading.Thread(target=worker, args=(index,))
+            thread.start()
+            thread.join()
+        assert len(cache) == 50
+        assert mock_connect.call_count == 1
+        cache.close()
+        assert len(cache) == 50
+        assert mock_connect.call_count == 2
+        cache.close()
+
+
+@patch("requests.Session.post")
+def test_run_mytext_sqlite_cache_hit(mock_post, tmp_path):
+    mock_post.return_value = _success_response()
+    path = str(tmp_path / "cache.sqlite3")
+    auth = {"api_key": "KEY"}
+    result1 = run_mytext(text="hello", auth=auth, provider=Provider.GROQ, cache=SQLiteCache(path))
+    result2 = run_mytext(text="hello", auth=auth, provider=Provider.GROQ, cache=SQLiteCache(path))
+    assert not result1["cached"]
+    assert result2["cached"]
+    assert result2["message"] == "OK!"
+    assert mock_post.call_count == 1
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import io
+import os
+import json
 from unittest.mock import patch
 import pytest
-from mytext import Provider
+from mytext import Provider, Strategy
+from mytext import SQLiteCache
 from mytext.cli import main
 from mytext.params import MY_TEXT_VERSION, MY_TEXT_OVERVIEW, MY_TEXT_REPO
 
@@ -33,7 +37,7 @@ def test_main_no_text(capsys):
 
 
 @patch("mytext.cli._load_auth_from_env")
-@patch("mytext.cli.run_mytext")
+@patch("mytext.functions.run_mytext")
 def test_main_single_run_success1(mock_run, mock_env, capsys):
     mock_env.return_value = {
         Provider.AI_STUDIO: {"api_key": "x"},
@@ -49,7 +53,7 @@ def test_main_single_run_success1(mock_run, mock_env, capsys):
 
 
 @patch("mytext.cli._load_auth_from_env")
-@patch("mytext.cli.run_mytext")
+@patch("mytext.functions.run_mytext")
 def test_main_single_run_success2(mock_run, mock_env, capsys):
     mock_env.return_value = {
         Provider.AI_STUDIO: {"api_key": "x"},
@@ -65,7 +69,7 @@ def test_main_single_run_success2(mock_run, mock_env, capsys):
 
 
 @patch("mytext.cli._load_auth_from_env")
-@patch("mytext.cli.run_mytext")
+@patch("mytext.functions.run_mytext")
 def test_main_loop_success(mock_run, mock_env, capsys):
     mock_env.return_value = {
         Provider.AI_STUDIO: {"api_key": "x"},
@@ -90,7 +94,7 @@ def test_main_loop_success(mock_run, mock_env, capsys):
 
 
 @patch("mytext.cli._load_auth_from_env")
-@patch("mytext.cli.run_mytext")
+@patch("mytext.functions.run_mytext")
 def test_main_all_providers_failure(mock_run, mock_env, capsys):
     mock_env.return_value = {
         Provider.AI_STUDIO: {"api_key": "a"},
@@ -111,7 +115,7 @@ def test_main_all_providers_failure(mock_run, mock_env, capsys):
 
 
 @patch("mytext.cli._load_auth_from_env")
-@patch("mytext.cli.run_mytext")
+@patch("mytext.functions.run_mytext")
 def test_main_specific_provider_failure(mock_run, mock_env, capsys):
     mock_env.return_value = {
         Provider.AI_STUDIO: {"api_key": "a"},
@@ -132,7 +136,7 @@ def test_main_specific_provider_failure(mock_run, mock_env, capsys):
 
 
 @patch("mytext.cli._load_auth_from_env")
-@patch("mytext.cli.run_mytext")
+@patch("mytext.functions.run_mytext")
 def test_cli_custom_model(mock_run, mock_env, capsys):
 
     mock_env.return_value = {
@@ -162,3 +166,193 @@ def test_cli_custom_model(mock_run, mock_env, capsys):
     _, kwargs = mock_run.call_args
 
     assert kwargs["model"] == "llama-custom"
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_cache_dir(mock_run, mock_env, tmp_path):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run.return_value = {"status": True, "message": "DONE", "model": "m"}
+    cache_dir = str(tmp_path / "cache")
+    with patch("sys.argv", ["mytext", "--text", "hello", "--cache-dir", cache_dir]):
+        main()
+    _, kwargs = mock_run.call_args
+    assert isinstance(kwargs["cache"], SQLiteCache)
+    assert kwargs["cache"].path == os.path.join(cache_dir, "cache.sqlite3")
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_cache_dir_user_path(mock_run, mock_env, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run.return_value = {"status": True, "message": "DONE", "model": "m"}
+    with patch.dict(os.environ, {"MYTEXT_CACHE_DIR": "~/cache"}):
+        with patch("sys.argv", ["mytext", "--text", "hello"]):
+            main()
+    _, kwargs = mock_run.call_args
+    assert kwargs["cache"].path == os.path.join(str(tmp_path), "cache", "cache.sqlite3")
+    kwargs["cache"].close()
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_cache_env_and_no_cache(mock_run, mock_env, tmp_path):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run.return_value = {"status": True, "message": "DONE", "model": "m"}
+    with patch.dict(os.environ, {"MYTEXT_CACHE_DIR": str(tmp_path)}):
+        with patch("sys.argv", ["mytext", "--text", "hello"]):
+            main()
+        _, kwargs = mock_run.call_args
+        assert isinstance(kwargs["cache"], SQLiteCache)
+        with patch("sys.argv", ["mytext", "--text", "hello", "--no-cache"]):
+            main()
+        _, kwargs = mock_run.call_args
+        assert kwargs["cache"] is None
+    with patch("sys.argv", ["mytext", "--text", "hello"]):
+        main()
+    _, kwargs = mock_run.call_args
+    assert kwargs["cache"] is None
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.cli.run_mytext_auto")
+def test_cli_hedge_strategy(mock_run_auto, mock_env, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}, Provider.NVIDIA: {"api_key": "y"}}
+    mock_run_auto.return_value = {"status": True, "message": "HEDGED", "model": "m", "provider": "groq"}
+    with patch("sys.argv", ["mytext", "--text", "hello", "--strategy", "hedge", "--hedge-delay", "0.5"]):
+        main()
+    out, _ = capsys.readouterr()
+    assert "HEDGED" in out
+    _, kwargs = mock_run_auto.call_args
+    assert kwargs["strategy"] == Strategy.HEDGE
+    assert kwargs["hedge_delay"] == 0.5
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.cli.run_mytext_auto")
+def test_cli_race_strategy_failure(mock_run_auto, mock_env, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run_auto.return_value = {"status": False, "message": "ERR", "model": "unknown"}
+    with patch("sys.argv", ["mytext", "--text", "hello", "--strategy", "race"]):
+        main()
+    out, _ = capsys.readouterr()
+    assert "No provider succeeded" in out
+    _, kwargs = mock_run_auto.call_args
+    assert kwargs["strategy"] == Strategy.RACE
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_input_output_file(mock_run, mock_env, tmp_path, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run.side_effect = lambda **kwargs: {"status": True, "message": kwargs["text"].upper(), "model": "m"}
+    input_path = tmp_path / "input.txt"
+    output_path = tmp_path / "output.jsonl"
+    records = ["plain line", "", json.dumps({"id": "a", "text": "json record"}), json.dumps({"text": "no id"})]
+    input_path.write_text("\n".join(records + ["line {index}".format(index=index) for index in range(20)]))
+    with patch("sys.argv", ["mytext", "--input", str(input_path), "--output", str(output_path), "--max-workers", "3"]):
+        main()
+    _, err = capsys.readouterr()
+    assert "Processed 23 records (0 failed, 0 skipped)." in err
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [line["id"] for line in lines[:3]] == [1, "a", 4]
+    assert lines[0]["message"] == "PLAIN LINE"
+    assert lines[1]["message"] == "JSON RECORD"
+    assert lines[-1] == {"id": 24, "status": True, "message": "LINE 19", "model": "m"}
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_input_resume(mock_run, mock_env, tmp_path, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run.return_value = {"status": True, "message": "DONE", "model": "m"}
+    input_path = tmp_path / "input.txt"
+    output_path = tmp_path / "output.jsonl"
+    input_path.write_text("first\nsecond\nthird\n")
+    output_path.write_text(
+        json.dumps({"id": 1, "status": True, "message": "OLD", "model": "m"}) + "\n" +
+        json.dumps({"id": 2, "status": False, "message": "ERR", "model": "m"}) + "\n" +
+        '{"id": 3, "sta')
+    with patch("sys.argv", ["mytext", "--input", str(input_path), "--output", str(output_path)]):
+        main()
+    _, err = capsys.readouterr()
+    assert "Processed 2 records (0 failed, 1 skipped)." in err
+    assert mock_run.call_count == 2
+    lines = output_path.read_text().splitlines()
+    assert json.loads(lines[-2])["id"] == 2
+    assert json.loads(lines[-1])["id"] == 3
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_input_stdin(mock_run, mock_env, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run.return_value = {"status": False, "message": "ERR", "model": "m"}
+    with patch("sys.stdin", io.StringIO("hello\n")):
+        with patch("sys.argv", ["mytext", "--input", "-"]):
+            main()
+    out, err = capsys.readouterr()
+    assert json.loads(out)["status"] is False
+    assert "Processed 1 records (1 failed, 0 skipped)." in err
+
+
+def test_cli_input_file_not_found(tmp_path, capsys):
+    input_path = str(tmp_path / "missing.jsonl")
+    with patch("sys.argv", ["mytext", "--input", input_path]):
+        with pytest.raises(SystemExit):
+            main()
+    _, err = capsys.readouterr()
+    assert "--input file not found: {path}".format(path=input_path) in err
+
+
+def test_cli_invalid_max_workers(capsys):
+    with patch("sys.argv", ["mytext", "--input", "-", "--max-workers", "0"]):
+        with pytest.raises(SystemExit):
+            main()
+    _, err = capsys.readouterr()
+    assert "--max-workers must be a positive integer." in err
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_timeout(mock_run, mock_env, capsys):
+    mock_env.return_value = {Provider.AI_STUDIO: {"api_key": "x"}, Provider.GROQ: {"api_key": "y"}}
+    mock_run.return_value = {"status": False, "message": "ERR", "model": "m"}
+    with patch("sys.argv", ["mytext", "--text", "hello", "--timeout", "30"]):
+        main()
+    out, _ = capsys.readouterr()
+    assert "No provider succeeded" in out
+    timeouts = [call.kwargs["timeout"] for call in mock_run.call_args_list]
+    assert len(timeouts) == 2
+    assert 30 >= timeouts[0] >= timeouts[1] > 29
+    mock_run.reset_mock()
+    with patch("sys.argv", ["mytext", "--text", "hello"]):
+        main()
+    assert mock_run.call_args.kwargs["timeout"] is None
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.cli.run_mytext_auto")
+def test_cli_timeout_auto(mock_run_auto, mock_env, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}}
+    mock_run_auto.return_value = {"status": True, "message": "HEDGED", "model": "m", "provider": "groq"}
+    with patch("sys.argv", ["mytext", "--text", "hello", "--strategy", "hedge", "--timeout", "2.5"]):
+        main()
+    assert mock_run_auto.call_args.kwargs["timeout"] == 2.5
+
+
+def test_cli_invalid_timeout(capsys):
+    with patch("sys.argv", ["mytext", "--text", "hello", "--timeout", "0"]):
+        with pytest.raises(SystemExit):
+            main()
+    _, err = capsys.readouterr()
+    assert "--timeout must be a positive number." in err
+
+
+def test_cli_invalid_hedge_delay(capsys):
+    with patch("sys.argv", ["mytext", "--text", "hello", "--strategy", "hedge", "--hedge-delay", "-1"]):
+        with pytest.raises(SystemExit):
+            main()
+    _, err = capsys.readouterr()
+    assert "--hedge-delay must be a non-negative number." in err
@@ -89,3 +89,9 @@ def test_run_mytext_missing_api_key_for_github():
     result = run_mytext(text="test", auth=auth, provider=Provider.GITHUB)
     assert not result["status"]
     assert result["message"] == "GITHUB provider requires keys: `api_key`"
+
+
+def test_run_mytext_invalid_retry_policy():
+    result = run_mytext(text="test", auth={"api_key": "x"}, retry_policy="bad")
+    assert not result["status"]
+    assert result["message"] == "`retry_policy` must be an instance of RetryPolicy or None."
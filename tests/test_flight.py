@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+import pytest
+from mytext import run_mytext, arun_mytext, Provider
+from mytext import SingleFlight, MemoryCache
+
+TEST_CASE_NAME = "Single-flight tests"
+
+
+def _run_concurrently(function, count):
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(function) for _ in range(count)]
+        return [future.result() for future in futures]
+
+
+def test_single_flight_do():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def work(value):
+        calls.append(value)
+        release.wait(5)
+        return value * 2
+
+    def call():
+        return flight.do("key", work, 21)
+
+    threading.Timer(0.2, release.set).start()
+    results = _run_concurrently(call, 8)
+    assert results == [42] * 8
+    assert calls == [21]
+    assert len(flight) == 0
+    assert flight.do("key", work, 1) == 2
+    assert calls == [21, 1]
+
+
+def test_single_flight_different_keys():
+    flight = SingleFlight()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def work(value):
+        barrier.wait()
+        return value
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(flight.do, "first", work, 1)
+        second = executor.submit(flight.do, "second", work, 2)
+        assert (first.result(), second.result()) == (1, 2)
+
+
+def test_single_flight_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(5)
+        raise ValueError("failed")
+
+    def call():
+        with pytest.raises(ValueError, match="failed"):
+            flight.do("key", work)
+        return True
+
+    threading.Timer(0.2, release.set).start()
+    assert _run_concurrently(call, 4) == [True] * 4
+    assert len(flight) == 0
+
+
+def test_single_flight_ado():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.1)
+        return value
+
+    async def run():
+        return await asyncio.gather(*[flight.ado("key", work, 7) for _ in range(5)])
+
+    assert asyncio.run(run()) == [7] * 5
+    assert calls == [7]
+    assert len(flight) == 0
+
+
+def test_single_flight_interrupted_leader():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work(value):
+        calls.append(value)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise KeyboardInterrupt
+        return value
+
+    def lead():
+        with pytest.raises(KeyboardInterrupt):
+            flight.do("key", work, 1)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    assert started.wait(5)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        follower = executor.submit(flight.do, "key", work, 2)
+        time.sleep(0.1)
+        release.set()
+        assert follower.result(5) == 2
+    leader.join(5)
+    assert calls == [1, 2]
+    assert len(flight) == 0
+
+
+def test_single_flight_ado_cancelled():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.1)
+        return value
+
+    async def run():
+        leader = asyncio.ensure_future(flight.ado("key", work, 1))
+        cancelled_follower = asyncio.ensure_future(flight.ado("key", work, 2))
+        follower = asyncio.ensure_future(flight.ado("key", work, 3))
+        await asyncio.sleep(0.01)
+        cancelled_follower.cancel()
+        assert await leader == 1
+        assert await follower == 1
+        leader = asyncio.ensure_future(flight.ado("key", work, 4))
+        follower = asyncio.ensure_future(flight.ado("key", work, 5))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == 5
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(run())
+    assert calls == [1, 4, 5]
+    assert len(flight) == 0
+
+
+@patch("requests.Session.post")
+def test_run_mytext_coalesced(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+
+    def slow_post(*args, **kwargs):
+        time.sleep(0.2)
+        return mock_response
+
+    mock_post.side_effect = slow_post
+    cache = MemoryCache()
+    results = _run_concurrently(
+        lambda: run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, cache=cache), 6)
+    assert all(result["message"] == "OK!" and result["cached"] is False for result in results)
+    assert len({id(result) for result in results}) == 6
+    assert mock_post.call_count == 1
+    results = _run_concurrently(
+        lambda: run_mytext(text="hello", auth={"api_key": "OTHER_KEY"}, provider=Provider.GROQ), 2)
+    assert all(result["status"] for result in results)
+    assert mock_post.call_count == 2
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_coalesced(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+
+    def slow_post(*args, **kwargs):
+        time.sleep(0.2)
+        return mock_response
+
+    mock_post.side_effect = slow_post
+
+    async def run():
+        return await asyncio.gather(
+            *[arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ) for _ in range(4)],
+            arun_mytext(text="bye", auth={"api_key": "KEY"}, provider=Provider.GROQ))
+
+    results = asyncio.run(run())
+    assert all(result["message"] == "OK!" for result in results)
+    assert mock_post.call_count == 2
@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import time
+import asyncio
+import threading
 from unittest.mock import patch, MagicMock
 import pytest
-from mytext import Mode, Tone, Provider
-from mytext import run_mytext
+from mytext import Mode, Tone, Provider, Strategy
+from mytext import run_mytext, run_mytext_batch, arun_mytext, run_mytext_auto, run_mytext_long
+from mytext import MyTextValidationError, RetryPolicy, MemoryCache, configure_circuit_breaker
 from mytext.cli import main
-from mytext.providers import PROVIDER_MAP
+from mytext.providers import PROVIDER_MAP, _call_provider
+from mytext.functions import _build_instruction, _build_prompt, _get_prompt_template
+from mytext.functions import _split_text, _estimate_tokens
+from memor import RenderFormat
 
 TEST_CASE_NAME = "Functions tests"
 
@@ -467,3 +474,467 @@ def test_run_mytext_custom_model(mock_post):
     _, kwargs = mock_post.call_args
 
     assert kwargs["json"]["model"] == "custom-model"
+
+
+@patch("requests.Session.post")
+def test_run_mytext_batch_order(mock_post):
+
+    def fake_post(url, headers, json, timeout):
+        response = MagicMock()
+        response.status_code = 200
+        text = json["messages"][0]["content"].split("User text:\n")[-1]
+        response.json.return_value = {"choices": [{"message": {"content": text.upper()}}]}
+        return response
+
+    mock_post.side_effect = fake_post
+    texts = ["text {index}".format(index=index) for index in range(20)]
+    results = run_mytext_batch(
+        texts=texts,
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        max_workers=5)
+    assert len(results) == 20
+    for text, result in zip(texts, results):
+        assert result["status"]
+        assert result["message"] == text.upper()
+
+
+@patch("mytext.functions._call_provider")
+def test_run_mytext_batch_per_item_status(mock_call):
+    mock_call.return_value = {"status": True, "message": "OK!", "model": "m"}
+    results = run_mytext_batch(texts=["hello", 123], auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert results[0]["status"]
+    assert not results[1]["status"]
+    assert results[1]["message"] == "`text` must be a string."
+    assert run_mytext_batch(texts=[], auth={"api_key": "KEY"}) == []
+
+
+def test_run_mytext_batch_invalid_inputs():
+    with pytest.raises(MyTextValidationError, match="`texts` must be a list of strings."):
+        run_mytext_batch(texts="hello", auth={})
+    with pytest.raises(MyTextValidationError, match="`max_workers` must be a positive integer."):
+        run_mytext_batch(texts=["hello"], auth={}, max_workers=0)
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_success(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+
+    async def run_all():
+        return await asyncio.gather(*[
+            arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ) for _ in range(5)])
+
+    results = asyncio.run(run_all())
+    assert all(result["status"] for result in results)
+    assert all(result["message"] == "OK!" for result in results)
+
+
+@patch("asyncio.sleep")
+@patch("requests.Session.post")
+def test_arun_mytext_retry_uses_asyncio_sleep(mock_post, mock_sleep):
+    fail_response = MagicMock()
+    fail_response.status_code = 500
+    fail_response.text = "Server Error"
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "Recovered"}}]}
+    mock_post.side_effect = [fail_response, success_response]
+
+    async def fake_sleep(delay):
+        return None
+
+    mock_sleep.side_effect = fake_sleep
+    result = asyncio.run(arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ))
+    assert result["status"]
+    assert result["message"] == "Recovered"
+    assert mock_sleep.call_count == 1
+
+
+def test_arun_mytext_invalid_input():
+    result = asyncio.run(arun_mytext(text=123, auth={}))
+    assert not result["status"]
+    assert result["message"] == "`text` must be a string."
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_timing(mock_post, mock_sleep):
+    fail_response = MagicMock()
+    fail_response.status_code = 500
+    fail_response.text = "Server Error"
+    fail_response.request.body = b'{"request": 1}'
+    fail_response.content = b"Server Error"
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "Recovered"}}]}
+    success_response.request.body = b'{"request": 2}'
+    success_response.content = b'{"choices": []}'
+    mock_post.side_effect = [fail_response, success_response]
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(max_retries=3, retry_delay=0.5, jitter=False),
+        timing=True)
+    assert result["status"]
+    timing = result["timing"]
+    assert timing["provider"] == "groq"
+    assert len(timing["attempts"]) == 2
+    assert timing["retries"] == 1
+    assert timing["backoff_time"] == 0.5
+    assert timing["bytes_sent"] == 28
+    assert timing["bytes_received"] == 27
+    assert timing["total_time"] >= sum(timing["attempts"])
+    mock_sleep.assert_called_once_with(0.5)
+
+
+@patch("requests.Session.post")
+def test_run_mytext_timing_failure_and_cache(mock_post):
+    fail_response = MagicMock()
+    fail_response.status_code = 400
+    fail_response.text = "Bad Request"
+    mock_post.return_value = fail_response
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timing=True)
+    assert not result["status"]
+    assert len(result["timing"]["attempts"]) == 1
+    assert result["timing"]["retries"] == 0
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = success_response
+    cache = MemoryCache()
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, cache=cache, timing=True)
+    assert not result["cached"]
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, cache=cache, timing=True)
+    assert result["cached"]
+    assert result["timing"]["attempts"] == []
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert "timing" not in result
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timing="yes")
+    assert result["message"] == "`timing` must be a boolean."
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_timing(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_response.content = b"OK!"
+    mock_post.return_value = mock_response
+    result = asyncio.run(arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timing=True))
+    assert result["status"]
+    assert result["timing"]["provider"] == "groq"
+    assert len(result["timing"]["attempts"]) == 1
+    assert result["timing"]["bytes_received"] == 3
+
+
+@patch("requests.Session.post")
+def test_run_mytext_timeout(mock_post):
+    fail_response = MagicMock()
+    fail_response.status_code = 503
+    fail_response.text = "Service Unavailable"
+    fail_response.headers = {}
+
+    def slow_post(*args, **kwargs):
+        time.sleep(0.1)
+        return fail_response
+
+    mock_post.side_effect = slow_post
+    start = time.monotonic()
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(max_retries=10, retry_delay=0.05, backoff_factor=1, jitter=False),
+        timeout=0.4)
+    elapsed = time.monotonic() - start
+    assert not result["status"]
+    assert "Service Unavailable" in result["message"]
+    assert elapsed < 0.6
+    timeouts = [call.kwargs["timeout"] for call in mock_post.call_args_list]
+    assert 1 < len(timeouts) < 10
+    assert timeouts[0] <= 0.4
+    assert all(earlier > later for earlier, later in zip(timeouts, timeouts[1:]))
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=0)
+    assert result["message"] == "`timeout` must be a positive number or None."
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=True)
+    assert result["message"] == "`timeout` must be a positive number or None."
+
+
+@patch("requests.Session.post")
+def test_run_mytext_default_attempt_timeout(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)["status"]
+    assert mock_post.call_args.kwargs["timeout"] == 15
+    assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=120)["status"]
+    assert mock_post.call_args.kwargs["timeout"] == 15
+    result = asyncio.run(arun_mytext(text="hi", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=120))
+    assert result["status"]
+    assert mock_post.call_args.kwargs["timeout"] == 15
+    result = asyncio.run(arun_mytext(text="bye", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=5))
+    assert result["status"]
+    assert 4 < mock_post.call_args.kwargs["timeout"] <= 5
+
+
+@patch("requests.Session.post")
+def test_call_provider_deadline_exhausted(mock_post):
+    result = _call_provider(
+        provider=Provider.GROQ,
+        prompt=_build_prompt("hello", Mode.PARAPHRASE, Tone.NEUTRAL),
+        auth={"api_key": "KEY"},
+        model="m",
+        deadline=time.monotonic())
+    assert not result["status"]
+    assert result["message"] == "Timeout budget exhausted before the request completed."
+    mock_post.assert_not_called()
+
+
+def test_prompt_template_memoized():
+    template1 = _get_prompt_template(Mode.SUMMARIZE, Tone.FORMAL)
+    template2 = _get_prompt_template(Mode.SUMMARIZE, Tone.FORMAL)
+    template3 = _get_prompt_template(Mode.SUMMARIZE, Tone.CASUAL)
+    assert template1 is template2
+    assert template1 is not template3
+    assert _build_instruction(Mode.SUMMARIZE, Tone.FORMAL) is _build_instruction(Mode.SUMMARIZE, Tone.FORMAL)
+
+
+def test_build_prompt_render():
+    for mode in Mode:
+        for tone in Tone:
+            prompt = _build_prompt("hello", mode, tone)
+            content = prompt.render(RenderFormat.OPENAI)["content"]
+            assert content == "{instruction}\n\nUser text:\nhello".format(instruction=_build_instruction(mode, tone))
+
+
+def _fake_run_mytext_factory(behaviour):
+
+    def fake_run_mytext(text, auth, mode, tone, provider, model, retry_policy, cache, timing=False, timeout=None,
+                        cancel_event=None):
+        delay, status = behaviour[provider]
+        time.sleep(delay)
+        return {"status": status, "message": provider.value, "model": "m"}
+
+    return fake_run_mytext
+
+
+def test_run_mytext_auto_sequential():
+    behaviour = {Provider.AI_STUDIO: (0, False), Provider.GROQ: (0, True), Provider.NVIDIA: (0, True)}
+    auth_map = {provider: {"api_key": "KEY"} for provider in behaviour}
+    auth_map[Provider.CLOUDFLARE] = {"api_key": "KEY", "account_id": None}
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)) as mock_run:
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.SEQUENTIAL)
+    assert result["status"]
+    assert result["provider"] == "groq"
+    assert mock_run.call_count == 2
+
+
+def test_run_mytext_auto_hedge():
+    behaviour = {Provider.AI_STUDIO: (1, True), Provider.GROQ: (0, True)}
+    auth_map = {provider: {"api_key": "KEY"} for provider in behaviour}
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)):
+        start = time.monotonic()
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.HEDGE, hedge_delay=0.1)
+        elapsed = time.monotonic() - start
+    assert result["status"]
+    assert result["provider"] == "groq"
+    assert elapsed < 0.9
+
+
+def test_run_mytext_auto_hedge_fast_first():
+    behaviour = {Provider.AI_STUDIO: (0, True), Provider.GROQ: (0, True)}
+    auth_map = {provider: {"api_key": "KEY"} for provider in behaviour}
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)) as mock_run:
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.HEDGE, hedge_delay=1)
+    assert result["provider"] == "ai-studio"
+    assert mock_run.call_count == 1
+
+
+def test_run_mytext_auto_race():
+    behaviour = {Provider.AI_STUDIO: (1, True), Provider.CEREBRAS: (0, False), Provider.GROQ: (0.1, True)}
+    auth_map = {provider: {"api_key": "KEY"} for provider in behaviour}
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)):
+        start = time.monotonic()
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.RACE)
+        elapsed = time.monotonic() - start
+    assert result["provider"] == "groq"
+    assert elapsed < 0.9
+
+
+def test_run_mytext_auto_race_losers_are_daemon():
+    release = threading.Event()
+    loser_threads = []
+
+    def fake_run_mytext(text, auth, mode, tone, provider, model, retry_policy, cache, timing=False, timeout=None,
+                        cancel_event=None):
+        if provider == Provider.AI_STUDIO:
+            loser_threads.append(threading.current_thread())
+            release.wait(10)
+        while not loser_threads:
+            time.sleep(0.01)
+        return {"status": True, "message": provider.value, "model": "m"}
+
+    auth_map = {Provider.AI_STUDIO: {"api_key": "KEY"}, Provider.GROQ: {"api_key": "KEY"}}
+    with patch("mytext.functions.run_mytext", side_effect=fake_run_mytext):
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.RACE)
+        assert result["provider"] == "groq"
+        assert loser_threads[0].daemon
+        assert loser_threads[0].is_alive()
+        release.set()
+        loser_threads[0].join(10)
+
+
+@patch("requests.Session.post")
+def test_run_mytext_auto_race_losers_cancelled(mock_post):
+    loser_posts = []
+
+    def post(url, **kwargs):
+        response = MagicMock()
+        response.headers = {}
+        if "groq" in url:
+            loser_posts.append(time.monotonic())
+            response.status_code = 503
+            response.text = "Unavailable"
+            return response
+        time.sleep(0.2)
+        response.status_code = 200
+        response.json.return_value = {"candidates": [{"content": {"parts": [{"text": "OK!"}]}}]}
+        return response
+
+    mock_post.side_effect = post
+    configure_circuit_breaker(Provider.GROQ, failure_threshold=1000)
+    auth_map = {Provider.AI_STUDIO: {"api_key": "KEY"}, Provider.GROQ: {"api_key": "KEY"}}
+    retry_policy = RetryPolicy(max_retries=1000, retry_delay=0.05, backoff_factor=1, jitter=False)
+    result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.RACE, retry_policy=retry_policy)
+    assert result["provider"] == "ai-studio"
+    time.sleep(0.1)
+    posts = len(loser_posts)
+    time.sleep(0.3)
+    assert len(loser_posts) == posts
+    assert posts < 10
+
+
+def test_run_mytext_auto_all_failed():
+    behaviour = {Provider.AI_STUDIO: (0, False), Provider.GROQ: (0, False)}
+    auth_map = {provider: {"api_key": "KEY"} for provider in behaviour}
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)):
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.HEDGE, hedge_delay=0.1)
+    assert not result["status"]
+    assert "all failed" in result["message"]
+    assert "- ai-studio: ai-studio" in result["message"]
+    assert "- groq: groq" in result["message"]
+    result = run_mytext_auto(text="hello", auth_map={}, strategy=Strategy.RACE)
+    assert not result["status"]
+    assert result["message"] == "No valid provider credentials found in the environment."
+
+
+def test_run_mytext_auto_timeout():
+    behaviour = {Provider.AI_STUDIO: (0.2, False), Provider.GROQ: (1, True), Provider.NVIDIA: (0, True)}
+    auth_map = {provider: {"api_key": "KEY"} for provider in behaviour}
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)) as mock_run:
+        start = time.monotonic()
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.HEDGE, hedge_delay=0.5, timeout=0.3)
+        elapsed = time.monotonic() - start
+    assert not result["status"]
+    assert "- ai-studio: ai-studio" in result["message"]
+    assert "- groq: Timeout budget exhausted before the request completed." in result["message"]
+    assert elapsed < 0.9
+    assert mock_run.call_args_list[0].kwargs["timeout"] <= 0.3
+    assert mock_run.call_args_list[1].kwargs["timeout"] <= 0.1
+    with patch("mytext.functions.run_mytext", side_effect=_fake_run_mytext_factory(behaviour)) as mock_run:
+        result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.SEQUENTIAL, timeout=0.1)
+    assert not result["status"]
+    assert mock_run.call_count == 1
+    assert "- nvidia: Timeout budget exhausted before the request completed." in result["message"]
+
+
+def test_run_mytext_auto_invalid_inputs():
+    result = run_mytext_auto(text="hello", auth_map=[])
+    assert result["message"] == "`auth_map` must be a dictionary mapping Provider to authentication parameters."
+    result = run_mytext_auto(text="hello", auth_map={}, strategy="race")
+    assert result["message"] == "`strategy` must be an instance of Strategy enum."
+    result = run_mytext_auto(text="hello", auth_map={}, hedge_delay=-1)
+    assert result["message"] == "`hedge_delay` must be a non-negative number."
+    result = run_mytext_auto(text="hello", auth_map={}, timeout=0)
+    assert result["message"] == "`timeout` must be a positive number or None."
+
+
+def test_split_text():
+    text = "\n\n".join(["Paragraph {index}. First sentence. Second sentence!".format(index=index)
+                       for index in range(10)])
+    chunks = _split_text(text, max_chunk_tokens=30)
+    assert len(chunks) > 1
+    assert all(_estimate_tokens(chunk) <= 30 for chunk in chunks)
+    assert "\n\n".join(chunks) == text
+    long_sentence = " ".join(["word"] * 100)
+    chunks = _split_text(long_sentence, max_chunk_tokens=10)
+    assert all(_estimate_tokens(chunk) <= 10 for chunk in chunks)
+    assert " ".join(chunks) == long_sentence
+    assert _split_text("x" * 50, max_chunk_tokens=5) == ["x" * 20, "x" * 20, "x" * 10]
+    assert _split_text("", max_chunk_tokens=5) == []
+
+
+@patch("mytext.functions._call_provider")
+def test_run_mytext_long_stitch(mock_call):
+
+    def fake_call_provider(provider, prompt, auth, model, retry_policy, **kwargs):
+        text = prompt.message
+        return {"status": True, "message": text.upper(), "model": model}
+
+    mock_call.side_effect = fake_call_provider
+    text = "\n\n".join(["paragraph {index}. first sentence.".format(index=index) for index in range(10)])
+    result = run_mytext_long(text=text, auth={"api_key": "KEY"}, provider=Provider.GROQ, max_chunk_tokens=20)
+    assert result["status"]
+    assert result["message"] == text.upper()
+    assert mock_call.call_count > 1
+
+
+@patch("mytext.functions._call_provider")
+def test_run_mytext_long_summarize_reduce(mock_call):
+
+    def fake_call_provider(provider, prompt, auth, model, retry_policy, **kwargs):
+        return {"status": True, "message": "summary.", "model": model}
+
+    mock_call.side_effect = fake_call_provider
+    text = "\n\n".join(["paragraph {index}. first sentence.".format(index=index) for index in range(10)])
+    result = run_mytext_long(
+        text=text,
+        auth={"api_key": "KEY"},
+        mode=Mode.SUMMARIZE,
+        provider=Provider.GROQ,
+        max_chunk_tokens=20)
+    assert result["status"]
+    assert result["message"] == "summary."
+
+
+@patch("mytext.functions._call_provider")
+def test_run_mytext_long_short_text(mock_call):
+    mock_call.return_value = {"status": True, "message": "OK!", "model": "m"}
+    result = run_mytext_long(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert result["message"] == "OK!"
+    assert mock_call.call_count == 1
+
+
+@patch("mytext.functions._call_provider")
+def test_run_mytext_long_failure(mock_call):
+    mock_call.side_effect = [
+        {"status": True, "message": "OK!", "model": "m"},
+        {"status": False, "message": "ERR", "model": "m"}]
+    text = "first paragraph.\n\nsecond paragraph."
+    result = run_mytext_long(
+        text=text,
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        max_chunk_tokens=5,
+        max_workers=1)
+    assert not result["status"]
+    assert result["message"] == "Chunk 2 failed: ERR"
+    result = run_mytext_long(text=text, auth={"api_key": "KEY"}, max_chunk_tokens=0)
+    assert result["message"] == "`max_chunk_tokens` must be a positive integer."
+    result = run_mytext_long(text=text, auth={"api_key": "KEY"}, max_workers=0)
+    assert result["message"] == "`max_workers` must be a positive integer."
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import subprocess
+import mytext
+
+TEST_CASE_NAME = "Import tests"
+
+HEAVY_MODULES = ["art", "memor", "pandas", "requests", "mytext.functions", "mytext.providers"]
+
+CHECK_SCRIPT = """
+import sys
+{body}
+print(",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+
+def _get_loaded_heavy_modules(body):
+    script = CHECK_SCRIPT.format(body=body, modules=HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, "-c", script], universal_newlines=True)
+    return output.splitlines()[-1] if output.strip() else ""
+
+
+def test_import_package_is_lazy():
+    assert _get_loaded_heavy_modules("import mytext\nmytext.Provider\nmytext.MyTextError") == ""
+
+
+def test_import_cli_is_lazy():
+    assert _get_loaded_heavy_modules("import mytext.cli") == ""
+
+
+def test_cli_version_is_lazy():
+    body = "sys.argv = ['mytext', '--version']\nfrom mytext.cli import main\nmain()"
+    assert _get_loaded_heavy_modules(body) == ""
+
+
+def test_lazy_attributes():
+    from mytext.functions import run_mytext
+    assert mytext.run_mytext is run_mytext
+    assert "run_mytext" in dir(mytext)
+    for name in mytext.__all__:
+        assert getattr(mytext, name) is not None
+    try:
+        mytext.unknown_attribute
+        assert False
+    except AttributeError:
+        pass
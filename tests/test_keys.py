@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+from unittest.mock import patch, MagicMock
+import pytest
+from mytext import run_mytext, arun_mytext, run_mytext_stream
+from mytext import Provider, KeyRotation
+from mytext import KeyPool, configure_key_rotation
+from mytext import MyTextValidationError
+from mytext.keys import _get_key_pool
+from mytext.cli import _load_auth_from_env
+
+TEST_CASE_NAME = "Key rotation tests"
+
+
+def _build_response(status_code, content="OK!", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "Error"
+    response.headers = headers or dict()
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return response
+
+
+def _get_used_keys(mock_post):
+    return [call[1]["headers"]["Authorization"].split()[-1] for call in mock_post.call_args_list]
+
+
+def test_key_pool_validation():
+    with pytest.raises(MyTextValidationError, match="must be a string or a non-empty list of strings"):
+        KeyPool([])
+    with pytest.raises(MyTextValidationError, match="must be a string or a non-empty list of strings"):
+        KeyPool(["KEY", 1])
+    with pytest.raises(MyTextValidationError, match="must be an instance of KeyRotation enum"):
+        KeyPool(["KEY"], strategy="round-robin")
+    with pytest.raises(MyTextValidationError, match="must be a positive number"):
+        KeyPool(["KEY"], quarantine_time=0)
+    with pytest.raises(MyTextValidationError, match="must be a positive number"):
+        configure_key_rotation(Provider.GROQ, quarantine_time=-1)
+    result = run_mytext(text="hello", auth={"api_key": []}, provider=Provider.GROQ)
+    assert not result["status"]
+    assert result["message"] == "`api_key` must be a string or a non-empty list of strings."
+
+
+def test_key_pool_round_robin():
+    pool = KeyPool(["K1", "K2", "K3", "K2"])
+    assert len(pool) == 3
+    assert [pool.next_key() for _ in range(6)] == ["K1", "K2", "K3", "K1", "K2", "K3"]
+    pool.quarantine("K2")
+    assert [pool.next_key() for _ in range(4)] == ["K1", "K3", "K1", "K3"]
+    pool.quarantine("UNKNOWN")
+    assert pool.has_available()
+
+
+def test_key_pool_least_recently_throttled():
+    pool = KeyPool(["K1", "K2", "K3"], strategy=KeyRotation.LEAST_RECENTLY_THROTTLED)
+    assert [pool.next_key() for _ in range(3)] == ["K1", "K2", "K3"]
+    with patch("time.monotonic", return_value=1000.0):
+        pool.quarantine("K1", 1)
+    with patch("time.monotonic", return_value=1001.0):
+        pool.quarantine("K3", 1)
+    with patch("time.monotonic", return_value=1005.0):
+        assert [pool.next_key() for _ in range(3)] == ["K2", "K2", "K2"]
+    pool = KeyPool(["K1", "K2"], strategy=KeyRotation.LEAST_RECENTLY_THROTTLED)
+    with patch("time.monotonic", return_value=1000.0):
+        pool.quarantine("K2", 1)
+    with patch("time.monotonic", return_value=1001.0):
+        pool.quarantine("K1", 1)
+    with patch("time.monotonic", return_value=1005.0):
+        assert pool.next_key() == "K2"
+
+
+def test_key_pool_all_quarantined():
+    pool = KeyPool(["K1", "K2"])
+    pool.quarantine("K1", 100)
+    pool.quarantine("K2", 50)
+    assert not pool.has_available()
+    assert pool.next_key() == "K2"
+
+
+def test_key_pool_registry():
+    pool = _get_key_pool(Provider.GROQ, ["K1", "K2"])
+    assert _get_key_pool(Provider.GROQ, ["K1", "K2"]) is pool
+    assert _get_key_pool(Provider.NVIDIA, ["K1", "K2"]) is not pool
+    configure_key_rotation(Provider.GROQ, strategy=KeyRotation.LEAST_RECENTLY_THROTTLED, quarantine_time=5)
+    pool = _get_key_pool(Provider.GROQ, ["K1", "K2"])
+    assert pool.strategy == KeyRotation.LEAST_RECENTLY_THROTTLED
+    assert pool.quarantine_time == 5
+    assert _get_key_pool(Provider.NVIDIA, ["K1"]).strategy == KeyRotation.ROUND_ROBIN
+
+
+@patch("requests.Session.post")
+def test_run_mytext_key_rotation(mock_post):
+    mock_post.return_value = _build_response(200)
+    auth = {"api_key": ["K1", "K2"]}
+    for _ in range(4):
+        assert run_mytext(text="hello", auth=auth, provider=Provider.GROQ)["status"]
+    assert _get_used_keys(mock_post) == ["K1", "K2", "K1", "K2"]
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_key_quarantine(mock_post, mock_sleep):
+    mock_post.side_effect = [
+        _build_response(429, headers={"Retry-After": "10"}),
+        _build_response(401),
+        _build_response(200, "DONE"),
+        _build_response(200, "DONE")]
+    auth = {"api_key": ["K1", "K2", "K3"]}
+    result = run_mytext(text="hello", auth=auth, provider=Provider.GROQ)
+    assert result["status"]
+    assert result["message"] == "DONE"
+    assert all(call[0][0] == 0 for call in mock_sleep.call_args_list)
+    assert run_mytext(text="hello", auth=auth, provider=Provider.GROQ)["status"]
+    assert _get_used_keys(mock_post) == ["K1", "K2", "K3", "K3"]
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_all_keys_rejected(mock_post, mock_sleep):
+    mock_post.return_value = _build_response(401)
+    result = run_mytext(text="hello", auth={"api_key": ["K1", "K2"]}, provider=Provider.GROQ)
+    assert not result["status"]
+    assert _get_used_keys(mock_post) == ["K1", "K2"]
+
+
+@patch("asyncio.sleep")
+@patch("requests.Session.post")
+def test_arun_mytext_key_quarantine(mock_post, mock_sleep):
+    mock_sleep.return_value = None
+    mock_post.side_effect = [_build_response(429), _build_response(200, "DONE")]
+    result = asyncio.run(arun_mytext(text="hello", auth={"api_key": ["K1", "K2"]}, provider=Provider.GROQ))
+    assert result["status"]
+    assert _get_used_keys(mock_post) == ["K1", "K2"]
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_stream_key_quarantine(mock_post, mock_sleep):
+    stream_response = MagicMock()
+    stream_response.status_code = 200
+    stream_response.iter_lines.return_value = ['data: {"choices": [{"delta": {"content": "DONE"}}]}', "data: [DONE]"]
+    mock_post.side_effect = [_build_response(401), stream_response]
+    chunks = list(run_mytext_stream(text="hello", auth={"api_key": ["K1", "K2"]}, provider=Provider.GROQ))
+    assert chunks == ["DONE"]
+    assert _get_used_keys(mock_post) == ["K1", "K2"]
+
+
+def test_load_auth_from_env_keys():
+    environ = {"GROQ_API_KEYS": "K1, K2,,K3", "GROQ_API_KEY": "K0", "NVIDIA_API_KEYS": "N1", "CEREBRAS_API_KEY": "C1"}
+    with patch.dict(os.environ, environ, clear=True):
+        auth_map = _load_auth_from_env()
+    assert auth_map[Provider.GROQ]["api_key"] == ["K0", "K1", "K2", "K3"]
+    assert auth_map[Provider.NVIDIA]["api_key"] == "N1"
+    assert auth_map[Provider.CEREBRAS]["api_key"] == "C1"
+    assert auth_map[Provider.OPENROUTER]["api_key"] is None
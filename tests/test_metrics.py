@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import urllib.request
+import urllib.error
+from unittest.mock import patch, MagicMock
+import pytest
+from mytext import run_mytext, Provider, Mode, Tone, RetryPolicy, MemoryCache
+from mytext import MetricsRegistry, enable_metrics, disable_metrics, get_metrics, start_metrics_server
+from mytext import MyTextValidationError
+
+TEST_CASE_NAME = "Metrics tests"
+
+
+def _build_response(status_code, content="OK!"):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "Error"
+    response.headers = {}
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return response
+
+
+def test_registry_render():
+    registry = MetricsRegistry(buckets=[1, 0.5])
+    assert registry.buckets == (0.5, 1.0)
+    registry.inc("mytext_requests", (("provider", "groq"), ("status", "success")))
+    registry.inc("mytext_requests", (("provider", "groq"), ("status", "success")), 2)
+    registry.observe("mytext_request_duration_seconds", (("provider", "groq"),), 0.5)
+    registry.observe("mytext_request_duration_seconds", (("provider", "groq"),), 2)
+    assert registry.get("mytext_requests", provider="groq", status="success") == 3
+    assert registry.get("mytext_request_duration_seconds", provider="groq") == 2
+    text = registry.render()
+    assert "# TYPE mytext_requests counter" in text
+    assert 'mytext_requests_total{provider="groq",status="success"} 3' in text
+    assert 'mytext_request_duration_seconds_bucket{provider="groq",le="0.5"} 1' in text
+    assert 'mytext_request_duration_seconds_bucket{provider="groq",le="1.0"} 1' in text
+    assert 'mytext_request_duration_seconds_bucket{provider="groq",le="+Inf"} 2' in text
+    assert 'mytext_request_duration_seconds_count{provider="groq"} 2' in text
+    assert 'mytext_request_duration_seconds_sum{provider="groq"} 2.5' in text
+    assert text.endswith("# EOF\n")
+    registry.clear()
+    assert registry.render() == "# EOF\n"
+
+
+def test_registry_label_escaping():
+    registry = MetricsRegistry()
+    registry.inc("mytext_requests", (("model", 'a"b\\c\nd'),))
+    assert 'mytext_requests_total{model="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_registry_invalid_buckets():
+    with pytest.raises(MyTextValidationError, match="`buckets` must be a non-empty sequence of positive numbers."):
+        MetricsRegistry(buckets=[])
+    with pytest.raises(MyTextValidationError, match="`buckets` must be a non-empty sequence of positive numbers."):
+        MetricsRegistry(buckets=[0, 1])
+    with pytest.raises(MyTextValidationError, match="`buckets` must be a non-empty sequence of positive numbers."):
+        MetricsRegistry(buckets="fast")
+
+
+def test_enable_disable_metrics():
+    assert get_metrics() is None
+    registry = enable_metrics()
+    assert get_metrics() is registry
+    disable_metrics()
+    assert get_metrics() is None
+
+
+@patch("requests.Session.post")
+def test_run_mytext_metrics_disabled(mock_post):
+    mock_post.return_value = _build_response(200)
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert result["status"]
+    assert get_metrics() is None
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_metrics(mock_post, mock_sleep):
+    registry = enable_metrics()
+    mock_post.side_effect = [_build_response(503), _build_response(200)]
+    retry_policy = RetryPolicy(max_retries=3, retry_delay=0, jitter=False)
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        mode=Mode.SUMMARIZE,
+        tone=Tone.FORMAL,
+        provider=Provider.GROQ,
+        model="m",
+        retry_policy=retry_policy)
+    assert result["status"]
+    labels = dict(provider="groq", model="m", mode="summarize", tone="formal")
+    assert registry.get("mytext_requests", status="success", **labels) == 1
+    assert registry.get("mytext_request_duration_seconds", **labels) == 1
+    assert registry.get("mytext_provider_attempts", provider="groq", model="m") == 2
+    assert registry.get("mytext_provider_errors", provider="groq", model="m", status_code="503") == 1
+    assert registry.get("mytext_provider_retries", provider="groq", model="m") == 1
+    mock_post.side_effect = None
+    mock_post.return_value = _build_response(400)
+    result = run_mytext(text="bye", auth={"api_key": "KEY"}, provider=Provider.GROQ, model="m")
+    assert not result["status"]
+    assert registry.get(
+        "mytext_requests",
+        status="failure",
+        provider="groq",
+        model="m",
+        mode="paraphrase",
+        tone="neutral") == 1
+    assert registry.get("mytext_provider_errors", provider="groq", model="m", status_code="400") == 1
+
+
+@patch("requests.Session.post")
+def test_run_mytext_cache_metrics(mock_post):
+    registry = enable_metrics()
+    mock_post.return_value = _build_response(200)
+    cache = MemoryCache()
+    for _ in range(4):
+        run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, model="m", cache=cache)
+    labels = dict(provider="groq", model="m", mode="paraphrase", tone="neutral")
+    assert registry.get("mytext_cache_lookups", result="miss", **labels) == 1
+    assert registry.get("mytext_cache_lookups", result="hit", **labels) == 3
+    ratio_line = 'mytext_cache_hit_ratio{mode="paraphrase",model="m",provider="groq",tone="neutral"} 0.75'
+    assert ratio_line in registry.render()
+
+
+def test_start_metrics_server():
+    registry = MetricsRegistry()
+    registry.inc("mytext_requests", (("provider", "groq"),))
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        url = "http://127.0.0.1:{port}".format(port=server.server_address[1])
+        with urllib.request.urlopen(url + "/metrics") as response:
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert 'mytext_requests_total{provider="groq"} 1' in response.read().decode("utf-8")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other")
+    finally:
+        server.shutdown()
+        server.server_close()
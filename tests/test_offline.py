@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+import re
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from mytext import run_mytext_offline_batch, Provider, Mode
+from mytext import MyTextValidationError, RetryPolicy
+
+TEST_CASE_NAME = "Offline batch tests"
+
+
+def _get_user_text(content):
+    return content.split("User text:\n")[-1]
+
+
+class MockBatchHandler(BaseHTTPRequestHandler):
+    """Mock Groq and AI Studio batch API."""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, data, status_code=200, raw=False):
+        body = data.encode("utf-8") if raw else json.dumps(data).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        state = self.server.state
+        state["requests"].append(("POST", self.path))
+        body = self._read_body()
+        if self.path == "/openai/v1/files":
+            if self.headers.get("Authorization") != "Bearer KEY":
+                return self._send({"error": {"message": "Invalid API key"}}, 401)
+            state["records"] = [json.loads(line) for line in body.decode("utf-8").splitlines() if
+                                line.startswith('{"custom_id"')]
+            return self._send({"id": "file-input"})
+        if self.path == "/openai/v1/batches":
+            assert json.loads(body)["input_file_id"] == "file-input"
+            return self._send({"id": "batch-1", "status": "validating"})
+        if self.path.endswith("/cancel") or self.path.endswith(":cancel"):
+            state["cancelled"] = True
+            return self._send({"status": "cancelling"})
+        match = re.match(r"/v1beta/models/(.+):batchGenerateContent\?key=KEY$", self.path)
+        if match:
+            state["model"] = match.group(1)
+            state["inlined"] = json.loads(body)["batch"]["input_config"]["requests"]["requests"]
+            return self._send({"name": "batches/gemini-1"})
+        return self._send({"error": {"message": "Not found"}}, 404)
+
+    def do_GET(self):
+        state = self.server.state
+        state["requests"].append(("GET", self.path))
+        state["polls"] += 1
+        if state["polls"] in state["failed_polls"]:
+            return self._send({"error": {"message": "Service unavailable"}}, 503)
+        finished = state["polls"] > state["pending_polls"]
+        if self.path == "/openai/v1/batches/batch-1":
+            if not finished:
+                return self._send({"id": "batch-1", "status": "in_progress"})
+            return self._send({
+                "id": "batch-1",
+                "status": state["final_status"],
+                "output_file_id": "file-output" if state["final_status"] == "completed" else None,
+                "error_file_id": "file-error" if state["final_status"] == "completed" else None})
+        if self.path in ("/openai/v1/files/file-output/content", "/openai/v1/files/file-error/content"):
+            lines = []
+            for record in reversed(state["records"]):
+                text = _get_user_text(record["body"]["messages"][0]["content"])
+                failed = text.startswith("fail")
+                if failed == self.path.endswith("file-error/content"):
+                    if failed:
+                        lines.append({"custom_id": record["custom_id"], "response": {
+                            "status_code": 400, "body": {"error": {"message": "Bad request"}}}, "error": None})
+                    else:
+                        lines.append({"custom_id": record["custom_id"], "response": {
+                            "status_code": 200, "body": {"choices": [{"message": {"content": text.upper()}}]}}})
+            return self._send("\n".join(json.dumps(line) for line in lines) + "\n", raw=True)
+        if self.path == "/v1beta/batches/gemini-1?key=KEY":
+            if not finished:
+                return self._send({"name": "batches/gemini-1", "metadata": {"state": "BATCH_STATE_RUNNING"}})
+            responses = []
+            for item in reversed(state["inlined"]):
+                text = _get_user_text(item["request"]["contents"]["parts"][0]["text"])
+                if text.startswith("fail"):
+                    responses.append({"error": {"message": "Blocked"}, "metadata": item["metadata"]})
+                else:
+                    responses.append({"response": {"candidates": [{"content": {"parts": [{"text": text.upper()}]}}]},
+                                      "metadata": item["metadata"]})
+            return self._send({
+                "name": "batches/gemini-1",
+                "metadata": {"state": "BATCH_STATE_SUCCEEDED"},
+                "done": True,
+                "response": {"inlinedResponses": {"inlinedResponses": responses}}})
+        return self._send({"error": {"message": "Not found"}}, 404)
+
+
+@pytest.fixture
+def batch_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBatchHandler)
+    server.state = {
+        "requests": [], "polls": 0, "pending_polls": 2, "failed_polls": set(), "final_status": "completed"}
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get_base_url(server, path):
+    return "http://127.0.0.1:{port}{path}".format(port=server.server_address[1], path=path)
+
+
+def test_offline_batch_groq(batch_server):
+    results = run_mytext_offline_batch(
+        texts={"a": "hello", "b": "fail this", "c": "world"},
+        auth={"api_key": "KEY"},
+        mode=Mode.GRAMMAR,
+        provider=Provider.GROQ,
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/openai/v1"))
+    assert list(results) == ["a", "b", "c"]
+    assert results["a"] == {"status": True, "message": "HELLO", "model": "openai/gpt-oss-20b"}
+    assert results["c"]["message"] == "WORLD"
+    assert results["b"] == {"status": False, "message": "Bad request", "model": "openai/gpt-oss-20b"}
+    assert batch_server.state["polls"] >= 3
+    records = batch_server.state["records"]
+    assert [record["custom_id"] for record in records] == ["a", "b", "c"]
+    assert records[0]["url"] == "/v1/chat/completions"
+
+
+def test_offline_batch_groq_list(batch_server):
+    results = run_mytext_offline_batch(
+        texts=["first", "second"],
+        auth={"api_key": ["KEY"]},
+        provider=Provider.GROQ,
+        model="custom-model",
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/openai/v1/"))
+    assert results == {
+        "0": {"status": True, "message": "FIRST", "model": "custom-model"},
+        "1": {"status": True, "message": "SECOND", "model": "custom-model"}}
+
+
+def test_offline_batch_groq_failed(batch_server):
+    batch_server.state["final_status"] = "expired"
+    results = run_mytext_offline_batch(
+        texts=["first"],
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/openai/v1"))
+    assert not results["0"]["status"]
+    assert results["0"]["message"] == "Batch batch-1 ended with status: expired"
+
+
+def test_offline_batch_groq_timeout(batch_server):
+    batch_server.state["pending_polls"] = 1000
+    results = run_mytext_offline_batch(
+        texts=["first"],
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        poll_interval=0.05,
+        timeout=0.2,
+        base_url=_get_base_url(batch_server, "/openai/v1"))
+    assert results["0"]["message"] == "Batch batch-1 did not complete within 0.2 seconds."
+    assert batch_server.state["cancelled"]
+
+
+def test_offline_batch_groq_poll_retry(batch_server):
+    batch_server.state["failed_polls"] = {1, 2}
+    results = run_mytext_offline_batch(
+        texts=["first"],
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/openai/v1"),
+        retry_policy=RetryPolicy(max_retries=3, retry_delay=0.01))
+    assert results["0"] == {"status": True, "message": "FIRST", "model": "openai/gpt-oss-20b"}
+    batch_server.state["polls"] = 0
+    batch_server.state["failed_polls"] = {1, 2, 3}
+    results = run_mytext_offline_batch(
+        texts=["first"],
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/openai/v1"),
+        retry_policy=RetryPolicy(max_retries=3, retry_delay=0.01))
+    assert results["0"]["message"].startswith("Batch batch-1 request failed: ")
+    assert "Status Code: 503" in results["0"]["message"]
+    assert "cancelled" not in batch_server.state
+
+
+def test_offline_batch_groq_unauthorized(batch_server):
+    results = run_mytext_offline_batch(
+        texts=["first"],
+        auth={"api_key": "WRONG"},
+        provider=Provider.GROQ,
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/openai/v1"))
+    assert not results["0"]["status"]
+    assert "Status Code: 401" in results["0"]["message"]
+
+
+def test_offline_batch_ai_studio(batch_server):
+    results = run_mytext_offline_batch(
+        texts={"x": "hello", "y": "fail now"},
+        auth={"api_key": "KEY"},
+        provider=Provider.AI_STUDIO,
+        poll_interval=0.01,
+        base_url=_get_base_url(batch_server, "/v1beta"))
+    assert results["x"] == {"status": True, "message": "HELLO", "model": "gemma-4-31b-it"}
+    assert results["y"] == {"status": False, "message": "Blocked", "model": "gemma-4-31b-it"}
+    assert batch_server.state["model"] == "gemma-4-31b-it"
+    assert [item["metadata"]["key"] for item in batch_server.state["inlined"]] == ["x", "y"]
+
+
+def test_offline_batch_validation():
+    with pytest.raises(MyTextValidationError, match="must be a list of strings or a dictionary"):
+        run_mytext_offline_batch(texts="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    with pytest.raises(MyTextValidationError, match="must be a list of strings or a dictionary"):
+        run_mytext_offline_batch(texts={1: "hello"}, auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    with pytest.raises(MyTextValidationError, match="Offline batch is supported by these providers: ai-studio, groq"):
+        run_mytext_offline_batch(texts=["hello"], auth={"api_key": "KEY"}, provider=Provider.NVIDIA)
+    with pytest.raises(MyTextValidationError, match="`poll_interval` must be a positive number."):
+        run_mytext_offline_batch(texts=["hello"], auth={"api_key": "KEY"}, provider=Provider.GROQ, poll_interval=0)
+    with pytest.raises(MyTextValidationError, match="`timeout` must be a positive number."):
+        run_mytext_offline_batch(texts=["hello"], auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=None)
+    with pytest.raises(MyTextValidationError, match="`base_url` must be a string or None."):
+        run_mytext_offline_batch(texts=["hello"], auth={"api_key": "KEY"}, provider=Provider.GROQ, base_url=1)
+    with pytest.raises(MyTextValidationError, match="`retry_policy` must be"):
+        run_mytext_offline_batch(texts=["hello"], auth={"api_key": "KEY"}, provider=Provider.GROQ, retry_policy=3)
+    with pytest.raises(MyTextValidationError, match="GROQ provider requires keys"):
+        run_mytext_offline_batch(texts=["hello"], auth={}, provider=Provider.GROQ)
+    assert run_mytext_offline_batch(texts=[], auth={"api_key": "KEY"}, provider=Provider.GROQ) == {}
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+from unittest.mock import patch, MagicMock
+import pytest
+from mytext import run_mytext, arun_mytext, Provider, Mode, Tone
+from mytext import RateLimiter, configure_rate_limiter, enable_free_tier_rate_limits, reset_rate_limiters
+from mytext import MyTextValidationError, RetryPolicy
+from mytext.ratelimit import _get_rate_limiter
+from mytext.providers import _estimate_prompt_tokens
+from mytext.functions import _build_prompt
+from mytext.params import FREE_TIER_RATE_LIMITS
+
+TEST_CASE_NAME = "Rate limiter tests"
+
+
+def test_rate_limiter_validation():
+    with pytest.raises(MyTextValidationError, match="must be positive numbers or None"):
+        RateLimiter(requests_per_minute=0)
+    with pytest.raises(MyTextValidationError, match="must be positive numbers or None"):
+        RateLimiter(tokens_per_minute="100")
+    with pytest.raises(MyTextValidationError, match="must be positive numbers or None"):
+        configure_rate_limiter(Provider.GROQ, requests_per_minute=True)
+
+
+def test_rate_limiter_request_bucket():
+    limiter = RateLimiter(requests_per_minute=60)
+    for _ in range(60):
+        assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(1, abs=0.01)
+    assert limiter.reserve() == pytest.approx(2, abs=0.01)
+
+
+def test_rate_limiter_max_delay():
+    limiter = RateLimiter(requests_per_minute=1)
+    assert limiter.reserve(max_delay=5) == 0
+    assert limiter.reserve(max_delay=5) is None
+    assert limiter.reserve(max_delay=0) is None
+    assert limiter.reserve(max_delay=120) == pytest.approx(60, abs=0.01)
+    assert limiter.reserve() == pytest.approx(120, abs=0.01)
+
+
+def test_rate_limiter_token_bucket():
+    limiter = RateLimiter(tokens_per_minute=600)
+    assert limiter.reserve(500) == 0
+    assert limiter.reserve(200) == pytest.approx(10, abs=0.01)
+    assert limiter.reserve(10000) == pytest.approx(70, abs=0.01)
+
+
+def test_rate_limiter_unlimited():
+    limiter = RateLimiter()
+    for _ in range(1000):
+        assert limiter.reserve(10000) == 0
+
+
+def test_rate_limiter_refill():
+    limiter = RateLimiter(requests_per_minute=60)
+    with patch("time.monotonic", return_value=1000.0):
+        limiter._buckets[0][0].updated_at = 1000.0
+        for _ in range(60):
+            limiter.reserve()
+        assert limiter.reserve() == pytest.approx(1)
+    with patch("time.monotonic", return_value=1030.0):
+        assert limiter.reserve() == 0
+
+
+def test_rate_limiter_throttle():
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.throttle(5)
+    assert limiter.reserve() == pytest.approx(5, abs=0.01)
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.throttle()
+    assert limiter.reserve() == pytest.approx(1, abs=0.01)
+    limiter = RateLimiter()
+    limiter.throttle(3)
+    assert limiter.reserve() == pytest.approx(3, abs=0.01)
+
+
+def test_rate_limiter_threads():
+    limiter = RateLimiter(requests_per_minute=60)
+    delays = []
+    lock = threading.Lock()
+
+    def reserve():
+        delay = limiter.reserve()
+        with lock:
+            delays.append(delay)
+
+    threads = [threading.Thread(target=reserve) for _ in range(70)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(1 for delay in delays if delay == 0) == 60
+    assert max(delays) == pytest.approx(10, abs=0.05)
+
+
+@patch("time.sleep")
+def test_rate_limiter_acquire(mock_sleep):
+    limiter = RateLimiter(requests_per_minute=1)
+    limiter.acquire()
+    mock_sleep.assert_not_called()
+    limiter.acquire()
+    assert mock_sleep.call_args[0][0] == pytest.approx(60, abs=0.01)
+
+
+def test_rate_limiter_aacquire():
+    limiter = RateLimiter(requests_per_minute=1)
+    with patch("asyncio.sleep") as mock_sleep:
+        asyncio.run(limiter.aacquire())
+        mock_sleep.assert_not_called()
+
+
+def test_estimate_prompt_tokens():
+    prompt = _build_prompt("hello " * 100, Mode.GRAMMAR, Tone.NEUTRAL)
+    rendered_tokens = (len(prompt.render()) + len(prompt.message)) / 4
+    with patch("memor.Prompt.render", side_effect=AssertionError):
+        assert _estimate_prompt_tokens(prompt, RateLimiter(requests_per_minute=10)) == 0
+        tokens = _estimate_prompt_tokens(prompt, RateLimiter(tokens_per_minute=1000))
+    assert rendered_tokens <= tokens <= rendered_tokens + 20
+
+
+def test_rate_limiter_registry():
+    groq_limiter = _get_rate_limiter(Provider.GROQ, "KEY1")
+    assert _get_rate_limiter(Provider.GROQ, "KEY1") is groq_limiter
+    assert _get_rate_limiter(Provider.GROQ, "KEY2") is not groq_limiter
+    assert (groq_limiter.requests_per_minute, groq_limiter.tokens_per_minute) == (None, None)
+    enable_free_tier_rate_limits(Provider.GROQ)
+    limiter = _get_rate_limiter(Provider.GROQ, "KEY1")
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == FREE_TIER_RATE_LIMITS[Provider.GROQ]
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=10, tokens_per_minute=100)
+    limiter = _get_rate_limiter(Provider.GROQ, "KEY1")
+    assert limiter is not groq_limiter
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == (10, 100)
+    configure_rate_limiter()
+    limiter = _get_rate_limiter(Provider.NVIDIA, "KEY1")
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == (None, None)
+    enable_free_tier_rate_limits()
+    limiter = _get_rate_limiter(Provider.NVIDIA, "KEY1")
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == FREE_TIER_RATE_LIMITS[Provider.NVIDIA]
+    reset_rate_limiters()
+    limiter = _get_rate_limiter(Provider.GROQ, "KEY1")
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == (None, None)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_rate_limited(mock_post, mock_sleep):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=2)
+    for _ in range(2):
+        assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)["status"]
+    mock_sleep.assert_not_called()
+    assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)["status"]
+    assert mock_sleep.call_args[0][0] == pytest.approx(30, abs=0.1)
+    mock_sleep.reset_mock()
+    assert run_mytext(text="hello", auth={"api_key": "OTHER_KEY"}, provider=Provider.GROQ)["status"]
+    mock_sleep.assert_not_called()
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_rate_limited(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=1)
+    sleep_calls = []
+
+    async def fake_sleep(delay):
+        sleep_calls.append(delay)
+
+    async def run():
+        return [await arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ) for _ in range(2)]
+
+    with patch("asyncio.sleep", side_effect=fake_sleep):
+        results = asyncio.run(run())
+    assert all(result["status"] for result in results)
+    assert len(sleep_calls) == 1
+    assert sleep_calls[0] == pytest.approx(60, abs=0.1)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_rate_limited_timeout(mock_post, mock_sleep):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=1)
+    assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)["status"]
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=5)
+    assert not result["status"]
+    assert result["message"] == "Timeout budget exhausted before the request completed."
+    mock_sleep.assert_not_called()
+    assert mock_post.call_count == 1
+    assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=300)["status"]
+    assert mock_sleep.call_args[0][0] == pytest.approx(60, abs=0.1)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_abandoned_retry_keeps_quota(mock_post, mock_sleep):
+    failed_response = MagicMock()
+    failed_response.status_code = 503
+    failed_response.text = "Service Unavailable"
+    failed_response.headers = {}
+    mock_post.return_value = failed_response
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=1)
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(max_retries=3, retry_delay=0.01),
+        timeout=5)
+    assert "Service Unavailable" in result["message"]
+    assert mock_post.call_count == 1
+    mock_sleep.assert_not_called()
+    limiter = _get_rate_limiter(Provider.GROQ, "KEY")
+    assert limiter.reserve() == pytest.approx(60, abs=0.1)
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_rate_limited_timeout(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=1)
+    sleep_calls = []
+
+    async def fake_sleep(delay):
+        sleep_calls.append(delay)
+
+    async def run():
+        return [await arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=5)
+                for _ in range(2)]
+
+    with patch("asyncio.sleep", side_effect=fake_sleep):
+        results = asyncio.run(run())
+    assert results[0]["status"]
+    assert results[1]["message"] == "Timeout budget exhausted before the request completed."
+    assert not sleep_calls
+    assert mock_post.call_count == 1
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_throttled_by_provider(mock_post, mock_sleep):
+    throttled_response = MagicMock()
+    throttled_response.status_code = 429
+    throttled_response.text = "Too Many Requests"
+    throttled_response.headers = {}
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.side_effect = [throttled_response, success_response]
+    enable_free_tier_rate_limits(Provider.GROQ)
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert result["status"]
+    assert mock_sleep.call_count == 1
+    assert mock_sleep.call_args[0][0] == pytest.approx(60 / FREE_TIER_RATE_LIMITS[Provider.GROQ][0], abs=0.1)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch, MagicMock
+import email.utils
+import time
+import pytest
+import requests
+from mytext import Provider
+from mytext import run_mytext
+from mytext import RetryPolicy, configure_rate_limiter
+from mytext import MyTextProviderError, MyTextValidationError
+from mytext.providers import _parse_retry_after
+from mytext.params import DEFAULT_MAX_RETRY_DELAY
+
+TEST_CASE_NAME = "Retry tests"
+
+
+def test_retry_policy_classification():
+    policy = RetryPolicy()
+    assert policy.is_retryable(MyTextProviderError("error", status_code=500))
+    assert policy.is_retryable(MyTextProviderError("error", status_code=429))
+    assert policy.is_retryable(MyTextProviderError("error"))
+    assert policy.is_retryable(requests.ConnectionError("error"))
+    assert not policy.is_retryable(MyTextProviderError("error", status_code=400))
+    assert not policy.is_retryable(MyTextProviderError("error", status_code=401))
+    assert not policy.is_retryable(KeyError("choices"))
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(max_retries=4, retry_delay=1, backoff_factor=2, max_delay=3)
+    error = MyTextProviderError("error", status_code=503)
+    for retry_index, upper_bound in [(1, 1), (2, 2), (3, 3)]:
+        delay = policy.get_delay(retry_index, error)
+        assert 0 <= delay <= upper_bound
+    assert policy.get_delay(4, error) is None
+    policy = RetryPolicy(retry_delay=1, backoff_factor=2, jitter=False)
+    assert policy.get_delay(1, error) == 1
+    assert policy.get_delay(2, error) == 2
+
+
+def test_retry_policy_retry_after():
+    policy = RetryPolicy(max_delay=10)
+    assert policy.get_delay(1, MyTextProviderError("error", status_code=429, retry_after=7)) == 7
+    assert policy.get_delay(1, MyTextProviderError("error", status_code=429, retry_after=60)) == 10
+    assert RetryPolicy(max_delay=10, deadline=5).get_delay(
+        1, MyTextProviderError("error", status_code=429, retry_after=60)) is None
+
+
+def test_retry_policy_deadline():
+    policy = RetryPolicy(retry_delay=1, jitter=False, deadline=2)
+    error = MyTextProviderError("error", status_code=503)
+    assert policy.get_delay(1, error, elapsed=0.5) == 1
+    assert policy.get_delay(1, error, elapsed=1.5) is None
+
+
+def test_retry_policy_invalid():
+    with pytest.raises(MyTextValidationError, match="`max_retries` must be a positive integer."):
+        RetryPolicy(max_retries=0)
+    with pytest.raises(MyTextValidationError, match="must be non-negative numbers"):
+        RetryPolicy(retry_delay=-1)
+    with pytest.raises(MyTextValidationError, match="`backoff_factor` must be"):
+        RetryPolicy(backoff_factor=0.5)
+    with pytest.raises(MyTextValidationError, match="`deadline` must be"):
+        RetryPolicy(deadline=0)
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after("3") == 3
+    assert _parse_retry_after(" 1.5 ") == 1.5
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("invalid") is None
+    future_date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 < _parse_retry_after(future_date) <= 30
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_non_retryable_status_fails_fast(mock_post, mock_sleep):
+    mock_response = MagicMock()
+    mock_response.status_code = 401
+    mock_response.text = "Unauthorized"
+    mock_post.return_value = mock_response
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert not result["status"]
+    assert mock_post.call_count == 1
+    assert mock_sleep.call_count == 0
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_retry_after_header_honoured(mock_post, mock_sleep):
+    throttled_response = MagicMock()
+    throttled_response.status_code = 429
+    throttled_response.text = "Too Many Requests"
+    throttled_response.headers = {"Retry-After": "2"}
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.side_effect = [throttled_response, success_response]
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert result["status"]
+    mock_sleep.assert_called_once_with(2)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_retry_after_header_above_max_delay(mock_post, mock_sleep):
+    throttled_response = MagicMock()
+    throttled_response.status_code = 429
+    throttled_response.text = "Too Many Requests"
+    throttled_response.headers = {"Retry-After": "60"}
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.side_effect = [throttled_response, success_response]
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert result["status"]
+    assert mock_post.call_count == 2
+    mock_sleep.assert_called_once_with(DEFAULT_MAX_RETRY_DELAY)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_retry_after_header_within_deadline(mock_post, mock_sleep):
+    throttled_response = MagicMock()
+    throttled_response.status_code = 429
+    throttled_response.text = "Too Many Requests"
+    throttled_response.headers = {"Retry-After": "60"}
+    success_response = MagicMock()
+    success_response.status_code = 200
+    success_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.side_effect = [throttled_response, success_response]
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(deadline=45))
+    assert result["status"]
+    mock_sleep.assert_called_once_with(DEFAULT_MAX_RETRY_DELAY)
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_retry_deadline_includes_rate_limit_wait(mock_post, mock_sleep):
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=1)
+    throttled_response = MagicMock()
+    throttled_response.status_code = 429
+    throttled_response.text = "Too Many Requests"
+    throttled_response.headers = {"Retry-After": "2"}
+    mock_post.return_value = throttled_response
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(deadline=45))
+    assert not result["status"]
+    assert mock_post.call_count == 1
+    assert mock_sleep.call_count == 0
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_custom_retry_policy(mock_post, mock_sleep):
+    mock_response = MagicMock()
+    mock_response.status_code = 503
+    mock_response.text = "Unavailable"
+    mock_post.return_value = mock_response
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(max_retries=2))
+    assert not result["status"]
+    assert mock_post.call_count == 2
+    assert mock_sleep.call_count == 1
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch, MagicMock
+import json
+import pytest
+from mytext import Provider, Strategy
+from mytext import ProviderRouter
+from mytext import run_mytext_auto, MemoryCache
+from mytext import MyTextValidationError
+from mytext.cli import main
+
+TEST_CASE_NAME = "Routing tests"
+
+
+def test_router_ewma():
+    router = ProviderRouter(alpha=0.5)
+    router.record(Provider.GROQ, None, 1.0, True)
+    router.record(Provider.GROQ, None, 3.0, False)
+    stats = router.get_stats(Provider.GROQ)
+    assert stats["latency"] == 2.0
+    assert stats["success_rate"] == 0.5
+    assert stats["count"] == 2
+    assert router.get_stats(Provider.GROQ, "openai/gpt-oss-20b") == stats
+    assert router.get_stats(Provider.GROQ, "other-model") is None
+
+
+def test_router_order():
+    router = ProviderRouter(exploration_rate=0)
+    router.record(Provider.AI_STUDIO, None, 2.0, True)
+    router.record(Provider.GROQ, None, 0.5, True)
+    router.record(Provider.CEREBRAS, None, 0.1, False)
+    providers = [Provider.AI_STUDIO, Provider.CLOUDFLARE, Provider.CEREBRAS, Provider.GROQ, Provider.NVIDIA]
+    assert router.order(providers) == [
+        Provider.GROQ, Provider.AI_STUDIO, Provider.CEREBRAS, Provider.CLOUDFLARE, Provider.NVIDIA]
+    assert router.order(providers, {Provider.GROQ: "other-model"})[0] == Provider.AI_STUDIO
+
+
+def test_router_exploration():
+    router = ProviderRouter(exploration_rate=1)
+    providers = [Provider.AI_STUDIO, Provider.GROQ, Provider.NVIDIA]
+    for _ in range(10):
+        ordered = router.order(providers)
+        assert ordered[0] != Provider.AI_STUDIO
+        assert sorted(ordered, key=lambda x: x.value) == sorted(providers, key=lambda x: x.value)
+
+
+def test_router_save_load(tmp_path):
+    path = str(tmp_path / "state" / "routing.json")
+    router = ProviderRouter()
+    router.record(Provider.GROQ, None, 0.5, True)
+    router.save(path)
+    loaded_router = ProviderRouter()
+    loaded_router.load(path)
+    assert loaded_router.to_dict() == router.to_dict()
+    with open(path, "w") as file:
+        json.dump({"groq|m": {"latency": "bad"}, "nvidia|m": {"latency": 1, "success_rate": 1, "count": 1}}, file)
+    loaded_router = ProviderRouter()
+    loaded_router.load(path)
+    assert list(loaded_router.to_dict()) == ["nvidia|m"]
+    loaded_router = ProviderRouter()
+    loaded_router.load(str(tmp_path / "missing.json"))
+    assert loaded_router.to_dict() == {}
+
+
+def test_router_invalid():
+    with pytest.raises(MyTextValidationError, match="`alpha` must be a number in"):
+        ProviderRouter(alpha=0)
+    with pytest.raises(MyTextValidationError, match="`exploration_rate` must be a number in"):
+        ProviderRouter(exploration_rate=2)
+    result = run_mytext_auto(text="hello", auth_map={}, router="router")
+    assert result["message"] == "`router` must be an instance of ProviderRouter or None."
+
+
+@patch("mytext.functions.run_mytext")
+def test_run_mytext_auto_router(mock_run):
+    mock_run.return_value = {"status": True, "message": "OK!", "model": "m", "timing": {"attempts": [0.1]}}
+    router = ProviderRouter(exploration_rate=0)
+    router.record(Provider.NVIDIA, None, 0.1, True)
+    auth_map = {Provider.GROQ: {"api_key": "KEY"}, Provider.NVIDIA: {"api_key": "KEY"}}
+    result = run_mytext_auto(text="hello", auth_map=auth_map, strategy=Strategy.SEQUENTIAL, router=router)
+    assert result["provider"] == "nvidia"
+    assert router.get_stats(Provider.NVIDIA)["count"] == 2
+    assert router.get_stats(Provider.GROQ) is None
+    assert "timing" not in result
+
+
+@patch("requests.Session.post")
+def test_run_mytext_auto_router_skips_cache_hits(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    router = ProviderRouter(exploration_rate=0)
+    cache = MemoryCache()
+    auth_map = {Provider.GROQ: {"api_key": "KEY"}}
+    for _ in range(3):
+        result = run_mytext_auto(text="hello", auth_map=auth_map, cache=cache, router=router)
+        assert result["status"]
+    assert mock_post.call_count == 1
+    assert router.get_stats(Provider.GROQ)["count"] == 1
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.functions.run_mytext")
+def test_cli_routing_file(mock_run, mock_env, tmp_path, capsys):
+    path = str(tmp_path / "routing.json")
+    router = ProviderRouter()
+    router.record(Provider.NVIDIA, None, 0.1, True)
+    router.record(Provider.GROQ, None, 5.0, True)
+    router.save(path)
+    mock_env.return_value = {Provider.GROQ: {"api_key": "x"}, Provider.NVIDIA: {"api_key": "y"}}
+    mock_run.return_value = {"status": True, "message": "DONE", "model": "m", "timing": {"attempts": [0.1]}}
+    with patch("random.random", return_value=1.0):
+        with patch("sys.argv", ["mytext", "--text", "hello", "--routing-file", path]):
+            main()
+    _, kwargs = mock_run.call_args
+    assert kwargs["provider"] == Provider.NVIDIA
+    loaded_router = ProviderRouter()
+    loaded_router.load(path)
+    assert loaded_router.get_stats(Provider.NVIDIA)["count"] == 2
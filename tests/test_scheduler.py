@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+from unittest.mock import patch, MagicMock
+import pytest
+from mytext import Scheduler, Priority, Provider, Mode
+from mytext import MyTextQueueFullError, MyTextValidationError
+
+TEST_CASE_NAME = "Scheduler tests"
+
+
+class BlockingRun:
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+        self.timeouts = []
+        self.lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        with self.lock:
+            self.calls.append(kwargs["text"])
+            self.timeouts.append(kwargs.get("timeout"))
+        if kwargs["text"] == "blocker":
+            self.started.set()
+            self.release.wait(10)
+        return {"status": True, "message": kwargs["text"].upper(), "model": "m"}
+
+
+def _build_response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "Error"
+    response.headers = {}
+    response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    return response
+
+
+@patch("requests.Session.post")
+def test_submit(mock_post):
+    mock_post.return_value = _build_response(200)
+    with Scheduler() as scheduler:
+        future = scheduler.submit("hello", {"api_key": "KEY"}, provider=Provider.GROQ, mode=Mode.GRAMMAR, model="m")
+        assert future.result(10) == {"status": True, "message": "OK!", "model": "m"}
+    assert len(scheduler) == 0
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_priority_order(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    with Scheduler(default_workers=1) as scheduler:
+        blocker = scheduler.submit("blocker", {}, provider=Provider.GROQ)
+        assert run.started.wait(10)
+        futures = [
+            scheduler.submit("batch", {}, provider=Provider.GROQ, priority=Priority.BATCH),
+            scheduler.submit("normal", {}, provider=Provider.GROQ),
+            scheduler.submit("late", {}, provider=Provider.GROQ, priority=Priority.INTERACTIVE, deadline=60),
+            scheduler.submit("soon", {}, provider=Provider.GROQ, priority=Priority.INTERACTIVE, deadline=30),
+            scheduler.submit("first", {}, provider=Provider.GROQ, priority=Priority.INTERACTIVE)]
+        assert len(scheduler) == 5
+        run.release.set()
+        assert blocker.result(10)["message"] == "BLOCKER"
+        assert [future.result(10)["message"] for future in futures] == ["BATCH", "NORMAL", "LATE", "SOON", "FIRST"]
+    assert run.calls == ["blocker", "soon", "late", "first", "normal", "batch"]
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_per_provider_workers(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    with Scheduler(workers={Provider.GROQ: 1}, default_workers=2) as scheduler:
+        scheduler.submit("blocker", {}, provider=Provider.GROQ)
+        assert run.started.wait(10)
+        future = scheduler.submit("other", {}, provider=Provider.CEREBRAS)
+        assert future.result(10)["message"] == "OTHER"
+        assert len(scheduler._threads[Provider.GROQ]) == 1
+        assert len(scheduler._threads[Provider.CEREBRAS]) == 2
+        run.release.set()
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_backpressure(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    scheduler = Scheduler(queue_size=1, default_workers=1)
+    scheduler.submit("blocker", {}, provider=Provider.GROQ)
+    assert run.started.wait(10)
+    queued = scheduler.submit("queued", {}, provider=Provider.GROQ)
+    with pytest.raises(MyTextQueueFullError, match="Scheduler queue is full."):
+        scheduler.submit("rejected", {}, provider=Provider.GROQ, block=False)
+    with pytest.raises(MyTextQueueFullError, match="Scheduler queue is full."):
+        scheduler.submit("rejected", {}, provider=Provider.GROQ, block_timeout=0.05)
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(scheduler.submit("waiting", {}, provider=Provider.GROQ)))
+    waiter.start()
+    time.sleep(0.05)
+    assert not results
+    run.release.set()
+    waiter.join(10)
+    assert queued.result(10)["message"] == "QUEUED"
+    assert results[0].result(10)["message"] == "WAITING"
+    scheduler.shutdown()
+    assert "rejected" not in run.calls
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_cancel(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    scheduler = Scheduler(queue_size=1, default_workers=1)
+    scheduler.submit("blocker", {}, provider=Provider.GROQ)
+    assert run.started.wait(10)
+    cancelled = scheduler.submit("cancelled", {}, provider=Provider.GROQ)
+    assert cancelled.cancel()
+    assert len(scheduler) == 0
+    future = scheduler.submit("next", {}, provider=Provider.GROQ, block=False)
+    run.release.set()
+    assert future.result(10)["message"] == "NEXT"
+    scheduler.shutdown()
+    assert run.calls == ["blocker", "next"]
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_deadline_exceeded(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    with Scheduler(default_workers=1) as scheduler:
+        scheduler.submit("blocker", {}, provider=Provider.GROQ)
+        assert run.started.wait(10)
+        expired = scheduler.submit("expired", {}, provider=Provider.GROQ, deadline=0.01)
+        time.sleep(0.05)
+        run.release.set()
+        assert expired.result(10) == {
+            "status": False,
+            "message": "Job deadline exceeded before it started.",
+            "model": "unknown"}
+    assert run.calls == ["blocker"]
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_deadline_timeout(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    with Scheduler(default_workers=1) as scheduler:
+        scheduler.submit("blocker", {}, provider=Provider.GROQ)
+        assert run.started.wait(10)
+        futures = [
+            scheduler.submit("deadline", {}, provider=Provider.GROQ, deadline=30),
+            scheduler.submit("both", {}, provider=Provider.GROQ, deadline=30, timeout=5),
+            scheduler.submit("timeout", {}, provider=Provider.GROQ, timeout=5)]
+        time.sleep(0.05)
+        run.release.set()
+        for future in futures:
+            future.result(10)
+    assert run.calls == ["blocker", "deadline", "both", "timeout"]
+    assert run.timeouts[0] is None
+    assert 29 < run.timeouts[1] < 30
+    assert run.timeouts[2] == 5
+    assert run.timeouts[3] == 5
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_shutdown(mock_run):
+    run = BlockingRun()
+    mock_run.side_effect = run
+    scheduler = Scheduler(default_workers=1)
+    scheduler.submit("blocker", {}, provider=Provider.GROQ)
+    assert run.started.wait(10)
+    pending = scheduler.submit("pending", {}, provider=Provider.GROQ)
+    run.release.set()
+    scheduler.shutdown(cancel_pending=True)
+    assert pending.cancelled() or pending.result()["message"] == "PENDING"
+    with pytest.raises(RuntimeError, match="Cannot submit jobs after the scheduler is shut down."):
+        scheduler.submit("late", {}, provider=Provider.GROQ)
+
+
+@patch("mytext.scheduler.run_mytext")
+def test_job_exception(mock_run):
+    mock_run.side_effect = KeyError("boom")
+    with Scheduler() as scheduler:
+        future = scheduler.submit("hello", {}, provider=Provider.GROQ)
+        with pytest.raises(KeyError):
+            future.result(10)
+
+
+def test_invalid_parameters():
+    with pytest.raises(MyTextValidationError, match="`queue_size` must be a positive integer."):
+        Scheduler(queue_size=0)
+    with pytest.raises(MyTextValidationError, match="`workers` must map Provider enum members to positive integers."):
+        Scheduler(workers={"groq": 1})
+    with pytest.raises(MyTextValidationError, match="`workers` must map Provider enum members to positive integers."):
+        Scheduler(workers={Provider.GROQ: 0})
+    with pytest.raises(MyTextValidationError, match="`workers` must map Provider enum members to positive integers."):
+        Scheduler(default_workers=0)
+    scheduler = Scheduler()
+    with pytest.raises(MyTextValidationError, match="`priority` must be an instance of Priority enum."):
+        scheduler.submit("hello", {}, priority="high")
+    with pytest.raises(MyTextValidationError, match="`deadline` must be a positive number or None."):
+        scheduler.submit("hello", {}, deadline=0)
+    with pytest.raises(MyTextValidationError, match="`block_timeout` must be a positive number or None."):
+        scheduler.submit("hello", {}, block_timeout=-1)
+    scheduler.shutdown()
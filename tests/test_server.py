@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+import pytest
+from mytext import Provider, Mode, Tone, MyTextValidationError, enable_metrics
+from mytext.cli import main, _build_parser, _build_request_processor
+from mytext.server import MyTextServer
+
+TEST_CASE_NAME = "Server tests"
+
+
+def _request(url, data=None, raw=None):
+    body = raw if raw is not None else (json.dumps(data).encode("utf-8") if data is not None else None)
+    request = urllib.request.Request(url, data=body, method="POST" if body is not None else "GET")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, dict(response.headers), response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read().decode("utf-8")
+
+
+class RunningServer:
+    def __init__(self, process, **kwargs):
+        self.server = MyTextServer(process, host="127.0.0.1", port=0, **kwargs)
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.01})
+
+    def __enter__(self):
+        self.thread.start()
+        return self.server
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def _echo(request):
+    if request.get("mode") == "invalid":
+        raise MyTextValidationError("`mode` must be one of: paraphrase")
+    if request["text"] == "crash":
+        raise RuntimeError("boom")
+    return {"status": True, "message": request["text"].upper(), "model": "m"}
+
+
+def test_run_and_batch_endpoints():
+    with RunningServer(_echo) as server:
+        status, _, body = _request(server.url + "/run", {"text": "hello"})
+        assert status == 200
+        assert json.loads(body) == {"status": True, "message": "HELLO", "model": "m"}
+        status, _, body = _request(server.url + "/batch", {"texts": ["a", "crash", "b"], "tone": "formal"})
+        assert status == 200
+        results = json.loads(body)["results"]
+        assert [result["message"] for result in results] == ["A", "boom", "B"]
+        assert not results[1]["status"]
+        status, _, body = _request(server.url + "/run", {"text": "hello", "mode": "invalid"})
+        assert status == 400
+        assert json.loads(body)["message"] == "`mode` must be one of: paraphrase"
+        status, _, body = _request(server.url + "/batch", {"texts": ["a"], "mode": "invalid"})
+        assert status == 200
+        assert json.loads(body)["results"][0]["message"] == "`mode` must be one of: paraphrase"
+        assert server.pending == 0
+
+
+def test_invalid_requests():
+    with RunningServer(_echo) as server:
+        status, _, body = _request(server.url + "/run", raw=b"not json")
+        assert status == 400
+        assert json.loads(body)["message"] == "Request body must be a JSON object."
+        status, _, body = _request(server.url + "/run", {"text": 1})
+        assert status == 400
+        assert json.loads(body)["message"] == "`text` must be a string."
+        status, _, body = _request(server.url + "/batch", {"texts": []})
+        assert status == 400
+        assert json.loads(body)["message"] == "`texts` must be a non-empty list of strings."
+        status, _, _ = _request(server.url + "/other", {"text": "hello"})
+        assert status == 404
+        status, _, _ = _request(server.url + "/other")
+        assert status == 404
+
+
+def test_health_and_metrics_endpoints():
+    with RunningServer(_echo, max_workers=2, queue_size=3) as server:
+        status, _, body = _request(server.url + "/health")
+        assert status == 200
+        assert json.loads(body) == {"status": "ok", "pending": 0, "max_workers": 2, "queue_size": 3}
+        status, headers, body = _request(server.url + "/metrics")
+        assert status == 200
+        assert body == "# EOF\n"
+        registry = enable_metrics()
+        registry.inc("mytext_requests", (("provider", "groq"),))
+        status, headers, body = _request(server.url + "/metrics")
+        assert headers["Content-Type"].startswith("application/openmetrics-text")
+        assert 'mytext_requests_total{provider="groq"} 1' in body
+
+
+def test_queue_full_and_graceful_close():
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(request):
+        started.set()
+        release.wait(10)
+        return {"status": True, "message": request["text"], "model": "m"}
+
+    server = MyTextServer(blocking, host="127.0.0.1", port=0, max_workers=1, queue_size=1)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+    thread.start()
+    responses = []
+    clients = [
+        threading.Thread(target=lambda text=text: responses.append(_request(server.url + "/run", {"text": text})))
+        for text in ("first", "second")]
+    try:
+        clients[0].start()
+        assert started.wait(10)
+        clients[1].start()
+        while server.pending < 2:
+            time.sleep(0.01)
+        status, headers, body = _request(server.url + "/batch", {"texts": ["third"]})
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+        assert json.loads(body)["message"] == "Request queue is full; retry later."
+    finally:
+        server.shutdown()
+        thread.join()
+        release.set()
+        server.server_close()
+    for client in clients:
+        client.join()
+    assert sorted(json.loads(body)["message"] for status, _, body in responses) == ["first", "second"]
+
+
+def test_batch_larger_than_capacity():
+    with RunningServer(_echo, max_workers=2, queue_size=2) as server:
+        status, headers, body = _request(server.url + "/batch", {"texts": ["a", "b", "c", "d", "e"]})
+        assert status == 413
+        assert "Retry-After" not in headers
+        assert json.loads(body)["message"] == "Batch has 5 texts but the server accepts at most 4 at once."
+        status, _, body = _request(server.url + "/batch", {"texts": ["a", "b", "c", "d"]})
+        assert status == 200
+        assert len(json.loads(body)["results"]) == 4
+
+
+def test_invalid_server_parameters():
+    with pytest.raises(MyTextValidationError, match="`max_workers` must be a positive integer."):
+        MyTextServer(_echo, port=0, max_workers=0)
+    with pytest.raises(MyTextValidationError, match="`queue_size` must be a positive integer."):
+        MyTextServer(_echo, port=0, queue_size=0)
+
+
+@patch("mytext.functions.run_mytext")
+def test_request_processor(mock_run):
+    mock_run.return_value = {"status": True, "message": "OK!", "model": "m"}
+    args = _build_parser().parse_args(["serve", "--provider", "groq", "--mode", "grammar"])
+    process = _build_request_processor(args, {Provider.GROQ: {"api_key": "KEY"}}, dict(), None)
+    assert process({"text": "hello", "tone": "FORMAL"})["message"] == "OK!"
+    kwargs = mock_run.call_args.kwargs
+    assert kwargs["provider"] == Provider.GROQ
+    assert kwargs["mode"] == Mode.GRAMMAR
+    assert kwargs["tone"] == Tone.FORMAL
+    process({"text": "hello", "model": "custom"})
+    assert mock_run.call_args.kwargs["model"] == "custom"
+    with pytest.raises(MyTextValidationError, match="`mode` must be one of: paraphrase"):
+        process({"text": "hello", "mode": "unknown"})
+    with pytest.raises(MyTextValidationError, match="`provider` must be one of: ai-studio"):
+        process({"text": "hello", "provider": "unknown"})
+    with pytest.raises(MyTextValidationError, match="`model` must be a string or None."):
+        process({"text": "hello", "model": 1})
+
+
+@patch("mytext.server.serve")
+def test_main_serve(mock_serve):
+    with patch("sys.argv", ["mytext", "serve", "--port", "0", "--queue-size", "5"]):
+        main()
+    kwargs = mock_serve.call_args.kwargs
+    assert kwargs["port"] == 0
+    assert kwargs["max_workers"] == 8
+    assert kwargs["queue_size"] == 5
+
+
+def test_main_serve_invalid_queue_size(capsys):
+    with patch("sys.argv", ["mytext", "serve", "--queue-size", "0"]):
+        with pytest.raises(SystemExit):
+            main()
+    _, err = capsys.readouterr()
+    assert "--queue-size must be a positive integer." in err
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+from unittest.mock import patch, MagicMock, AsyncMock
+import pytest
+import requests
+from mytext import Provider, RetryPolicy
+from mytext import run_mytext, arun_mytext
+from mytext import SessionPool, configure_sessions, close_sessions
+from mytext import MyTextValidationError
+from mytext import sessions
+from mytext.bench import MockProviderServer, _redirect_providers
+
+TEST_CASE_NAME = "Sessions tests"
+
+
+def test_session_pool_reuse_per_host():
+    with SessionPool() as pool:
+        session1 = pool.get("https://api.groq.com/openai/v1/chat/completions")
+        session2 = pool.get("https://api.groq.com/openai/v1/models")
+        session3 = pool.get("https://api.cerebras.ai/v1/chat/completions")
+        assert session1 is session2
+        assert session1 is not session3
+        assert isinstance(session1, requests.Session)
+        assert len(pool) == 2
+    assert len(pool) == 0
+
+
+def test_session_pool_adapter_config():
+    with SessionPool(pool_connections=3, pool_maxsize=7, keep_alive=False) as pool:
+        session = pool.get("https://api.groq.com")
+        adapter = session.get_adapter("https://api.groq.com")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert session.headers["Connection"] == "close"
+
+
+def test_session_pool_invalid_config():
+    with pytest.raises(MyTextValidationError, match="must be positive integers"):
+        SessionPool(pool_maxsize=0)
+    with pytest.raises(MyTextValidationError, match="must be positive integers"):
+        SessionPool(pool_connections="2")
+    with pytest.raises(MyTextValidationError, match="must be a boolean"):
+        SessionPool(keep_alive=1)
+
+
+def test_session_pool_offload_executor():
+    pool = SessionPool(pool_connections=2, pool_maxsize=3)
+    executor = pool.get_offload_executor()
+    assert executor is pool.get_offload_executor()
+    assert executor._max_workers == 6
+    pool.close()
+    assert pool.get_offload_executor() is not executor
+    pool.close()
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_offloads_to_session_pool(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    thread_names = []
+
+    def post(*args, **kwargs):
+        thread_names.append(threading.current_thread().name)
+        return mock_response
+
+    mock_post.side_effect = post
+    result = asyncio.run(arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ))
+    assert result["status"]
+    assert thread_names[0].startswith("mytext-offload")
+
+
+@patch("requests.Session.post")
+def test_shared_session_reused_across_calls(mock_post):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    mock_post.return_value = mock_response
+    close_sessions()
+    for _ in range(3):
+        result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+        assert result["status"]
+    assert len(sessions._SESSION_POOL) == 1
+    close_sessions()
+    assert len(sessions._SESSION_POOL) == 0
+
+
+def test_configure_sessions():
+    old_pool = sessions._SESSION_POOL
+    old_pool.get("https://api.groq.com")
+    configure_sessions(pool_maxsize=20)
+    assert sessions._SESSION_POOL is not old_pool
+    assert sessions._SESSION_POOL._pool_maxsize == 20
+    assert len(old_pool) == 0
+    configure_sessions()
+
+
+def test_session_pool_async_client():
+    httpx = pytest.importorskip("httpx")
+    pool = SessionPool(pool_connections=2, pool_maxsize=3)
+
+    async def get_clients():
+        client = pool.get_async_client()
+        assert client is pool.get_async_client()
+        assert isinstance(client, httpx.AsyncClient)
+        pool.close()
+        await asyncio.sleep(0)
+        return client
+
+    with patch("mytext.sessions._import_httpx", return_value=httpx):
+        client = asyncio.run(get_clients())
+        assert client.is_closed
+        assert asyncio.run(get_clients()) is not client
+    assert pool._executor is None
+
+
+def test_session_pool_async_client_without_httpx():
+    pool = SessionPool()
+
+    async def get_client():
+        return pool.get_async_client()
+
+    assert asyncio.run(get_client()) is None
+
+
+@patch("requests.Session.post", side_effect=AssertionError("blocking client used"))
+def test_arun_mytext_async_client(mock_post):
+    httpx = pytest.importorskip("httpx")
+    configure_sessions()
+    with patch("mytext.sessions._import_httpx", return_value=httpx):
+        with MockProviderServer(latency=0, error_rate=0) as server, _redirect_providers(server.url):
+            result = asyncio.run(arun_mytext(
+                text="hello",
+                auth={"api_key": "KEY"},
+                provider=Provider.GROQ,
+                retry_policy=RetryPolicy(max_retries=1),
+                timing=True))
+    assert result["status"]
+    assert result["timing"]["bytes_sent"] > 0
+    assert result["timing"]["bytes_received"] > 0
+    assert sessions._SESSION_POOL._executor is None
+    mock_post.assert_not_called()
+    configure_sessions()
+
+
+def test_arun_mytext_async_client_transport_error():
+    httpx = pytest.importorskip("httpx")
+    with patch("mytext.sessions._import_httpx", return_value=httpx), \
+            patch("httpx.AsyncClient.post", new_callable=AsyncMock, side_effect=httpx.ConnectError("refused")) as mock_post:
+        result = asyncio.run(arun_mytext(
+            text="hello",
+            auth={"api_key": "KEY"},
+            provider=Provider.GROQ,
+            retry_policy=RetryPolicy(max_retries=2, retry_delay=0)))
+    assert not result["status"]
+    assert "refused" in result["message"]
+    assert mock_post.call_count == 2
+    configure_sessions()
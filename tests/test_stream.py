@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch, MagicMock
+import json
+import pytest
+from mytext import Provider, enable_metrics
+from mytext import run_mytext_stream
+from mytext import MyTextProviderError, MyTextValidationError
+from mytext.cli import main
+
+TEST_CASE_NAME = "Stream tests"
+
+
+def _stream_response(events):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    lines = []
+    for event in events:
+        lines.append("data: " + (event if isinstance(event, str) else json.dumps(event)))
+        lines.append("")
+    mock_response.iter_lines.return_value = iter(lines)
+    return mock_response
+
+
+def _openai_events(*chunks):
+    events = [{"choices": [{"delta": {"role": "assistant"}}]}]
+    events.extend({"choices": [{"delta": {"content": chunk}}]} for chunk in chunks)
+    events.append("[DONE]")
+    return events
+
+
+@pytest.mark.parametrize("provider", [
+    Provider.GROQ, Provider.CEREBRAS, Provider.NVIDIA, Provider.OPENROUTER, Provider.GITHUB])
+@patch("requests.Session.post")
+def test_run_mytext_stream_openai_compatible(mock_post, provider):
+    mock_post.return_value = _stream_response(_openai_events("Hel", "lo", "!"))
+    chunks = list(run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=provider))
+    assert chunks == ["Hel", "lo", "!"]
+    _, kwargs = mock_post.call_args
+    assert kwargs["json"]["stream"]
+    assert kwargs["stream"]
+    mock_post.return_value.close.assert_called()
+
+
+@patch("requests.Session.post")
+def test_run_mytext_stream_ai_studio(mock_post):
+    mock_post.return_value = _stream_response([
+        {"candidates": [{"content": {"parts": [{"text": "OK"}]}}]},
+        {"candidates": [{"content": {"parts": [{"text": "!"}]}}]},
+    ])
+    chunks = list(run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=Provider.AI_STUDIO))
+    assert chunks == ["OK", "!"]
+    args, _ = mock_post.call_args
+    assert ":streamGenerateContent?alt=sse" in args[0]
+
+
+@patch("requests.Session.post")
+def test_run_mytext_stream_cloudflare(mock_post):
+    mock_post.return_value = _stream_response([{"response": "OK"}, {"response": "2"}, "[DONE]"])
+    chunks = list(run_mytext_stream(
+        text="hello",
+        auth={"api_key": "KEY", "account_id": "ACC"},
+        provider=Provider.CLOUDFLARE))
+    assert chunks == ["OK", "2"]
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_stream_retry_before_first_chunk(mock_post, mock_sleep):
+    fail_response = MagicMock()
+    fail_response.status_code = 503
+    fail_response.text = "Unavailable"
+    mock_post.side_effect = [fail_response, _stream_response(_openai_events("OK"))]
+    chunks = list(run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ))
+    assert chunks == ["OK"]
+    assert mock_sleep.call_count == 1
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_run_mytext_stream_shares_attempt_state(mock_post, mock_sleep):
+    registry = enable_metrics()
+    fail_response = MagicMock()
+    fail_response.status_code = 429
+    fail_response.text = "Too Many Requests"
+    fail_response.headers = {}
+    mock_post.side_effect = [fail_response, _stream_response(_openai_events("OK"))]
+    chunks = list(run_mytext_stream(
+        text="hello",
+        auth={"api_key": ["KEY1", "KEY2"]},
+        provider=Provider.GROQ,
+        model="m"))
+    assert chunks == ["OK"]
+    mock_sleep.assert_called_once_with(0)
+    assert mock_post.call_args_list[1][1]["headers"]["Authorization"] == "Bearer KEY2"
+    assert registry.get("mytext_provider_attempts", provider="groq", model="m") == 2
+    assert registry.get("mytext_provider_errors", provider="groq", model="m", status_code="429") == 1
+
+
+@patch("requests.Session.post")
+def test_run_mytext_stream_failure(mock_post):
+    fail_response = MagicMock()
+    fail_response.status_code = 401
+    fail_response.text = "Unauthorized"
+    mock_post.return_value = fail_response
+    with pytest.raises(MyTextProviderError, match="Unauthorized"):
+        list(run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ))
+    with pytest.raises(MyTextValidationError, match="`text` must be a string."):
+        list(run_mytext_stream(text=1, auth={"api_key": "KEY"}, provider=Provider.GROQ))
+
+
+@patch("time.monotonic")
+@patch("requests.Session.post")
+def test_run_mytext_stream_timeout(mock_post, mock_monotonic):
+    mock_monotonic.return_value = 0
+    mock_post.return_value = _stream_response(_openai_events("Hel", "lo"))
+    chunks = list(run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=5))
+    assert chunks == ["Hel", "lo"]
+    _, kwargs = mock_post.call_args
+    assert kwargs["timeout"] == 5
+    mock_post.return_value = _stream_response(_openai_events("Hel", "lo"))
+    stream = run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=5)
+    assert next(stream) == "Hel"
+    mock_monotonic.return_value = 6
+    with pytest.raises(MyTextProviderError, match="Timeout budget exhausted"):
+        next(stream)
+    with pytest.raises(MyTextValidationError, match="`timeout` must be a positive number or None."):
+        list(run_mytext_stream(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, timeout=0))
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.cli.run_mytext_stream")
+def test_cli_stream_timeout(mock_stream, mock_env, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "y"}}
+    mock_stream.return_value = iter(["RESULT"])
+    with patch("sys.argv", ["mytext", "--text", "hello", "--stream", "--provider", "groq", "--timeout", "10"]):
+        main()
+    out, _ = capsys.readouterr()
+    assert "RESULT" in out
+    _, kwargs = mock_stream.call_args
+    assert 0 < kwargs["timeout"] <= 10
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.cli.run_mytext_stream")
+def test_cli_stream(mock_stream, mock_env, capsys):
+    mock_env.return_value = {Provider.AI_STUDIO: {"api_key": "x"}, Provider.GROQ: {"api_key": "y"}}
+
+    def fake_stream(auth, text, mode, tone, provider, model, timeout):
+        if provider == Provider.AI_STUDIO:
+            raise MyTextProviderError("ERR")
+        yield " STREAMED"
+        yield " RESULT"
+
+    mock_stream.side_effect = fake_stream
+    with patch("sys.argv", ["mytext", "--text", "hello", "--stream"]):
+        main()
+    out, _ = capsys.readouterr()
+    assert "STREAMED RESULT" in out
+    assert "No provider succeeded" not in out
+
+
+@patch("mytext.cli._load_auth_from_env")
+@patch("mytext.cli.run_mytext_stream")
+def test_cli_stream_failure(mock_stream, mock_env, capsys):
+    mock_env.return_value = {Provider.GROQ: {"api_key": "y"}}
+
+    def fake_stream(auth, text, mode, tone, provider, model, timeout):
+        yield "PARTIAL"
+        raise MyTextProviderError("ERR")
+
+    mock_stream.side_effect = fake_stream
+    with patch("sys.argv", ["mytext", "--text", "hello", "--stream"]):
+        main()
+    out, _ = capsys.readouterr()
+    assert "PARTIAL" in out
+    assert "No provider succeeded" in out
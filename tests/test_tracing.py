@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import json
+import asyncio
+from unittest.mock import patch, MagicMock
+import pytest
+from mytext import run_mytext, arun_mytext, run_mytext_stream, Provider, RetryPolicy, configure_rate_limiter
+from mytext import configure_tracing, reset_tracing
+from mytext import MyTextValidationError
+from mytext.tracing import _span, _NOOP_SPAN
+
+TEST_CASE_NAME = "Tracing tests"
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, name, attributes):
+        self.events.append(("start", name, attributes))
+        return name
+
+    def on_end(self, span, error):
+        self.events.append(("end", span, error))
+
+    def names(self, kind="start"):
+        return [event[1] for event in self.events if event[0] == kind]
+
+
+def _build_response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "Error"
+    response.headers = {}
+    response.json.return_value = {"choices": [{"message": {"content": "OK!"}}]}
+    return response
+
+
+def test_span_disabled():
+    assert _span("mytext.run", provider=Provider.GROQ) is _NOOP_SPAN
+
+
+@patch("requests.Session.post")
+def test_run_mytext_spans(mock_post):
+    mock_post.return_value = _build_response(200)
+    recorder = Recorder()
+    configure_tracing(recorder.on_start, recorder.on_end)
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ, model="m")
+    assert result["status"]
+    assert recorder.names() == [
+        "mytext.run",
+        "mytext.validate",
+        "mytext.cache_lookup",
+        "mytext.build_prompt",
+        "mytext.attempt",
+        "mytext.render",
+        "mytext.http",
+        "mytext.parse"]
+    assert recorder.names("end")[-2:] == ["mytext.attempt", "mytext.run"]
+    assert recorder.events[0][2] == {"provider": "groq", "mode": "paraphrase", "tone": "neutral"}
+    attempt = [event for event in recorder.events if event[1] == "mytext.attempt"][0]
+    assert attempt[2] == {"provider": "groq", "model": "m", "attempt": 1}
+    assert all(event[2] is None for event in recorder.events if event[0] == "end")
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_retry_spans(mock_post, mock_sleep):
+    mock_post.side_effect = [_build_response(503), _build_response(200)]
+    recorder = Recorder()
+    configure_tracing(recorder.on_start, recorder.on_end)
+    result = run_mytext(
+        text="hello",
+        auth={"api_key": "KEY"},
+        provider=Provider.GROQ,
+        retry_policy=RetryPolicy(max_retries=3, retry_delay=0.25, jitter=False))
+    assert result["status"]
+    attempts = [event for event in recorder.events if event[0] == "start" and event[1] == "mytext.attempt"]
+    assert [event[2]["attempt"] for event in attempts] == [1, 2]
+    backoff = [event for event in recorder.events if event[0] == "start" and event[1] == "mytext.backoff"]
+    assert backoff[0][2] == {"delay": 0.25}
+    errors = [event[2] for event in recorder.events if event[0] == "end" and event[1] == "mytext.attempt"]
+    assert errors[0] is not None and errors[0].status_code == 503
+    assert errors[1] is None
+
+
+@patch("time.sleep")
+@patch("requests.Session.post")
+def test_rate_limit_span(mock_post, mock_sleep):
+    mock_post.return_value = _build_response(200)
+    configure_rate_limiter(Provider.GROQ, requests_per_minute=1)
+    recorder = Recorder()
+    configure_tracing(recorder.on_start, recorder.on_end)
+    assert run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)["status"]
+    assert "mytext.rate_limit" not in recorder.names()
+    assert run_mytext(text="bye", auth={"api_key": "KEY"}, provider=Provider.GROQ)["status"]
+    waits = [event for event in recorder.events if event[0] == "start" and event[1] == "mytext.rate_limit"]
+    assert len(waits) == 1
+    assert 59 < waits[0][2]["delay"] <= 60
+    names = recorder.names()
+    assert names[names.index("mytext.rate_limit") + 1] == "mytext.attempt"
+    mock_sleep.assert_called_once_with(waits[0][2]["delay"])
+
+
+@patch("requests.Session.post")
+def test_arun_mytext_spans(mock_post):
+    mock_post.return_value = _build_response(200)
+    recorder = Recorder()
+    configure_tracing(recorder.on_start, recorder.on_end)
+    result = asyncio.run(arun_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ))
+    assert result["status"]
+    assert "mytext.attempt" in recorder.names()
+    assert "mytext.http" in recorder.names()
+    assert recorder.names("end")[-1] == "mytext.run"
+
+
+@pytest.mark.parametrize("provider, auth, event", [
+    (Provider.GROQ, {"api_key": "KEY"}, {"choices": [{"delta": {"content": "OK!"}}]}),
+    (Provider.AI_STUDIO, {"api_key": "KEY"}, {"candidates": [{"content": {"parts": [{"text": "OK!"}]}}]}),
+    (Provider.CLOUDFLARE, {"api_key": "KEY", "account_id": "ACC"}, {"response": "OK!"}),
+])
+@patch("requests.Session.post")
+def test_run_mytext_stream_spans(mock_post, provider, auth, event):
+    mock_post.return_value = _build_response(200)
+    mock_post.return_value.iter_lines.return_value = iter(["data: " + json.dumps(event), ""])
+    recorder = Recorder()
+    configure_tracing(recorder.on_start, recorder.on_end)
+    assert list(run_mytext_stream(text="hello", auth=auth, provider=provider)) == ["OK!"]
+    names = recorder.names()
+    assert names[names.index("mytext.attempt") + 1:] == ["mytext.render", "mytext.http"]
+    assert recorder.names("end")[-1] == "mytext.attempt"
+
+
+@patch("requests.Session.post")
+def test_failing_hooks_ignored(mock_post):
+    mock_post.return_value = _build_response(200)
+
+    def on_start(name, attributes):
+        raise RuntimeError("tracer down")
+
+    def on_end(span, error):
+        raise RuntimeError("tracer down")
+
+    configure_tracing(on_start, on_end)
+    result = run_mytext(text="hello", auth={"api_key": "KEY"}, provider=Provider.GROQ)
+    assert result["status"]
+    assert result["message"] == "OK!"
+
+
+def test_configure_tracing_invalid():
+    with pytest.raises(MyTextValidationError, match="`on_start` and `on_end` must be callable."):
+        configure_tracing(None, print)
+    recorder = Recorder()
+    configure_tracing(recorder.on_start, recorder.on_end)
+    reset_tracing()
+    assert _span("mytext.run") is _NOOP_SPAN